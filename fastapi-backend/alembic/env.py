@@ -17,9 +17,14 @@ if BASE_DIR not in sys.path:
 from src.database import Base
 # --- ИМПОРТИРУЕМ ВСЕ МОДЕЛИ (они должны быть загружены ДО Alembic) ---
 from src.models.user_models import User
-from src.models.problem_models import Problem, TestCase, Example
-from src.models.submission_models import Submission
-from src.models.contest_models import Contest
+from src.models.problem_models import Problem, ProblemTestSet, TestCase, Example
+from src.models.submission_models import Submission, SubmissionEvent
+from src.models.stats_models import ProblemStats, UserScore, UserSolvedProblem, UserDailyActivity, PlatformDailyActivity
+from src.models.access_models import ProblemAccess
+from src.models.rating_models import RatingHistory
+from src.models.contest_models import Contest, ContestProblem, ContestParticipant, ContestReplaySnapshot
+from src.models.token_models import RefreshToken, RevokedToken
+from src.models.throttle_models import LoginThrottleBucket
 from  src.models.group_models import Group, GroupAssignment
 # --- Конфиг ---
 config = context.config
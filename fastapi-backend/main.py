@@ -1,5 +1,6 @@
 # fastapi-backend/main.py
 
+import asyncio
 import uuid
 import re
 import hashlib
@@ -15,6 +16,11 @@ from src.api.user_router import users
 from src.api.admin_router import router
 from src.api.dashboard_router import dashboard_router
 from src.api.group_router import router as group_router
+from src.api.contest_router import router as contest_router
+from src.services.purge_service import run_purge_loop
+from src.services.prewarm_service import run_prewarm_loop
+from src.services.revocation_service import run_revocation_sync_loop
+from src.core.hashing import shutdown_hashing
 from src.models.user_models import User
 from src.models import base as models_base  # Используем 'base' для доступа к Enum'ам
 
@@ -70,6 +76,18 @@ async def on_startup():
     await init_db()  # Создаст таблицы (включая users)
     # await create_temp_user()  # 🔥 ВЫЗЫВАЕМ ФУНКЦИЮ
     print("База данных готова.")
+    app.state.purge_task = asyncio.create_task(run_purge_loop())
+    app.state.prewarm_task = asyncio.create_task(run_prewarm_loop())
+    app.state.revocation_task = asyncio.create_task(run_revocation_sync_loop())
+
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    """Останавливает фоновые задачи: очистку, прогрев кэшей, синхронизацию отзыва токенов и пул хэширования."""
+    app.state.purge_task.cancel()
+    app.state.prewarm_task.cancel()
+    app.state.revocation_task.cancel()
+    shutdown_hashing()
 
 
 def generate_slug(title: str) -> str:
@@ -90,3 +108,4 @@ app.include_router(student_router)
 app.include_router(users)
 app.include_router(router)
 app.include_router(group_router)
+app.include_router(contest_router)
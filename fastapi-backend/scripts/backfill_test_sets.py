@@ -0,0 +1,75 @@
+# fastapi-backend/scripts/backfill_test_sets.py
+"""
+Создание первой версии набора тестов для задач, созданных до версионирования.
+
+Для каждой задачи без current_test_set_id создаётся версия 1 с текущими
+лимитами, и к ней привязываются все её тесты. Каждая пачка задач —
+отдельная транзакция, скрипт можно запускать повторно.
+
+Запуск (из каталога fastapi-backend):
+    python -m scripts.backfill_test_sets --batch-size 100
+"""
+
+import argparse
+import asyncio
+
+from sqlalchemy import select, update, func
+
+from src.database import AsyncSessionLocal
+from src.models.problem_models import Problem, ProblemTestSet, TestCase
+
+
+async def backfill_batch(batch_size: int) -> int:
+    async with AsyncSessionLocal() as session:
+        stmt = (
+            select(Problem)
+            .where(Problem.current_test_set_id.is_(None))
+            .order_by(Problem.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        problems = (await session.execute(stmt)).scalars().all()
+        if not problems:
+            return 0
+
+        for problem in problems:
+            last_version = (await session.execute(
+                select(func.max(ProblemTestSet.version)).where(ProblemTestSet.problem_id == problem.id)
+            )).scalar()
+            test_set = ProblemTestSet(
+                problem_id=problem.id,
+                version=(last_version or 0) + 1,
+                time_limit=problem.time_limit or 1000,
+                memory_limit=problem.memory_limit or 256,
+                checker_type=problem.checker_type,
+            )
+            session.add(test_set)
+            await session.flush()
+
+            await session.execute(
+                update(TestCase)
+                .where(TestCase.problem_id == problem.id, TestCase.test_set_id.is_(None))
+                .values(test_set_id=test_set.id)
+            )
+            problem.current_test_set_id = test_set.id
+
+        await session.commit()
+        return len(problems)
+
+
+async def main(batch_size: int) -> None:
+    total = 0
+    while True:
+        done = await backfill_batch(batch_size)
+        if done == 0:
+            break
+        total += done
+        print(f"Обработано задач: {total}")
+    print(f"✅ Готово, создано версий: {total}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=100)
+    args = parser.parse_args()
+    asyncio.run(main(args.batch_size))
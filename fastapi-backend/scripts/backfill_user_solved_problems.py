@@ -0,0 +1,58 @@
+# fastapi-backend/scripts/backfill_user_solved_problems.py
+"""
+Заполнение user_solved_problems из истории submissions и пересчёт лидерборда.
+
+Пользователи обрабатываются пачками по id, каждая пачка — отдельная
+транзакция; повторный запуск пересчитывает строки заново. После
+бэкфилла пересчитывается user_scores.
+
+Запуск (из каталога fastapi-backend):
+    python -m scripts.backfill_user_solved_problems --batch-size 500
+"""
+
+import argparse
+import asyncio
+
+from sqlalchemy import select
+
+from src.database import AsyncSessionLocal
+from src.models.user_models import User
+from src.repository.solved_problem_repository import SolvedProblemRepository
+from src.repository.user_score_repository import UserScoreRepository
+
+
+async def backfill_batch(after_id, batch_size: int):
+    """Возвращает (последний id пачки, записано строк) или (None, 0), если пользователи кончились."""
+    async with AsyncSessionLocal() as session:
+        stmt = select(User.id).order_by(User.id).limit(batch_size)
+        if after_id is not None:
+            stmt = stmt.where(User.id > after_id)
+        user_ids = (await session.execute(stmt)).scalars().all()
+        if not user_ids:
+            return None, 0
+
+        written = await SolvedProblemRepository(session).rebuild_for_users(user_ids)
+        await session.commit()
+        return user_ids[-1], written
+
+
+async def main(batch_size: int) -> None:
+    after_id = None
+    total = 0
+    while True:
+        after_id, written = await backfill_batch(after_id, batch_size)
+        if after_id is None:
+            break
+        total += written
+        print(f"Решённых задач записано: {total}")
+
+    async with AsyncSessionLocal() as session:
+        rows = await UserScoreRepository(session).rebuild()
+    print(f"✅ Готово: решённых задач {total}, строк лидерборда {rows}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(main(args.batch_size))
@@ -0,0 +1,103 @@
+# fastapi-backend/scripts/bench_login_storm.py
+"""
+Бенчмарк «шторма входов»: задержка постороннего эндпоинта, пока воркер
+проверяет пароли.
+
+Поднимается отдельное приложение FastAPI в процессе (БД не нужна) с двумя
+обработчиками: /login проверяет bcrypt-хэш, /ping ничего не делает.
+Клиенты httpx (ASGITransport) одновременно шлют --logins входов и
+непрерывно опрашивают /ping; печатаются p50/p99 задержки /ping.
+Режимы:
+    blocking — bcrypt прямо в обработчике (как было раньше);
+    pool     — через пул core.hashing (PasswordService).
+
+Запуск (из каталога fastapi-backend):
+    python -m scripts.bench_login_storm --logins 200 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+from fastapi import FastAPI, HTTPException
+
+from src.core.metrics import collect
+from src.core.security import PasswordService, pwd_context
+
+PASSWORD = "correct horse battery staple"
+
+
+def build_app(mode: str, hashed: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/login")
+    async def login():
+        if mode == "blocking":
+            ok = pwd_context.verify(PASSWORD, hashed)
+        else:
+            ok = await PasswordService.verify_password(PASSWORD, hashed)
+        if not ok:
+            raise HTTPException(status_code=401)
+        return {"ok": True}
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    return app
+
+
+def percentile(values, q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+async def run_storm(mode: str, hashed: str, logins: int, concurrency: int) -> None:
+    transport = httpx.ASGITransport(app=build_app(mode, hashed))
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        remaining = logins
+        statuses = {}
+        done = asyncio.Event()
+
+        async def login_client():
+            nonlocal remaining
+            while remaining > 0:
+                remaining -= 1
+                response = await client.post("/login")
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+        async def ping_client(timings):
+            while not done.is_set():
+                started = time.perf_counter()
+                await client.get("/ping")
+                timings.append((time.perf_counter() - started) * 1000)
+                await asyncio.sleep(0.01)
+
+        timings = []
+        pinger = asyncio.create_task(ping_client(timings))
+        started = time.perf_counter()
+        await asyncio.gather(*(login_client() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+        done.set()
+        await pinger
+
+    print(f"{mode:<9} входов {logins} за {elapsed:6.2f} с, ответы {statuses}; "
+          f"/ping: {len(timings)} запросов, p50 {statistics.median(timings):8.2f} мс, "
+          f"p99 {percentile(timings, 0.99):8.2f} мс, макс {max(timings):8.2f} мс")
+
+
+async def main(args) -> None:
+    hashed = pwd_context.hash(PASSWORD)
+    for mode in args.modes:
+        await run_storm(mode, hashed, args.logins, args.concurrency)
+    print("Метрики пула:", collect()["counters"])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--modes", nargs="+", choices=["blocking", "pool"], default=["blocking", "pool"])
+    asyncio.run(main(parser.parse_args()))
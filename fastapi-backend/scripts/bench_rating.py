@@ -0,0 +1,88 @@
+# fastapi-backend/scripts/bench_rating.py
+"""
+Бенчмарк пересчёта рейтинга (src/core/rating.py) на синтетических участниках.
+
+БД не нужна: замеряется только расчёт. С --check результат сверяется
+с попарной реализацией O(n^2) на небольшой выборке.
+
+Запуск (из каталога fastapi-backend):
+    python -m scripts.bench_rating --participants 50000
+"""
+
+import argparse
+import math
+import statistics
+import time
+
+import numpy as np
+
+from src.core.rating import (
+    compute_rating_changes, RATING_SEARCH_MIN, RATING_SEARCH_MAX, ELO_SCALE, TOP_ADJUSTMENT_LIMIT,
+)
+
+
+def win_probability(a: float, b: float) -> float:
+    return 1.0 / (1.0 + math.pow(10.0, (b - a) / ELO_SCALE))
+
+
+def reference_deltas(ratings, ranks) -> list:
+    """Попарная реализация (как в исходном описании алгоритма Codeforces)."""
+    n = len(ratings)
+    seeds = [
+        1.0 + sum(win_probability(ratings[j], ratings[i]) for j in range(n) if j != i)
+        for i in range(n)
+    ]
+
+    def need_rating(rank: float) -> int:
+        left, right = RATING_SEARCH_MIN, RATING_SEARCH_MAX
+        while right - left > 1:
+            mid = (left + right) // 2
+            if 1.0 + sum(win_probability(r, mid) for r in ratings) < rank:
+                right = mid
+            else:
+                left = mid
+        return left
+
+    deltas = [int((need_rating(math.sqrt(seeds[i] * ranks[i])) - ratings[i]) / 2) for i in range(n)]
+    inc = int(-sum(deltas) / n) - 1
+    deltas = [d + inc for d in deltas]
+
+    top_count = min(n, 4 * round(math.sqrt(n)))
+    top = sorted(range(n), key=lambda i: -ratings[i])[:top_count]
+    inc = min(max(int(-sum(deltas[i] for i in top) / top_count), -TOP_ADJUSTMENT_LIMIT), 0)
+    return [max(ratings[i] + deltas[i] + inc, RATING_SEARCH_MIN) - ratings[i] for i in range(n)]
+
+
+def main(args) -> None:
+    rng = np.random.default_rng(args.seed)
+    ratings = np.clip(rng.normal(1500, 350, args.participants), 0, None).astype(np.int64)
+    # Результат коррелирует с рейтингом, часть участников делит места
+    scores = np.round(ratings / 100 + rng.normal(0, 3, args.participants))
+
+    timings = []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        changes = compute_rating_changes(ratings, scores)
+        timings.append((time.perf_counter() - started) * 1000)
+
+    print(f"Участников: {args.participants:,}")
+    print(f"Пересчёт: медиана {statistics.median(timings):.1f} мс, мин {min(timings):.1f} мс")
+    print(f"Сумма изменений: {int(changes.deltas.sum())}, "
+          f"диапазон: [{int(changes.deltas.min())}, {int(changes.deltas.max())}]")
+
+    if args.check:
+        sample = rng.choice(args.participants, size=min(args.check, args.participants), replace=False)
+        sample_changes = compute_rating_changes(ratings[sample], scores[sample])
+        expected = reference_deltas([int(r) for r in ratings[sample]], [int(r) for r in sample_changes.ranks])
+        mismatches = sum(int(a) != b for a, b in zip(sample_changes.deltas, expected))
+        print(f"Сверка с попарной реализацией на {len(sample)} участниках: расхождений {mismatches}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--participants", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--check", type=int, default=0, metavar="N",
+                        help="Сверить с попарной реализацией на выборке из N участников")
+    main(parser.parse_args())
@@ -0,0 +1,68 @@
+# fastapi-backend/scripts/bench_refresh_tokens.py
+"""
+Бенчмарк проверки и ротации refresh токена: прежняя схема
+(SHA-256 + bcrypt в users.refresh_token_hash) против HMAC-SHA256
+(таблица refresh_tokens).
+
+БД не нужна: замеряется только вычислительная часть /api/auth/refresh —
+проверка предъявленного токена и подготовка хэша нового. Запросы к БД
+в обеих схемах по одному индексному обращению.
+
+Запуск (из каталога fastapi-backend):
+    python -m scripts.bench_refresh_tokens --refreshes 200
+"""
+
+import argparse
+import hashlib
+import time
+import uuid
+
+from src.core.security import TokenService, pwd_context
+
+
+def legacy_refresh(token: str, stored_hash: str) -> str:
+    """Прежняя ротация: bcrypt-проверка старого токена и bcrypt-хэш нового."""
+    if not pwd_context.verify(hashlib.sha256(token.encode()).hexdigest(), stored_hash):
+        raise RuntimeError("токен не совпал")
+    new_token = TokenService.create_refresh_token(uuid.uuid4(), "student")
+    return pwd_context.hash(hashlib.sha256(new_token.encode()).hexdigest())
+
+
+def hmac_refresh(token: str, stored_digest: str) -> str:
+    """Новая ротация: HMAC старого токена (поиск по digest) и HMAC нового."""
+    if TokenService.refresh_token_digest(token) != stored_digest:
+        raise RuntimeError("токен не совпал")
+    new_token = TokenService.create_refresh_token(uuid.uuid4(), "student")
+    return TokenService.refresh_token_digest(new_token)
+
+
+def measure(name: str, run, token: str, stored: str, refreshes: int) -> float:
+    started = time.perf_counter()
+    for _ in range(refreshes):
+        run(token, stored)
+    elapsed = time.perf_counter() - started
+    rate = refreshes / elapsed
+    print(f"{name:<18} {refreshes} ротаций за {elapsed:8.3f} с: {rate:12.1f} в секунду, "
+          f"{elapsed / refreshes * 1000:8.3f} мс на ротацию")
+    return rate
+
+
+def main(args) -> None:
+    token = TokenService.create_refresh_token(uuid.uuid4(), "student")
+    legacy = measure(
+        "SHA-256 + bcrypt", legacy_refresh,
+        token, pwd_context.hash(hashlib.sha256(token.encode()).hexdigest()), args.refreshes,
+    )
+    new = measure(
+        "HMAC-SHA256", hmac_refresh,
+        token, TokenService.refresh_token_digest(token), args.refreshes * args.hmac_factor,
+    )
+    print(f"Ускорение: x{new / legacy:.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--refreshes", type=int, default=200)
+    parser.add_argument("--hmac-factor", type=int, default=100,
+                        help="Во сколько раз больше ротаций замерять для HMAC (он намного быстрее)")
+    main(parser.parse_args())
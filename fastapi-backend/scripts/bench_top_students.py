@@ -0,0 +1,144 @@
+# fastapi-backend/scripts/bench_top_students.py
+"""
+Бенчмарк топа студентов: прежний GROUP BY по submissions против
+материализованной таблицы user_scores.
+
+Скрипт создаёт отдельную схему (по умолчанию bench_top_students),
+заполняет её синтетическими данными через generate_series, пересчитывает
+user_solved_problems и user_scores и замеряет оба запроса. Рабочие таблицы не затрагиваются.
+По окончании схема удаляется (если не указан --keep).
+
+Запуск (из каталога fastapi-backend, нужен PostgreSQL 13+):
+    python -m scripts.bench_top_students --submissions 10000000 --users 50000
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database import engine, Base
+import src.models  # noqa: F401  (регистрирует все таблицы в Base.metadata)
+import src.models.group_models  # noqa: F401
+from src.models.user_models import User
+from src.repository.solved_problem_repository import SolvedProblemRepository
+from src.repository.top_students_repository import TopStudentsRepository
+from src.repository.user_score_repository import UserScoreRepository
+
+SEED_BATCH = 1_000_000
+
+# Прежняя реализация TopStudentsRepository.get_top_students
+LEGACY_TOP_STUDENTS = text("""
+    SELECT users.id, users.username, users.rating, coalesce(ac.ac_count, 0) AS solved_count
+    FROM users
+    LEFT OUTER JOIN (
+        SELECT user_id, count(*) AS ac_count
+        FROM submissions
+        WHERE status = 'ACCEPTED'
+        GROUP BY user_id
+    ) AS ac ON users.id = ac.user_id
+    WHERE users.role = 'student' AND users.deleted_at IS NULL
+    ORDER BY solved_count DESC, users.rating DESC
+    LIMIT :limit
+""")
+
+
+async def seed(session: AsyncSession, users: int, problems: int, submissions: int, accept_rate: float) -> None:
+    await session.execute(text("""
+        INSERT INTO users (id, email, username, hashed_password, role, rating, created_at, updated_at, is_active)
+        SELECT gen_random_uuid(), 'bench' || g || '@example.com', 'bench' || g, '-',
+               CASE WHEN g = 0 THEN 'teacher' ELSE 'student' END,
+               1000 + (g * 7919) % 1500, now(), now(), true
+        FROM generate_series(0, :users) AS g
+    """), {"users": users})
+    await session.execute(text("""
+        INSERT INTO problems (id, user_id, title, slug, description, difficulty, checker_type, is_public, created_at)
+        SELECT gen_random_uuid(), (SELECT id FROM users WHERE role = 'teacher' LIMIT 1),
+               'Bench ' || g, 'bench-' || g, 'Синтетическая задача', 'EASY', 'EXACT', true, now()
+        FROM generate_series(1, :problems) AS g
+    """), {"problems": problems})
+    await session.commit()
+
+    for start in range(0, submissions, SEED_BATCH):
+        count = min(SEED_BATCH, submissions - start)
+        await session.execute(text("""
+            WITH u AS (SELECT array_agg(id) AS ids FROM users WHERE role = 'student'),
+                 p AS (SELECT array_agg(id) AS ids FROM problems)
+            INSERT INTO submissions (id, user_id, problem_id, language, code, status, created_at, updated_at)
+            SELECT gen_random_uuid(),
+                   u.ids[(1 + (g * 2654435761) % array_length(u.ids, 1))::int],
+                   p.ids[(1 + (g * 40503) % array_length(p.ids, 1))::int],
+                   'python', '',
+                   (CASE WHEN random() < :accept_rate THEN 'ACCEPTED' ELSE 'WRONG_ANSWER' END)::submissionstatus,
+                   now() - g * interval '1 second', now() - g * interval '1 second'
+            FROM generate_series(:start, :stop) AS g, u, p
+        """), {"start": start, "stop": start + count - 1, "accept_rate": accept_rate})
+        await session.commit()
+        print(f"  submissions: {start + count:,}")
+
+    await session.execute(text("ANALYZE"))
+
+
+async def measure(name: str, run, repeat: int) -> None:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await run()
+        timings.append((time.perf_counter() - started) * 1000)
+    print(f"{name:<34} медиана {statistics.median(timings):>10.2f} мс, мин {min(timings):>10.2f} мс")
+
+
+async def main(args) -> None:
+    async with engine.connect() as conn:
+        await conn.execute(text(f'DROP SCHEMA IF EXISTS "{args.schema}" CASCADE'))
+        await conn.execute(text(f'CREATE SCHEMA "{args.schema}"'))
+        # Все неквалифицированные имена (таблицы и enum-типы) — в схеме бенчмарка
+        await conn.execute(text(f'SET search_path TO "{args.schema}"'))
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.commit()
+
+        try:
+            async with AsyncSession(bind=conn, expire_on_commit=False) as session:
+                print(f"Заполнение: {args.users:,} студентов, {args.problems:,} задач, "
+                      f"{args.submissions:,} попыток")
+                started = time.perf_counter()
+                await seed(session, args.users, args.problems, args.submissions, args.accept_rate)
+                print(f"  заняло {time.perf_counter() - started:.1f} с")
+
+                started = time.perf_counter()
+                user_ids = (await session.execute(select(User.id))).scalars().all()
+                solved = await SolvedProblemRepository(session).rebuild_for_users(user_ids)
+                await session.commit()
+                rows = await UserScoreRepository(session).rebuild()
+                print(f"Пересчёт: {solved:,} решённых задач, {rows:,} строк user_scores "
+                      f"за {time.perf_counter() - started:.1f} с")
+                await session.execute(text("ANALYZE user_scores"))
+
+                repo = TopStudentsRepository(session)
+                await measure(
+                    "GROUP BY по submissions (старый)",
+                    lambda: session.execute(LEGACY_TOP_STUDENTS, {"limit": args.limit}),
+                    args.repeat,
+                )
+                await measure("user_scores (новый)", lambda: repo.get_top_students(args.limit), args.repeat)
+        finally:
+            if not args.keep:
+                await conn.rollback()
+                await conn.execute(text(f'DROP SCHEMA IF EXISTS "{args.schema}" CASCADE'))
+                await conn.commit()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--submissions", type=int, default=10_000_000)
+    parser.add_argument("--users", type=int, default=50_000)
+    parser.add_argument("--problems", type=int, default=2_000)
+    parser.add_argument("--accept-rate", type=float, default=0.35)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--schema", default="bench_top_students")
+    parser.add_argument("--keep", action="store_true", help="Не удалять схему с данными после замеров")
+    asyncio.run(main(parser.parse_args()))
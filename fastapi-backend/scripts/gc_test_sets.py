@@ -0,0 +1,53 @@
+# fastapi-backend/scripts/gc_test_sets.py
+"""
+Сборка мусора для версий наборов тестов и файлов хранилища.
+
+1. Удаляет версии, которые не являются текущими ни для одной задачи
+   и не упоминаются ни в одной попытке.
+2. Удаляет из файлового хранилища файлы, на которые больше не ссылается
+   ни один тест. Файлы моложе --grace-minutes не трогаются: они могли
+   быть только что загружены, а транзакция со ссылкой ещё не закоммичена.
+
+Запуск (из каталога fastapi-backend):
+    python -m scripts.gc_test_sets --grace-minutes 60
+"""
+
+import argparse
+import asyncio
+import time
+
+from src.database import AsyncSessionLocal
+from src.repository.problem_repository import ProblemRepository
+
+
+async def main(batch_size: int, grace_minutes: int, dry_run: bool) -> None:
+    async with AsyncSessionLocal() as session:
+        repo = ProblemRepository(session)
+
+        deleted_sets = 0
+        while not dry_run:
+            deleted = await repo.delete_unreferenced_test_sets(batch_size)
+            if deleted == 0:
+                break
+            deleted_sets += deleted
+        print(f"Удалено версий наборов тестов: {deleted_sets}")
+
+        referenced = await repo.get_referenced_digests()
+        cutoff = time.time() - grace_minutes * 60
+        deleted_files = 0
+        for sha256, mtime in list(repo.storage.iter_objects()):
+            if sha256 in referenced or mtime > cutoff:
+                continue
+            if not dry_run:
+                repo.storage.delete(sha256)
+            deleted_files += 1
+        print(f"{'Будет удалено' if dry_run else 'Удалено'} файлов: {deleted_files}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--grace-minutes", type=int, default=60)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+    asyncio.run(main(args.batch_size, args.grace_minutes, args.dry_run))
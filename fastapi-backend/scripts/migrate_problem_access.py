@@ -0,0 +1,85 @@
+# fastapi-backend/scripts/migrate_problem_access.py
+"""
+Заполнение таблицы problem_access.
+
+Переносит прямые назначения из устаревшей колонки
+problems.assigned_student_ids (source = "direct") и выдаёт доступ
+участникам групп по существующим назначениям (source = "group:<id>").
+Задачи обрабатываются пачками по id, каждая пачка — отдельная
+транзакция; повторный запуск безопасен (ON CONFLICT DO NOTHING).
+
+Запуск (из каталога fastapi-backend):
+    python -m scripts.migrate_problem_access --batch-size 500
+"""
+
+import argparse
+import asyncio
+
+from sqlalchemy import select, func, literal, cast, String
+from sqlalchemy.dialects.postgresql import insert
+
+from src.database import AsyncSessionLocal
+from src.models.access_models import ProblemAccess, ACCESS_SOURCE_DIRECT, ACCESS_SOURCE_GROUP_PREFIX
+from src.models.group_models import GroupAssignment, group_members
+from src.models.problem_models import Problem
+from src.models.user_models import User
+
+ACCESS_COLUMNS = ["user_id", "problem_id", "source"]
+
+
+async def migrate_batch(after_id, batch_size: int):
+    """Возвращает (последний id пачки, добавлено строк) или (None, 0), если задачи кончились."""
+    async with AsyncSessionLocal() as session:
+        stmt = select(Problem.id).order_by(Problem.id).limit(batch_size)
+        if after_id is not None:
+            stmt = stmt.where(Problem.id > after_id)
+        problem_ids = (await session.execute(stmt)).scalars().all()
+        if not problem_ids:
+            return None, 0
+
+        student_id = func.unnest(Problem.assigned_student_ids).column_valued("student_id")
+        direct = (
+            select(student_id, Problem.id, literal(ACCESS_SOURCE_DIRECT))
+            .where(Problem.id.in_(problem_ids))
+            # Пропускаем id уже удалённых пользователей, оставшиеся в массиве
+            .where(student_id.in_(select(User.id)))
+        )
+        via_groups = (
+            select(
+                group_members.c.user_id,
+                GroupAssignment.problem_id,
+                literal(ACCESS_SOURCE_GROUP_PREFIX) + cast(GroupAssignment.group_id, String),
+            )
+            .join(group_members, group_members.c.group_id == GroupAssignment.group_id)
+            .where(GroupAssignment.problem_id.in_(problem_ids))
+            .distinct()
+        )
+
+        inserted = 0
+        for rows in (direct, via_groups):
+            result = await session.execute(
+                insert(ProblemAccess).from_select(ACCESS_COLUMNS, rows).on_conflict_do_nothing()
+            )
+            inserted += result.rowcount
+
+        await session.commit()
+        return problem_ids[-1], inserted
+
+
+async def main(batch_size: int) -> None:
+    after_id = None
+    total = 0
+    while True:
+        after_id, inserted = await migrate_batch(after_id, batch_size)
+        if after_id is None:
+            break
+        total += inserted
+        print(f"Добавлено строк доступа: {total}")
+    print(f"✅ Готово, всего строк доступа: {total}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(main(args.batch_size))
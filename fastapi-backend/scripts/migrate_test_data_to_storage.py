@@ -0,0 +1,67 @@
+# fastapi-backend/scripts/migrate_test_data_to_storage.py
+"""
+Перенос данных тестов из колонок test_cases.input_data/output_data
+в файловое хранилище.
+
+Работает пачками: каждая пачка — отдельная транзакция с блокировкой
+строк (SKIP LOCKED), поэтому скрипт можно прерывать и запускать повторно,
+а также запускать параллельно несколькими процессами.
+
+Запуск (из каталога fastapi-backend):
+    python -m scripts.migrate_test_data_to_storage --batch-size 200
+"""
+
+import argparse
+import asyncio
+
+from sqlalchemy import select
+
+from src.database import AsyncSessionLocal
+from src.models.problem_models import TestCase
+from src.repository.problem_repository import ProblemRepository
+
+
+async def migrate_batch(batch_size: int) -> int:
+    async with AsyncSessionLocal() as session:
+        stmt = (
+            select(TestCase)
+            .where(TestCase.input_sha256.is_(None))
+            .order_by(TestCase.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        tests = (await session.execute(stmt)).scalars().all()
+        if not tests:
+            return 0
+
+        repo = ProblemRepository(session)
+        for test in tests:
+            stored = await repo.store_test_data({
+                "input_data": test.input_data or "",
+                "output_data": test.output_data or "",
+            })
+            for key, value in stored.items():
+                setattr(test, key, value)
+            test.input_data = None
+            test.output_data = None
+
+        await session.commit()
+        return len(tests)
+
+
+async def main(batch_size: int) -> None:
+    total = 0
+    while True:
+        migrated = await migrate_batch(batch_size)
+        if migrated == 0:
+            break
+        total += migrated
+        print(f"Перенесено тестов: {total}")
+    print(f"✅ Готово, всего перенесено: {total}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.batch_size))
@@ -0,0 +1,31 @@
+# fastapi-backend/scripts/rebuild_activity_rollups.py
+"""
+Пересчёт дневных агрегатов активности (user_daily_activity,
+platform_daily_activity) из таблицы submissions.
+
+Нужен один раз после появления таблиц и для починки после ручных
+правок submissions. С --since пересчитываются только дни начиная с даты.
+
+Запуск (из каталога fastapi-backend):
+    python -m scripts.rebuild_activity_rollups
+    python -m scripts.rebuild_activity_rollups --since 2025-01-01
+"""
+
+import argparse
+import asyncio
+from datetime import date
+
+from src.database import AsyncSessionLocal
+from src.repository.activity_repository import ActivityRepository
+
+
+async def main(since) -> None:
+    async with AsyncSessionLocal() as session:
+        users, platform = await ActivityRepository(session).rebuild(since)
+    print(f"✅ Агрегаты пересчитаны: user_daily_activity {users}, platform_daily_activity {platform}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--since", type=date.fromisoformat, default=None, help="Первый пересчитываемый день (YYYY-MM-DD)")
+    asyncio.run(main(parser.parse_args().since))
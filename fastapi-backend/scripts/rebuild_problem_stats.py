@@ -0,0 +1,28 @@
+# fastapi-backend/scripts/rebuild_problem_stats.py
+"""
+Пересчёт таблицы problem_stats из submissions (бэкфилл или починка).
+
+Запуск (из каталога fastapi-backend):
+    python -m scripts.rebuild_problem_stats                 # все задачи
+    python -m scripts.rebuild_problem_stats --problem-id ID # одна задача
+"""
+
+import argparse
+import asyncio
+import uuid
+
+from src.database import AsyncSessionLocal
+from src.repository.problem_stats_repository import ProblemStatsRepository
+
+
+async def main(problem_id) -> None:
+    async with AsyncSessionLocal() as session:
+        rebuilt = await ProblemStatsRepository(session).rebuild(problem_id)
+    print(f"✅ Статистика пересчитана для задач: {rebuilt}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--problem-id", type=uuid.UUID, default=None)
+    args = parser.parse_args()
+    asyncio.run(main(args.problem_id))
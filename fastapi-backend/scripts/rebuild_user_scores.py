@@ -0,0 +1,27 @@
+# fastapi-backend/scripts/rebuild_user_scores.py
+"""
+Пересчёт таблицы user_scores (лидерборд) из user_solved_problems.
+
+Нужен после бэкфилла user_solved_problems и для починки после ручных
+правок submissions или фоновой очистки удалённых задач.
+
+Запуск (из каталога fastapi-backend):
+    python -m scripts.rebuild_user_scores
+"""
+
+import argparse
+import asyncio
+
+from src.database import AsyncSessionLocal
+from src.repository.user_score_repository import UserScoreRepository
+
+
+async def main() -> None:
+    async with AsyncSessionLocal() as session:
+        rebuilt = await UserScoreRepository(session).rebuild()
+    print(f"✅ Лидерборд пересчитан, строк: {rebuilt}")
+
+
+if __name__ == "__main__":
+    argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter).parse_args()
+    asyncio.run(main())
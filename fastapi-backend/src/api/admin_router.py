@@ -11,6 +11,8 @@ from ..services.user_service import UserService
 from ..services.admin_service import AdminUserService
 from  ..repository.user_repository import UserRepository
 from ..services.auth_service import get_current_user
+from ..services.purge_service import purge_status, get_pending_counts
+from ..core.metrics import collect
 from ..core.security import require_roles
 from ..models.user_models import User
 from typing import List, Optional
@@ -40,6 +42,19 @@ async def list_all_users(
     users = await service.list_users(skip, limit, role)
     return users
 
+@router.get("/purge/status", dependencies=[Depends(require_roles("ADMIN"))])
+async def get_purge_status(db: AsyncSession = Depends(get_db)):
+    """Прогресс фоновой очистки удалённых задач и пользователей (только ADMIN)"""
+    return {
+        **purge_status,
+        "pending": await get_pending_counts(await db.connection()),
+    }
+
+@router.get("/metrics", dependencies=[Depends(require_roles("ADMIN"))])
+async def get_metrics():
+    """Статистика кэшей и счётчики текущего воркера (только ADMIN)"""
+    return collect()
+
 @router.post("", response_model=UserResponse, dependencies=[Depends(require_roles("ADMIN"))])
 async def create_user_admin(
         data: CreateUserRequest,
@@ -72,7 +87,7 @@ async def delete_user_admin(
 ):
     try:
         await service.delete_user_as_admin(user_id)
-        return {"message": "Пользователь удален"}
+        return {"message": "Пользователь удален, связанные данные будут очищены в фоне"}
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
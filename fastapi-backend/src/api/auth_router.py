@@ -5,15 +5,16 @@ API эндпоинты для аутентификации.
 """
 
 import logging
-from typing import Optional
+from typing import List, Optional
+from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Response, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
 
-from ..services.auth_service import AuthService, get_auth_service, get_current_user
-from ..schemas.schemas import UserBase, UserCreate, LoginData, Token
+from ..services.auth_service import AuthService, Principal, get_auth_service, get_current_user, get_current_principal
+from ..schemas.schemas import UserBase, UserCreate, LoginData, Token, SessionResponse
+from ..services.login_throttle_service import check_login_allowed, record_login_failure
 from ..models.user_models import User
-from ..core.security import TokenService
 
 logger = logging.getLogger(__name__)
 
@@ -49,6 +50,11 @@ def set_refresh_cookie(
     )
 
 
+def client_ip(request: Request) -> Optional[str]:
+    """Адрес клиента (за прокси uvicorn подставляет его при --proxy-headers)."""
+    return request.client.host if request.client else None
+
+
 def clear_refresh_cookie(response: Response) -> None:
     """Удаляет refresh токен cookie."""
     response.delete_cookie(
@@ -87,6 +93,7 @@ async def register_user(
     summary="Вход по email и паролю (JSON)"
 )
 async def login_user(
+        request: Request,
         response: Response,
         login_data: LoginData,
         auth_service: AuthService = Depends(get_auth_service)
@@ -97,9 +104,12 @@ async def login_user(
     Возвращает access_token в теле ответа.
     Refresh token устанавливается в httpOnly cookie.
     """
+    # Лимиты проверяются до bcrypt: отклонённая попытка не тратит CPU
+    await check_login_allowed(client_ip(request), login_data.email)
     user = await auth_service.authenticate_user(login_data.email, login_data.password)
 
     if not user:
+        await record_login_failure(login_data.email)
         logger.warning(f"Неудачная попытка входа: {login_data.email}")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -107,12 +117,9 @@ async def login_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    # Создаём токены
+    # Создаём токены; вход открывает новую сессию (семейство refresh токенов)
     access_token = auth_service.create_access_token(user)
-    refresh_token = auth_service.create_refresh_token(user)
-
-    # Сохраняем хэш refresh токена в БД
-    await auth_service.update_refresh_token(user, refresh_token)
+    refresh_token = await auth_service.issue_refresh_token(user, request.headers.get("user-agent"))
 
     # Устанавливаем refresh токен в cookie
     set_refresh_cookie(response, refresh_token)
@@ -128,6 +135,7 @@ async def login_user(
     summary="Вход через форму (для Swagger UI)"
 )
 async def login_user_form(
+        request: Request,
         response: Response,
         form_data: OAuth2PasswordRequestForm = Depends(),
         auth_service: AuthService = Depends(get_auth_service)
@@ -138,9 +146,11 @@ async def login_user_form(
 
     В поле username введите email.
     """
+    await check_login_allowed(client_ip(request), form_data.username)
     user = await auth_service.authenticate_user(form_data.username, form_data.password)
 
     if not user:
+        await record_login_failure(form_data.username)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Неправильный email или пароль",
@@ -148,9 +158,7 @@ async def login_user_form(
         )
 
     access_token = auth_service.create_access_token(user)
-    refresh_token = auth_service.create_refresh_token(user)
-
-    await auth_service.update_refresh_token(user, refresh_token)
+    refresh_token = await auth_service.issue_refresh_token(user, request.headers.get("user-agent"))
     set_refresh_cookie(response, refresh_token)
 
     return Token(access_token=access_token)
@@ -181,62 +189,17 @@ async def refresh_token(
             detail="Refresh токен отсутствует"
         )
 
-    # Декодируем и проверяем токен
-    payload = TokenService.verify_refresh_token(refresh_token_value)
-
-    if not payload:
-        logger.warning("Невалидный refresh токен")
-        clear_refresh_cookie(response)
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Недействительный refresh токен"
+    # Проверка по HMAC в БД и ротация в том же семействе;
+    # повтор уже заменённого токена отзывает всю сессию
+    try:
+        user, new_refresh_token = await auth_service.rotate_refresh_token(
+            refresh_token_value, request.headers.get("user-agent")
         )
-
-    # Получаем пользователя
-    user_id = payload.get("user_id") or payload.get("sub")
-    if not user_id:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Некорректный токен"
-        )
-
-    from uuid import UUID
-    user = await auth_service.get_user_by_id(UUID(user_id))
-
-    if not user:
-        logger.warning(f"Пользователь не найден при refresh: {user_id}")
-        clear_refresh_cookie(response)
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Пользователь не найден"
-        )
-
-    # ✅ ИСПРАВЛЕНИЕ: Правильная проверка refresh токена
-    # Используем метод, который применяет SHA256 перед сравнением с bcrypt хэшем
-    if not user.refresh_token_hash:
-        logger.warning(f"Refresh токен отозван для: {user.email}")
+    except HTTPException:
         clear_refresh_cookie(response)
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Refresh токен был отозван"
-        )
+        raise
 
-    if not auth_service.verify_refresh_token_string(refresh_token_value, user.refresh_token_hash):
-        logger.warning(f"Несоответствие refresh токена для: {user.email}")
-        # Потенциальная атака - очищаем все токены пользователя
-        await auth_service.update_refresh_token(user, None)
-        clear_refresh_cookie(response)
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Refresh токен недействителен"
-        )
-
-    # Создаём новые токены (ротация)
     new_access_token = auth_service.create_access_token(user)
-    new_refresh_token = auth_service.create_refresh_token(user)
-
-    # Обновляем хэш в БД
-    await auth_service.update_refresh_token(user, new_refresh_token)
 
     # Устанавливаем новый refresh токен
     set_refresh_cookie(response, new_refresh_token)
@@ -259,29 +222,63 @@ async def logout_user(
     """
     Выход из системы.
 
-    Инвалидирует refresh токен и очищает cookie.
+    Отзывает сессию (семейство refresh токенов) этого устройства и очищает cookie.
+    Переданный в Authorization access токен отзывается сразу, не дожидаясь exp.
     """
     refresh_token_value = request.cookies.get("refresh_token")
 
-    if refresh_token_value:
-        payload = TokenService.decode_token(refresh_token_value)
+    scheme, _, access_token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() == "bearer" and access_token:
+        try:
+            await auth_service.revoke_access_token(access_token)
+        except Exception as e:
+            logger.error(f"Ошибка отзыва access токена при logout: {e}")
 
-        if payload:
-            user_id = payload.get("user_id") or payload.get("sub")
+    if refresh_token_value:
+        try:
+            user_id = await auth_service.revoke_refresh_token(refresh_token_value)
             if user_id:
-                from uuid import UUID
-                try:
-                    user = await auth_service.get_user_by_id(UUID(user_id))
-                    if user:
-                        await auth_service.update_refresh_token(user, None)
-                        logger.info(f"Выход пользователя: {user.email}")
-                except Exception as e:
-                    logger.error(f"Ошибка при logout: {e}")
+                logger.info(f"Выход пользователя: {user_id}")
+        except Exception as e:
+            logger.error(f"Ошибка при logout: {e}")
 
     clear_refresh_cookie(response)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
+@auth_router.get(
+    "/sessions",
+    response_model=List[SessionResponse],
+    summary="Активные сессии пользователя"
+)
+async def list_sessions(
+        request: Request,
+        current_user: Principal = Depends(get_current_principal),
+        auth_service: AuthService = Depends(get_auth_service)
+):
+    """Сессии на устройствах (по одной на вход); current — текущая."""
+    return await auth_service.list_sessions(current_user.id, request.cookies.get("refresh_token"))
+
+
+@auth_router.delete(
+    "/sessions/{family_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Завершить сессию на устройстве"
+)
+async def revoke_session(
+        family_id: UUID,
+        current_user: Principal = Depends(get_current_principal),
+        auth_service: AuthService = Depends(get_auth_service)
+):
+    """Отзывает refresh токены сессии; access токен истечёт сам."""
+    if not await auth_service.revoke_session(current_user.id, family_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Сессия не найдена"
+        )
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
 @auth_router.get(
     "/me",
     status_code=status.HTTP_200_OK,
@@ -0,0 +1,172 @@
+# src/api/contest_router.py
+
+from datetime import datetime
+from typing import List, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..database import get_db
+from ..schemas.contest_schemas import (
+    ContestCreate, ContestResponse, ContestDetailResponse, ContestProblemStatement
+)
+from ..services.auth_service import Principal, get_current_active_user, get_current_teacher
+from ..services.contest_service import ContestService
+from ..services.problem_service import etag_matches
+
+router = APIRouter(prefix="/api/contests", tags=["Соревнования"])
+
+# Таблица общая для всех зрителей и меняется часто: короткое хранение,
+# дальше — перепроверка через If-None-Match
+SCOREBOARD_CACHE_CONTROL = "public, max-age=2"
+
+
+def parse_contest_id(contest_id: str) -> UUID:
+    try:
+        return UUID(contest_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid UUID")
+
+
+async def get_contest_service(
+        db: AsyncSession = Depends(get_db),
+        current_user: Principal = Depends(get_current_active_user),
+) -> ContestService:
+    return ContestService(db, current_user)
+
+
+async def get_teacher_contest_service(
+        db: AsyncSession = Depends(get_db),
+        current_user: Principal = Depends(get_current_teacher),
+) -> ContestService:
+    return ContestService(db, current_user)
+
+
+@router.post("/", response_model=ContestDetailResponse, status_code=status.HTTP_201_CREATED)
+async def create_contest(
+        data: ContestCreate,
+        service: ContestService = Depends(get_teacher_contest_service),
+):
+    """Создать соревнование (только преподаватель)."""
+    return await service.create_contest(data)
+
+
+@router.get("/", response_model=List[ContestResponse])
+async def list_contests(
+        skip: int = Query(0, ge=0),
+        limit: int = Query(50, ge=1, le=200),
+        service: ContestService = Depends(get_contest_service),
+):
+    return await service.list_contests(skip, limit)
+
+
+@router.get("/{contest_id}", response_model=ContestDetailResponse)
+async def get_contest(
+        contest_id: str,
+        service: ContestService = Depends(get_contest_service),
+):
+    return await service.get_contest(parse_contest_id(contest_id))
+
+
+@router.get("/{contest_id}/problems", response_model=List[ContestProblemStatement])
+async def get_contest_problems(
+        contest_id: str,
+        service: ContestService = Depends(get_contest_service),
+):
+    """Условия задач соревнования (зарегистрированным участникам после начала)."""
+    body = await service.get_problem_statements(parse_contest_id(contest_id))
+    return Response(content=body, media_type="application/json")
+
+
+@router.post("/{contest_id}/register")
+async def register(
+        contest_id: str,
+        service: ContestService = Depends(get_contest_service),
+):
+    return await service.register(parse_contest_id(contest_id))
+
+
+@router.get("/{contest_id}/scoreboard")
+async def get_scoreboard(
+        contest_id: str,
+        full: bool = Query(False, description="Без заморозки (только автору соревнования)"),
+        if_none_match: Optional[str] = Header(None),
+        service: ContestService = Depends(get_contest_service),
+):
+    """
+    Таблица результатов ICPC. Отдаётся готовый сериализованный снимок;
+    при совпадении If-None-Match с ETag — 304 без тела.
+    """
+    etag, body = await service.get_scoreboard(parse_contest_id(contest_id), full)
+    cache_control = "private, no-cache" if full else SCOREBOARD_CACHE_CONTROL
+    if etag_matches(if_none_match, etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers={"ETag": etag, "Cache-Control": cache_control},
+        )
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"ETag": etag, "Cache-Control": cache_control},
+    )
+
+
+@router.get("/{contest_id}/scoreboard/stream", dependencies=[Depends(get_current_active_user)])
+async def stream_scoreboard(contest_id: str):
+    """
+    Живая таблица (Server-Sent Events): событие snapshot с полной таблицей,
+    затем delta с изменившимися строками. Активность пользователя проверяется
+    при подключении (Principal из кэша), сессия БД на всё время соединения
+    не держится.
+    """
+    events = await ContestService.open_scoreboard_stream(parse_contest_id(contest_id))
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/{contest_id}/scoreboard/replay")
+async def replay_scoreboard(
+        contest_id: str,
+        minute: Optional[int] = Query(None, ge=0, description="Минута от начала (по умолчанию — момент at)"),
+        at: Optional[datetime] = Query(None, description="Вердикты на этот момент (по умолчанию — текущие)"),
+        service: ContestService = Depends(get_contest_service),
+):
+    """
+    Таблица результатов на минуте X / на момент времени — восстанавливается
+    из журнала попыток (виртуальное участие, разбор соревнования).
+    """
+    body = await service.replay_scoreboard(parse_contest_id(contest_id), minute, at)
+    return Response(content=body, media_type="application/json", headers={"Cache-Control": "private, no-cache"})
+
+
+@router.post("/{contest_id}/submissions/{submission_id}/rejudge")
+async def rejudge_submission(
+        contest_id: str,
+        submission_id: str,
+        service: ContestService = Depends(get_contest_service),
+):
+    """Перепроверить попытку соревнования на текущих тестах (автор или админ)."""
+    return await service.rejudge(parse_contest_id(contest_id), parse_contest_id(submission_id))
+
+
+@router.post("/{contest_id}/unfreeze")
+async def unfreeze_scoreboard(
+        contest_id: str,
+        service: ContestService = Depends(get_contest_service),
+):
+    """Разморозить таблицу после окончания (автор или админ)."""
+    return await service.unfreeze(parse_contest_id(contest_id))
+
+
+@router.post("/{contest_id}/rating")
+async def rate_contest(
+        contest_id: str,
+        service: ContestService = Depends(get_contest_service),
+):
+    """Пересчитать рейтинг участников по итогам (автор или админ, один раз)."""
+    return await service.rate(parse_contest_id(contest_id))
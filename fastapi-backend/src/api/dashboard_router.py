@@ -1,12 +1,11 @@
 
-from fastapi import  APIRouter, Depends
+from fastapi import  APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 
 from ..database import get_db
 from ..services.dashboard_service import DashboardService
-from ..services.auth_service import get_current_active_user
-from ..models.user_models import User
+from ..services.auth_service import Principal, get_current_active_user
 
 dashboard_router = APIRouter(prefix="/api/dashboard", tags=["Дашборд"])
 
@@ -15,17 +14,26 @@ def get_dashboard_service(db: AsyncSession = Depends(get_db)) -> DashboardServic
 
 @dashboard_router.get("/top-students")
 async def top_students(
-    limit: int = 10,
+    limit: int = Query(10, ge=1, le=100),
     service: DashboardService = Depends(get_dashboard_service),
-    current_user: User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user)
 ):
     return await service.get_top_students(limit)
 
+@dashboard_router.get("/activity")
+async def platform_activity(
+    days: int = Query(365, ge=1, le=366),
+    service: DashboardService = Depends(get_dashboard_service),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    """Активность платформы по дням, языкам и вердиктам (для графиков)."""
+    return await service.get_platform_activity(days)
+
 # будущем
 # @dashboard_router.get("/recent-contests")
 # async def recent_contests(
 #     service: DashboardService = Depends(get_dashboard_service),
-#     current_user: User = Depends(get_current_active_user)
+#     current_user: Principal = Depends(get_current_active_user)
 # ):
 #     return await service.get_recent_contests()
 
@@ -34,6 +42,6 @@ async def available_problems(
     skip: int = 0,
     limit: int = 20,
     service: DashboardService = Depends(get_dashboard_service),
-    current_user: User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user)
 ):
     return await service.get_available_problems(current_user.id, skip, limit)
\ No newline at end of file
@@ -6,17 +6,17 @@ from typing import List
 from uuid import UUID
 
 from ..database import get_db
-from ..models.user_models import User
-from ..services.auth_service import get_current_teacher
+from ..services.auth_service import Principal, get_current_teacher
 
 from ..schemas.group_schemas import (
     GroupCreate, GroupResponse, AddMemberRequest,
-    CreateAssignmentRequest, AssignmentResponse
+    CreateAssignmentRequest, AssignmentResponse, GroupProgressResponse
 )
 from ..repository.group_repository import GroupRepository
 from ..repository.user_repository import UserRepository
 from ..repository.problem_repository import ProblemRepository
 from ..services.group_service import GroupService
+from ..services.rating_service import RatingService
 
 router = APIRouter(prefix="/api/groups", tags=["Teacher Groups"])
 
@@ -46,6 +46,10 @@ async def get_group_service(
     return GroupService(group_repo, user_repo, problem_repo)
 
 
+async def get_rating_service(db: AsyncSession = Depends(get_db)) -> RatingService:
+    return RatingService(db)
+
+
 # ==========================================
 # 2. Endpoints (Контроллеры)
 # ==========================================
@@ -53,7 +57,7 @@ async def get_group_service(
 @router.post("/", response_model=GroupResponse, status_code=status.HTTP_201_CREATED)
 async def create_group(
         data: GroupCreate,
-        user: User = Depends(get_current_teacher),
+        user: Principal = Depends(get_current_teacher),
         service: GroupService = Depends(get_group_service)
 ):
     """
@@ -64,7 +68,7 @@ async def create_group(
 
 @router.get("/", response_model=List[GroupResponse])
 async def list_groups(
-        user: User = Depends(get_current_teacher),
+        user: Principal = Depends(get_current_teacher),
         service: GroupService = Depends(get_group_service)
 ):
     """
@@ -77,7 +81,7 @@ async def list_groups(
 async def add_student(
         group_id: str,
         data: AddMemberRequest,
-        user: User = Depends(get_current_teacher),
+        user: Principal = Depends(get_current_teacher),
         service: GroupService = Depends(get_group_service)
 ):
     """
@@ -94,7 +98,7 @@ async def add_student(
 @router.get("/{group_id}/students/count", status_code=status.HTTP_200_OK)
 async def get_student_count(
         group_id: str,
-        user: User = Depends(get_current_teacher),
+        user: Principal = Depends(get_current_teacher),
         service: GroupService = Depends(get_group_service)
 ):
     """
@@ -109,13 +113,31 @@ async def get_student_count(
     return {"group_id": group_id, "student_count": count}
 
 
+@router.get("/{group_id}/progress", response_model=GroupProgressResponse)
+async def get_group_progress(
+        group_id: str,
+        user: Principal = Depends(get_current_teacher),
+        service: GroupService = Depends(get_group_service)
+):
+    """
+    Прогресс группы: для каждого студента и назначения — лучший статус,
+    число попыток, время первого ACCEPTED и флаг сдачи после дедлайна.
+    """
+    try:
+        g_uuid = UUID(group_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid UUID")
+
+    return await service.get_group_progress(g_uuid, user.id)
+
+
 # --- Assignments (Назначение задач) ---
 
 @router.post("/{group_id}/assignments", response_model=AssignmentResponse)
 async def assign_task(
         group_id: str,
         data: CreateAssignmentRequest,
-        user: User = Depends(get_current_teacher),
+        user: Principal = Depends(get_current_teacher),
         service: GroupService = Depends(get_group_service)
 ):
     """
@@ -131,7 +153,7 @@ async def assign_task(
 
 @router.get("/assignments/active", response_model=List[AssignmentResponse])
 async def list_active_assignments(
-        user: User = Depends(get_current_teacher),
+        user: Principal = Depends(get_current_teacher),
         service: GroupService = Depends(get_group_service)
 ):
     """
@@ -143,7 +165,7 @@ async def list_active_assignments(
 @router.delete("/assignments/{assignment_id}")
 async def revoke_assignment(
         assignment_id: str,
-        user: User = Depends(get_current_teacher),
+        user: Principal = Depends(get_current_teacher),
         service: GroupService = Depends(get_group_service)
 ):
     """
@@ -154,4 +176,21 @@ async def revoke_assignment(
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid UUID")
 
-    return await service.revoke_assignment(a_uuid, user.id)
\ No newline at end of file
+    return await service.revoke_assignment(a_uuid, user.id)
+
+
+@router.post("/assignments/{assignment_id}/rating")
+async def rate_assignment(
+        assignment_id: str,
+        user: Principal = Depends(get_current_teacher),
+        service: RatingService = Depends(get_rating_service)
+):
+    """
+    Пересчитать рейтинг участников назначения (после дедлайна, один раз).
+    """
+    try:
+        a_uuid = UUID(assignment_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid UUID")
+
+    return await service.rate_assignment(a_uuid, user.id)
@@ -1,23 +1,25 @@
 # fastapi-backend/src/api/student_router.py
-from typing import List, Dict
-from fastapi import APIRouter, Depends, status
+from typing import List, Dict, Optional
+from fastapi import APIRouter, Depends, Header, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from ..database import get_db
-from ..schemas.schemas import SubmissionCreate, SubmissionResponse, ProblemBase, ProblemResponse
+from ..schemas.schemas import SubmissionCreate, SubmissionResponse, StudentProblemListItem, StudentProblemResponse
 from ..repository.problem_repository import ProblemRepository
 from ..repository.submission_repository import SubmissionRepository
-from ..services.problem_service import ProblemService
+from ..services.problem_service import ProblemService, etag_matches
 from ..services.submission_service import SubmissionService
-from ..services.auth_service import get_current_student, get_current_student_or_teacher_or_admin
-from ..models.user_models import User
+from ..services.auth_service import Principal, get_current_student, get_current_student_or_teacher_or_admin
 from fastapi import HTTPException
 
 student_router = APIRouter(prefix="/api/student", tags=["Функционал студента"])
 
+# Браузер может хранить ответ, но обязан перепроверять его через If-None-Match
+PROBLEM_CACHE_CONTROL = "private, no-cache"
+
 
 async def get_services(
         db: AsyncSession = Depends(get_db),
-        current_user: User = Depends(get_current_student_or_teacher_or_admin),
+        current_user: Principal = Depends(get_current_student_or_teacher_or_admin),
 ) -> Dict:
     problem_repo = ProblemRepository(db)
     submission_repo = SubmissionRepository(db)
@@ -81,31 +83,50 @@ async def delete_pending_submission(
     return response
 
 
-@student_router.get("/problems", response_model=List[ProblemBase])
+@student_router.get("/problems", response_model=List[StudentProblemListItem])
 async def list_problems(
         services: Dict = Depends(get_services)  
 ):
-    """Получение списка всех опубликованных задач."""
-    problems = await services["problem"].problem_repo.list_public_problems()
-
-    return problems
+    """Получение списка всех опубликованных задач (с отметкой «решена»)."""
+    current_user = services["current_user"]
+    return await services["problem"].list_problems_for_student(current_user.id)
 
 
-@student_router.get("/problems/{problem_id}", response_model=ProblemResponse)
+@student_router.get("/problems/{problem_id}", response_model=StudentProblemResponse)
 async def get_problem_details(
         problem_id: str,
+        if_none_match: Optional[str] = Header(None),
         services: Dict = Depends(get_services),
 ):
-    """Получить одну задачу по ID."""
+    """
+    Получить условие задачи по ID (без скрытых тестов).
+
+    Поддерживает условные запросы: при совпадении If-None-Match с текущим
+    ETag возвращается 304 без загрузки условия и тестов.
+    """
     current_user = services["current_user"]
     problem_service = services["problem"]
 
-    problem = await problem_service.get_problem_details_for_student(problem_id, current_user.id)
+    etag = await problem_service.get_problem_etag_for_student(problem_id, current_user.id)
+    if etag is not None and etag_matches(if_none_match, etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers={"ETag": etag, "Cache-Control": PROBLEM_CACHE_CONTROL},
+        )
+
+    rendered = None
+    if etag is not None:
+        rendered = await problem_service.render_problem_for_student(problem_id, current_user.id, etag)
 
-    if not problem:
+    if not rendered:
         raise  HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Задача не найдена или доступ запрещен"
         )
 
-    return problem
\ No newline at end of file
+    etag, body = rendered
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"ETag": etag, "Cache-Control": PROBLEM_CACHE_CONTROL},
+    )
@@ -1,20 +1,27 @@
 # fastapi-backend/src/api/teacher_router.py
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Literal, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response, status
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..database import get_db
-from ..schemas.schemas import ProblemCreate, ProblemUpdate, ProblemResponse
-from ..services.auth_service import get_current_teacher
+from ..schemas.schemas import ProblemCreate, ProblemUpdate, ProblemResponse, test_data_url
+from ..services.auth_service import Principal, get_current_teacher
 from ..services.teacher_service import TeacherService
-from ..models.user_models import User
+from ..services.test_data_service import TestDataService
+from ..services.problem_package_service import ProblemPackageService
+
+TestDataKind = Literal["input", "output"]
 
 teacher_router = APIRouter(prefix="/api/teacher", tags=["Преподавательский функционал"])
 
 
 async def get_teacher_service(
         db: AsyncSession = Depends(get_db),
-        current_user: User = Depends(get_current_teacher),
+        current_user: Principal = Depends(get_current_teacher),
 ) -> TeacherService:
     """Создает TeacherService для преподавателя."""
     return TeacherService(db, current_user)
@@ -79,4 +86,172 @@ async def list_problem_submissions(
         service: TeacherService = Depends(get_teacher_service)
 ):
     """Получить все попытки решения своих задач."""
-    return await service.get_problem_submissions(problem_id, skip=skip, limit=limit)
\ No newline at end of file
+    return await service.get_problem_submissions(problem_id, skip=skip, limit=limit)
+
+# === Данные отдельных тестов (потоковая загрузка/выгрузка) ===
+
+async def get_test_data_service(
+        db: AsyncSession = Depends(get_db),
+        current_user: Principal = Depends(get_current_teacher),
+) -> TestDataService:
+    return TestDataService(db, current_user)
+
+
+def _test_metadata(test) -> dict:
+    return {
+        "test_id": str(test.id),
+        "order_index": test.order_index,
+        "is_sample": test.is_sample,
+        "input_sha256": test.input_sha256,
+        "input_size": test.input_size,
+        "input_url": test_data_url(test.problem_id, test.id, "input"),
+        "output_sha256": test.output_sha256,
+        "output_size": test.output_size,
+        "output_url": test_data_url(test.problem_id, test.id, "output"),
+    }
+
+
+@teacher_router.post("/problems/{problem_id}/tests", status_code=status.HTTP_201_CREATED)
+async def create_test(
+        problem_id: UUID,
+        is_sample: bool = False,
+        service: TestDataService = Depends(get_test_data_service)
+):
+    """Создать пустой тест; его input/output загружаются отдельными запросами."""
+    test = await service.create_test(problem_id, is_sample)
+    return _test_metadata(test)
+
+
+@teacher_router.get("/problems/{problem_id}/tests/{test_id}/{kind}/upload", status_code=status.HTTP_200_OK)
+async def get_test_upload_status(
+        problem_id: UUID,
+        test_id: UUID,
+        kind: TestDataKind,
+        service: TestDataService = Depends(get_test_data_service)
+):
+    """Сколько байт уже принято — с этого offset нужно продолжать загрузку."""
+    received = await service.get_upload_status(problem_id, test_id, kind)
+    return {"received": received}
+
+
+@teacher_router.delete("/problems/{problem_id}/tests/{test_id}/{kind}/upload", status_code=status.HTTP_204_NO_CONTENT)
+async def abort_test_upload(
+        problem_id: UUID,
+        test_id: UUID,
+        kind: TestDataKind,
+        service: TestDataService = Depends(get_test_data_service)
+):
+    """Сбросить незавершённую загрузку."""
+    await service.abort_upload(problem_id, test_id, kind)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@teacher_router.put("/problems/{problem_id}/tests/{test_id}/{kind}")
+async def upload_test_data(
+        problem_id: UUID,
+        test_id: UUID,
+        kind: TestDataKind,
+        request: Request,
+        content_range: Optional[str] = Header(None),
+        x_content_sha256: Optional[str] = Header(None),
+        service: TestDataService = Depends(get_test_data_service)
+):
+    """
+    Загрузить input или output теста сырым телом запроса.
+
+    - Без Content-Range тело считается файлом целиком.
+    - С "Content-Range: bytes start-end/total" файл загружается кусками;
+      при обрыве текущий offset можно узнать через GET .../upload.
+    - X-Content-SHA256 (SHA-256 всего файла) проверяется после последнего куска.
+    - Файл больше TEST_UPLOAD_MAX_BYTES отклоняется с 413.
+
+    Завершённая загрузка создаёт новую версию набора тестов; в ответе
+    возвращается id теста в этой версии (старый id тоже продолжает работать).
+    """
+    progress = await service.upload_chunk(
+        problem_id, test_id, kind, request.stream(), content_range, x_content_sha256
+    )
+    if not progress.complete:
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content={"received": progress.received, "total": progress.total, "complete": False},
+        )
+    return {"complete": True, **_test_metadata(progress.test)}
+
+
+@teacher_router.get("/problems/{problem_id}/tests/{test_id}/{kind}")
+async def download_test_data(
+        problem_id: UUID,
+        test_id: UUID,
+        kind: TestDataKind,
+        range_header: Optional[str] = Header(None, alias="Range"),
+        service: TestDataService = Depends(get_test_data_service)
+):
+    """Скачать input или output теста потоком (поддерживается Range)."""
+    data = await service.open_download(problem_id, test_id, kind, range_header)
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Content-Length": str(data.end - data.start + 1 if data.size else 0),
+        "Content-Disposition": f'attachment; filename="{test_id}.{kind}"',
+    }
+    if data.partial:
+        headers["Content-Range"] = f"bytes {data.start}-{data.end}/{data.size}"
+    return StreamingResponse(
+        data.body,
+        status_code=status.HTTP_206_PARTIAL_CONTENT if data.partial else status.HTTP_200_OK,
+        media_type="application/octet-stream",
+        headers=headers,
+    )
+
+
+# === Экспорт и импорт задач архивом ===
+
+async def get_problem_package_service(
+        db: AsyncSession = Depends(get_db),
+        current_user: Principal = Depends(get_current_teacher),
+) -> ProblemPackageService:
+    return ProblemPackageService(db, current_user)
+
+
+def _archive_response(body, filename: str) -> StreamingResponse:
+    return StreamingResponse(
+        body,
+        media_type="application/x-tar",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@teacher_router.get("/problems/export")
+async def export_my_problems(
+        service: ProblemPackageService = Depends(get_problem_package_service)
+):
+    """Выгрузить все свои задачи одним tar-архивом (потоком)."""
+    problem_ids = await service.get_export_problem_ids()
+    return _archive_response(service.stream_archive(problem_ids), "problems.tar")
+
+
+@teacher_router.get("/problems/{problem_id}/export")
+async def export_problem(
+        problem_id: UUID,
+        service: ProblemPackageService = Depends(get_problem_package_service)
+):
+    """Выгрузить задачу (условие, примеры, лимиты и тесты) tar-архивом."""
+    problem = await service.get_export_problem(problem_id)
+    return _archive_response(service.stream_archive([problem.id]), f"{problem.slug or problem.id}.tar")
+
+
+@teacher_router.post("/problems/import", status_code=status.HTTP_201_CREATED)
+async def import_problems(
+        request: Request,
+        service: ProblemPackageService = Depends(get_problem_package_service)
+):
+    """
+    Создать задачи из tar-архива, полученного через /export.
+
+    Архив передаётся сырым телом запроса. Если slug уже занят,
+    к нему добавляется числовой суффикс. Импорт атомарный: при ошибке
+    в любой задаче не создаётся ни одна. Архив больше
+    PROBLEM_PACKAGE_MAX_BYTES отклоняется с 413.
+    """
+    imported = await service.import_archive(request.stream())
+    return {"imported": imported}
@@ -5,14 +5,14 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import  Dict
 from ..database import get_db
-from ..schemas.user_schemas import  UserResponse, CreateUserRequest, UpdateUserRequest
+from ..schemas.user_schemas import  UserResponse, CreateUserRequest, UpdateUserRequest, RatingHistoryItem
 from ..repository.problem_repository import ProblemRepository
 from  ..repository.submission_repository import  SubmissionRepository
 from ..services.problem_service import ProblemService
 from  ..services.submission_service import SubmissionService
 from ..services.user_service import UserService
 from  ..repository.user_repository import UserRepository
-from ..services.auth_service import get_current_user
+from ..services.auth_service import get_current_user, get_current_principal, Principal
 from ..core.security import require_roles
 
 from ..models.user_models import User
@@ -40,10 +40,36 @@ async def get_current_user_profile(
 ):
     return current_user
 
+@users.get("/me/stats")
+async def get_current_user_stats(
+        current_user: Principal = Depends(get_current_principal),
+        service: UserService = Depends(get_user_service)
+):
+    """Решённые задачи текущего пользователя: всего, по сложности, последние."""
+    return await service.get_solved_stats(current_user.id)
+
+@users.get("/me/rating-history", response_model=List[RatingHistoryItem])
+async def get_current_user_rating_history(
+        limit: int = Query(50, ge=1, le=500),
+        current_user: Principal = Depends(get_current_principal),
+        service: UserService = Depends(get_user_service)
+):
+    """Изменения рейтинга текущего пользователя по назначениям и соревнованиям."""
+    return await service.get_rating_history(current_user.id, limit)
+
+@users.get("/me/activity")
+async def get_current_user_activity(
+        days: int = Query(365, ge=1, le=366),
+        current_user: Principal = Depends(get_current_principal),
+        service: UserService = Depends(get_user_service)
+):
+    """Тепловая карта активности текущего пользователя."""
+    return await service.get_activity(current_user.id, days)
+
 @users.get("/{user_id}", response_model=UserResponse)
 async def get_current_user_profile(
         user_id: uuid.UUID,
-        current_user: User = Depends(get_current_user),
+        current_user: Principal = Depends(get_current_principal),
         service: UserService = Depends(get_user_service)
 ):
     user = await service.get_user_by_id(user_id)
@@ -52,6 +78,33 @@ async def get_current_user_profile(
     return user
 
 
+@users.get("/{user_id}/stats")
+async def get_user_stats(
+        user_id: uuid.UUID,
+        current_user: Principal = Depends(get_current_principal),
+        service: UserService = Depends(get_user_service)
+):
+    """Решённые задачи пользователя (для страницы профиля)."""
+    user = await service.get_user_by_id(user_id)
+    if not user:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    return await service.get_solved_stats(user_id)
+
+
+@users.get("/{user_id}/activity")
+async def get_user_activity(
+        user_id: uuid.UUID,
+        days: int = Query(365, ge=1, le=366),
+        current_user: Principal = Depends(get_current_principal),
+        service: UserService = Depends(get_user_service)
+):
+    """Тепловая карта активности пользователя (для страницы профиля)."""
+    user = await service.get_user_by_id(user_id)
+    if not user:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    return await service.get_activity(user_id, days)
+
+
 @users.put("/me", response_model=UserResponse)
 async def update_current_user(
         data: UpdateUserRequest,
@@ -75,7 +128,7 @@ async def update_current_user(
 async def get_user_by_username(
     username: str,
     service: UserService = Depends(get_user_service),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     """Получить профиль пользователя по username"""
     user = await service.get_user_by_username(username)
@@ -0,0 +1,148 @@
+# core/cache.py
+"""
+Простые in-process кэши.
+
+Кэши живут в памяти процесса (каждый воркер uvicorn держит свой),
+поэтому подходят только для данных, которые можно безопасно
+пересчитать: ключ должен однозначно определять содержимое
+(например, id задачи + номер ревизии).
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Generic, Hashable, Optional, TypeVar
+
+V = TypeVar("V")
+
+_MISSING = object()
+
+
+class LRUCache(Generic[V]):
+    """
+    Ограниченный по размеру LRU-кэш с необязательным TTL.
+
+    Не потокобезопасен: рассчитан на использование из одного event loop.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple[float, V]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Optional[V]:
+        item = self._data.get(key, _MISSING)
+        if item is _MISSING:
+            self.misses += 1
+            return default
+
+        expires_at, value = item
+        if expires_at and expires_at < time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: V, ttl: Optional[float] = None) -> None:
+        ttl = ttl if ttl is not None else self.ttl
+        expires_at = time.monotonic() + ttl if ttl else 0.0
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def items(self) -> list:
+        """Живые записи (key, value) без изменения порядка LRU и счётчиков."""
+        now = time.monotonic()
+        return [
+            (key, value)
+            for key, (expires_at, value) in self._data.items()
+            if not expires_at or expires_at >= now
+        ]
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else None,
+        }
+
+
+class SingleFlightCache(Generic[V]):
+    """
+    LRU/TTL-кэш с защитой от «стампеда»: если записи нет, её строит
+    только один запрос, остальные ждут тот же результат.
+
+    Построение идёт отдельной задачей: отмена ожидающего запроса
+    (клиент отключился) не прерывает его для остальных, поэтому build
+    не должен зависеть от сессии БД конкретного запроса.
+
+    invalidate() увеличивает поколение кэша: результат построения,
+    начатого до сброса, возвращается ожидающим, но не сохраняется.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None):
+        self.cache: LRUCache[V] = LRUCache(maxsize=maxsize, ttl=ttl)
+        self._inflight: Dict[Hashable, "asyncio.Future[V]"] = {}
+        self._generation = 0
+
+    async def get_or_build(self, key: Hashable, build: Callable[[], Awaitable[V]]) -> V:
+        value = self.cache.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._build(key, build, self._generation))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        return await asyncio.shield(task)
+
+    async def _build(self, key: Hashable, build: Callable[[], Awaitable[V]], generation: int) -> V:
+        value = await build()
+        if generation == self._generation:
+            self.cache.set(key, value)
+        return value
+
+    def _finish(self, key: Hashable, task: "asyncio.Future[V]") -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Ошибку получат ожидающие; если их не осталось — не шумим в логах
+        if not task.cancelled():
+            task.exception()
+
+    def invalidate(self, predicate: Optional[Callable[[Hashable], bool]] = None) -> None:
+        """Сбросить записи, для ключей которых predicate истинен (без predicate — все)."""
+        self._generation += 1
+        if predicate is None:
+            self.cache.clear()
+            self._inflight.clear()
+            return
+        for key, _ in self.cache.items():
+            if predicate(key):
+                self.cache.delete(key)
+        for key in [key for key in self._inflight if predicate(key)]:
+            del self._inflight[key]
+
+    def stats(self) -> dict:
+        return {**self.cache.stats(), "inflight": len(self._inflight)}
@@ -1,3 +1,5 @@
+from typing import Literal, Optional
+
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -6,6 +8,79 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int
     REFRESH_TOKEN_EXPIRE_DAYS: int
     DATABASE_URL: str
+    # Ключ HMAC для хранения refresh токенов (по умолчанию SECRET_KEY)
+    REFRESH_TOKEN_HMAC_KEY: Optional[str] = None
+    # Повтор заменённого refresh токена в течение этого окна считается
+    # гонкой параллельных вкладок, а не кражей: семейство не отзывается
+    REFRESH_TOKEN_REUSE_GRACE_SECONDS: int = 10
+    # Отзыв access токенов: фильтр Блума в каждом воркере, синхронизация
+    # с revoked_tokens и полное перестроение (удаляет истёкшие jti)
+    TOKEN_REVOCATION_SYNC_SECONDS: float = 5.0
+    TOKEN_REVOCATION_REBUILD_SECONDS: int = 3600
+    TOKEN_REVOCATION_FILTER_CAPACITY: int = 100000
+    TOKEN_REVOCATION_FILTER_ERROR_RATE: float = 0.001
+    TOKEN_REVOCATION_CHECK_CACHE_SIZE: int = 10000
+    # Ограничение входа скользящими окнами: попытки с IP (с запасом на
+    # класс за одним NAT) и неудачные попытки на аккаунт. Счётчики в памяти
+    # воркера ("memory") или общие в Postgres ("postgres")
+    LOGIN_THROTTLE_BACKEND: Literal["memory", "postgres"] = "memory"
+    LOGIN_THROTTLE_IP_LIMIT: int = 100
+    LOGIN_THROTTLE_IP_WINDOW_SECONDS: int = 60
+    LOGIN_THROTTLE_ACCOUNT_LIMIT: int = 10
+    LOGIN_THROTTLE_ACCOUNT_WINDOW_SECONDS: int = 900
+    LOGIN_THROTTLE_MAX_KEYS: int = 100000
+    # Проверенные access токены (подпись не перепроверяется до exp)
+    ACCESS_TOKEN_CACHE_SIZE: int = 10000
+
+    # Каталог файлового хранилища тестов (контентно-адресуемые файлы)
+    TEST_STORAGE_DIR: str = "/var/lib/online-judge/tests"
+    # Максимальный размер одного файла теста при загрузке (байт)
+    TEST_UPLOAD_MAX_BYTES: int = 1024 * 1024 * 1024
+    # Максимальный размер импортируемого архива задач (байт)
+    PROBLEM_PACKAGE_MAX_BYTES: int = 4 * 1024 * 1024 * 1024
+
+    # Фоновая очистка мягко удалённых задач и пользователей
+    PURGE_BATCH_SIZE: int = 1000
+    PURGE_PAUSE_SECONDS: float = 0.2
+    PURGE_INTERVAL_SECONDS: int = 60
+
+    # Кэш матрицы прогресса группы: сбрасывается вердиктами в этом воркере,
+    # TTL ограничивает устаревание из-за вердиктов в других воркерах
+    GROUP_PROGRESS_CACHE_SIZE: int = 256
+    GROUP_PROGRESS_CACHE_TTL_SECONDS: int = 60
+
+    # Кэш дашборда: общий топ студентов и списки задач по пользователям
+    DASHBOARD_TOP_STUDENTS_TTL_SECONDS: int = 15
+    DASHBOARD_USER_CACHE_SIZE: int = 10000
+    DASHBOARD_USER_CACHE_TTL_SECONDS: int = 300
+
+    # Таблица результатов соревнований: как часто воркер подтягивает изменения
+    # других воркеров и сколько соревнований держит в памяти
+    CONTEST_SCOREBOARD_SYNC_SECONDS: float = 2.0
+    CONTEST_SCOREBOARD_CACHE_SIZE: int = 64
+    # Поток таблицы (SSE): сколько событий ждёт медленного клиента до
+    # пересылки полного снимка и как часто слать keep-alive
+    CONTEST_STREAM_QUEUE_SIZE: int = 32
+    CONTEST_STREAM_HEARTBEAT_SECONDS: float = 15.0
+    # Прогрев перед стартом соревнования: за сколько секунд до начала
+    # загружать условия и тесты в кэши и как часто искать такие соревнования
+    CONTEST_PREWARM_LEAD_SECONDS: float = 300.0
+    CONTEST_PREWARM_POLL_SECONDS: float = 30.0
+    CONTEST_STATEMENTS_CACHE_TTL_SECONDS: int = 600
+    # Кэш принципалов (id, роль, активность) для зависимостей авторизации
+    PRINCIPAL_CACHE_SIZE: int = 10000
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+    # Пул потоков для bcrypt: число потоков и предел ожидающих задач,
+    # сверх которого вход отвечает 503 вместо бесконечного ожидания
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_PENDING: int = 256
+    # Восстановление таблицы из журнала попыток: снимок свёртки через каждые
+    # N событий; события моложе SETTLE секунд в снимок не попадают (могут
+    # быть ещё не закоммичены — проверка идёт внутри транзакции попытки)
+    CONTEST_REPLAY_SNAPSHOT_EVENTS: int = 2000
+    CONTEST_REPLAY_SETTLE_SECONDS: float = 120.0
+    # Сколько версий тестов (лимиты + все тесты) держать в памяти для проверки
+    JUDGE_BUNDLE_CACHE_SIZE: int = 64
 
     class Config:
         env_file = ".env"
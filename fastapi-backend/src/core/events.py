@@ -0,0 +1,67 @@
+# core/events.py
+"""
+Внутрипроцессные события приложения.
+
+Сервисы, которым нужно реагировать на изменения (сброс кэшей и т.п.),
+подписываются декоратором (@on_verdict, @on_problems_changed); события
+публикуются после коммита изменения. Подписчики работают только
+в текущем воркере, поэтому кэши, которые они сбрасывают, должны иметь и TTL.
+"""
+
+import inspect
+import logging
+from typing import Any, Awaitable, Callable, List, Union
+
+logger = logging.getLogger(__name__)
+
+Listener = Callable[..., Union[None, Awaitable[None]]]
+
+
+class Event:
+    """Список подписчиков одного события."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._listeners: List[Listener] = []
+
+    def subscribe(self, listener: Listener) -> Listener:
+        self._listeners.append(listener)
+        return listener
+
+    async def publish(self, *args: Any) -> None:
+        """
+        Оповещает подписчиков по очереди.
+        Ошибка подписчика логируется и не влияет на ответ пользователю.
+        """
+        for listener in self._listeners:
+            try:
+                result = listener(*args)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception:
+                logger.exception(f"Ошибка обработчика события {self.name}: {listener.__qualname__}")
+
+
+# Сохранён вердикт попытки (аргумент — Submission)
+verdict_recorded = Event("verdict_recorded")
+# Изменился набор задач, доступных студентам: публикация, правка, удаление,
+# назначение группе, состав группы (без аргументов)
+problems_changed = Event("problems_changed")
+# Изменились роль, профиль или активность пользователя, либо он удалён (аргумент — user_id)
+user_changed = Event("user_changed")
+
+on_verdict = verdict_recorded.subscribe
+on_problems_changed = problems_changed.subscribe
+on_user_changed = user_changed.subscribe
+
+
+async def publish_verdict(submission) -> None:
+    await verdict_recorded.publish(submission)
+
+
+async def publish_problems_changed() -> None:
+    await problems_changed.publish()
+
+
+async def publish_user_changed(user_id) -> None:
+    await user_changed.publish(user_id)
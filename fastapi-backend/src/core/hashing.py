@@ -0,0 +1,65 @@
+# core/hashing.py
+"""
+Пул потоков для bcrypt.
+
+Хэширование пароля занимает сотни миллисекунд процессорного времени.
+Вызванное прямо в обработчике, оно останавливает event loop воркера:
+при массовом входе в начале занятия ждут все остальные запросы.
+bcrypt отпускает GIL, поэтому вычисления выносятся в отдельный пул
+из PASSWORD_HASH_WORKERS потоков, а loop продолжает обслуживать запросы.
+
+Очередь ограничена: если ожидающих задач больше PASSWORD_HASH_MAX_PENDING,
+новый запрос сразу получает 503 с Retry-After, а не ждёт минутами.
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, TypeVar
+
+from fastapi import HTTPException, status
+
+from .config import settings
+from .metrics import increment, register_gauge
+
+T = TypeVar("T")
+
+_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="password-hash",
+)
+# Задачи в пуле (выполняются + ждут очереди); меняется только из event loop
+_pending = 0
+
+register_gauge("password_hash.pending", lambda: _pending)
+
+
+async def run_hashing(func: Callable[..., T], *args) -> T:
+    """
+    Выполняет func(*args) в пуле хэширования.
+
+    Raises:
+        HTTPException 503: очередь пула заполнена
+    """
+    global _pending
+    if _pending >= settings.PASSWORD_HASH_MAX_PENDING:
+        increment("password_hash.rejected")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Сервер перегружен, повторите попытку позже",
+            headers={"Retry-After": "1"},
+        )
+
+    _pending += 1
+    started = time.perf_counter()
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_executor, func, *args)
+    finally:
+        _pending -= 1
+        increment("password_hash.calls")
+        increment("password_hash.total_ms", int((time.perf_counter() - started) * 1000))
+
+
+def shutdown_hashing() -> None:
+    """Останавливает пул (при остановке приложения)."""
+    _executor.shutdown(wait=False, cancel_futures=True)
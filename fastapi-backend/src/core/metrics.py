@@ -0,0 +1,41 @@
+# core/metrics.py
+"""
+Метрики процесса: статистика кэшей и простые счётчики.
+
+Значения свои у каждого воркера uvicorn (как и сами кэши); отдаются
+администратору в /api/admin/metrics.
+"""
+
+from collections import defaultdict
+from typing import Any, Callable, Dict, TypeVar
+
+C = TypeVar("C")
+
+# Зарегистрированные кэши: имя -> объект с методом stats()
+_caches: Dict[str, Any] = {}
+_counters: Dict[str, int] = defaultdict(int)
+# Мгновенные значения: имя -> функция без аргументов
+_gauges: Dict[str, Callable[[], Any]] = {}
+
+
+def register_cache(name: str, cache: C) -> C:
+    """Регистрирует кэш (LRUCache / SingleFlightCache) и возвращает его же."""
+    _caches[name] = cache
+    return cache
+
+
+def increment(name: str, value: int = 1) -> None:
+    _counters[name] += value
+
+
+def register_gauge(name: str, read: Callable[[], Any]) -> None:
+    """Регистрирует мгновенное значение (глубина очереди и т.п.)."""
+    _gauges[name] = read
+
+
+def collect() -> dict:
+    return {
+        "caches": {name: cache.stats() for name, cache in _caches.items()},
+        "counters": dict(_counters),
+        "gauges": {name: read() for name, read in _gauges.items()},
+    }
@@ -0,0 +1,76 @@
+# core/rate_limit.py
+"""
+Скользящее окно для ограничения частоты.
+
+Приближение двумя соседними фиксированными окнами: число событий за
+последние window секунд оценивается как current + previous * (доля
+прошлого окна, ещё попадающая в скользящее). На ключ хранится три
+числа, а не список отметок времени, поэтому память не растёт с частотой
+запросов — это важно под атакой подбора паролей.
+"""
+
+import math
+import time
+from collections import OrderedDict
+from typing import Hashable, Optional, Tuple
+
+
+def window_estimate(current: int, previous: int, elapsed: float, window: float) -> float:
+    """Оценка числа событий за последние window секунд."""
+    return current + previous * max(0.0, 1.0 - elapsed / window)
+
+
+def retry_after(current: int, previous: int, elapsed: float, window: float, limit: int) -> int:
+    """Через сколько секунд оценка опустится ниже limit (если новых событий не будет)."""
+    if current < limit:
+        # Ждём, пока доля прошлого окна уменьшится достаточно
+        wait = window * (1.0 - (limit - current) / previous) - elapsed if previous else 0.0
+    else:
+        # Текущее окно станет прошлым и должно «вытечь» до limit
+        wait = (window - elapsed) + window * (1.0 - limit / current)
+    return max(1, math.ceil(wait))
+
+
+class SlidingWindowCounter:
+    """
+    Счётчики скользящего окна в памяти процесса, не больше max_keys ключей
+    (самые давние вытесняются). Не потокобезопасен: один event loop.
+    """
+
+    def __init__(self, window: float, max_keys: int = 100_000):
+        self.window = window
+        self.max_keys = max_keys
+        # key -> [начало текущего окна, событий в нём, событий в прошлом окне]
+        self._buckets: "OrderedDict[Hashable, list]" = OrderedDict()
+
+    def _state(self, key: Hashable, now: float) -> Tuple[int, int, float]:
+        start = now - now % self.window
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            return 0, 0, now - start
+        bucket_start, current, previous = bucket
+        if bucket_start == start:
+            return current, previous, now - start
+        if bucket_start == start - self.window:
+            return 0, current, now - start
+        return 0, 0, now - start
+
+    def peek(self, key: Hashable, limit: int, now: Optional[float] = None) -> Optional[int]:
+        """None — лимит не достигнут, иначе секунды до Retry-After."""
+        now = time.time() if now is None else now
+        current, previous, elapsed = self._state(key, now)
+        if window_estimate(current, previous, elapsed, self.window) >= limit:
+            return retry_after(current, previous, elapsed, self.window, limit)
+        return None
+
+    def hit(self, key: Hashable, now: Optional[float] = None) -> None:
+        """Учитывает событие."""
+        now = time.time() if now is None else now
+        current, previous, _ = self._state(key, now)
+        self._buckets[key] = [now - now % self.window, current + 1, previous]
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._buckets)
@@ -0,0 +1,116 @@
+# core/rating.py
+"""
+Пересчёт рейтинга по итогам соревнования (алгоритм Codeforces).
+
+Для каждого участника:
+    seed  — ожидаемое место по Эло: 1 + сумма вероятностей проиграть остальным;
+    m     — среднее геометрическое ожидаемого и фактического места;
+    need  — рейтинг, при котором ожидаемое место равно m;
+    delta — (need - rating) / 2, затем поправки, чтобы сумма изменений
+            была около нуля, а у сильнейших не раздувалась.
+
+Всё считается одним векторным проходом NumPy. Рейтинги — целые числа,
+поэтому функция seed(R) вычисляется сразу для всех R сверткой
+гистограммы рейтингов с ядром вероятности Эло: O(V log V + n log V),
+где V — ширина шкалы рейтинга, вместо O(n^2) попарных сравнений.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+# Шкала, на которой ищется need (как у Codeforces: [1, 8000))
+RATING_SEARCH_MIN = 1
+RATING_SEARCH_MAX = 8000
+
+ELO_SCALE = 400.0
+# Максимальная «отрицательная» поправка для сильнейших участников
+TOP_ADJUSTMENT_LIMIT = 10
+
+
+@dataclass
+class RatingChanges:
+    """Результат пересчёта, в порядке входных массивов."""
+    ranks: np.ndarray
+    deltas: np.ndarray
+    new_ratings: np.ndarray
+
+
+def ranks_from_scores(scores: np.ndarray) -> np.ndarray:
+    """
+    Места по результатам (больше — лучше).
+
+    Участники с равным результатом получают одно место — худшее в группе
+    (двое разделивших 1-2 места оба получают 2), как у Codeforces.
+    """
+    scores = np.asarray(scores, dtype=np.float64)
+    order = np.argsort(-scores, kind="stable")
+    sorted_scores = scores[order]
+    # Для каждой позиции — индекс конца её группы равных результатов
+    group_end = np.searchsorted(-sorted_scores, -sorted_scores, side="right")
+    ranks = np.empty(len(scores), dtype=np.int64)
+    ranks[order] = group_end
+    return ranks
+
+
+def _win_probability_sums(ratings: np.ndarray, size: int) -> np.ndarray:
+    """
+    S[R] = сумма по всем участникам вероятности обыграть игрока с рейтингом R,
+    для каждого целого R в [0, size).
+    """
+    counts = np.bincount(np.clip(ratings, 0, size - 1), minlength=size).astype(np.float64)
+    # Ядро f(d) = 1 / (1 + 10^(d / 400)) для d = R - r_j в [-(size-1), size-1]
+    d = np.arange(-(size - 1), size, dtype=np.float64)
+    kernel = 1.0 / (1.0 + np.power(10.0, d / ELO_SCALE))
+
+    # Свёртка через FFT: длина результата 3*size-2, нужный срез — [size-1, 2*size-1)
+    length = 1 << int(np.ceil(np.log2(3 * size - 2)))
+    full = np.fft.irfft(np.fft.rfft(counts, length) * np.fft.rfft(kernel, length), length)
+    return full[size - 1:2 * size - 1]
+
+
+def compute_rating_changes(ratings, scores) -> RatingChanges:
+    """
+    Пересчитывает рейтинги всех участников.
+
+    Args:
+        ratings: текущие рейтинги участников (целые)
+        scores: результаты участников (больше — лучше)
+    """
+    ratings = np.asarray(ratings, dtype=np.int64)
+    n = len(ratings)
+    if n == 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return RatingChanges(ranks=empty, deltas=empty, new_ratings=empty)
+
+    ranks = ranks_from_scores(scores)
+    if n == 1:
+        return RatingChanges(ranks=ranks, deltas=np.zeros(1, dtype=np.int64), new_ratings=ratings.copy())
+
+    size = max(RATING_SEARCH_MAX, int(ratings.max()) + 1)
+    wins = _win_probability_sums(ratings, size)
+
+    # Ожидаемое место: против себя вероятность ровно 0.5, её исключаем
+    seeds = 1.0 + wins[np.clip(ratings, 0, size - 1)] - 0.5
+    mid_ranks = np.sqrt(seeds * ranks)
+
+    # seed(R) = 1 + S(R) убывает по R: ищем наибольший R с seed(R) >= m
+    search = np.arange(RATING_SEARCH_MIN, RATING_SEARCH_MAX)
+    seed_curve = 1.0 + wins[search]
+    positions = np.searchsorted(-seed_curve, -mid_ranks, side="right")
+    need = search[np.clip(positions - 1, 0, len(search) - 1)]
+
+    deltas = np.trunc((need - ratings) / 2).astype(np.int64)
+
+    # Сумма изменений — чуть меньше нуля, чтобы рейтинги не инфлировали
+    deltas += int(np.trunc(-deltas.sum() / n)) - 1
+
+    # Сильнейшие участники не должны в сумме расти за счёт остальных
+    top_count = min(n, 4 * int(round(np.sqrt(n))))
+    top = np.argsort(-ratings, kind="stable")[:top_count]
+    top_adjustment = int(np.trunc(-deltas[top].sum() / top_count))
+    deltas += min(max(top_adjustment, -TOP_ADJUSTMENT_LIMIT), 0)
+
+    # Не ниже 1: ноль в users.rating означает «ещё без рейтинга»
+    new_ratings = np.maximum(ratings + deltas, RATING_SEARCH_MIN)
+    return RatingChanges(ranks=ranks, deltas=new_ratings - ratings, new_ratings=new_ratings)
@@ -0,0 +1,130 @@
+# core/scoreboard.py
+"""
+Правила таблицы результатов ICPC.
+
+Строка участника — словарь клеток {id задачи: клетка}. Клетка хранит всё,
+что нужно и для полной, и для замороженной таблицы:
+
+    attempts            неудачные попытки до первого ACCEPTED
+    visible_attempts    из них отправленные до заморозки
+    pending             попытки после заморозки (до ACCEPTED включительно)
+    minute              минута первого ACCEPTED от начала, None — не решена
+    solved_after_freeze ACCEPTED получен после заморозки
+
+Место: больше решённых, затем меньше штраф, затем раньше последняя сдача;
+при равенстве всех трёх место общее.
+"""
+
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..models.base import SubmissionStatus
+
+# Вердикты, за которые начисляется штраф (ошибка компиляции и сбой проверки — нет)
+PENALTY_STATUSES = (
+    SubmissionStatus.WRONG_ANSWER,
+    SubmissionStatus.TIME_LIMIT,
+    SubmissionStatus.RUNTIME_ERROR,
+)
+
+
+def empty_cell() -> dict:
+    return {
+        "attempts": 0,
+        "visible_attempts": 0,
+        "pending": 0,
+        "minute": None,
+        "solved_after_freeze": False,
+    }
+
+
+def contest_minute(start_time: datetime, moment: datetime) -> int:
+    return max(int((moment - start_time).total_seconds() // 60), 0)
+
+
+def apply_verdict(results: Dict[str, dict], problem_key: str, status: SubmissionStatus,
+                  minute: int, frozen: bool) -> bool:
+    """
+    Учитывает вердикт в строке участника (изменяет results на месте).
+
+    Returns:
+        Изменилась ли строка
+    """
+    if status != SubmissionStatus.ACCEPTED and status not in PENALTY_STATUSES:
+        return False
+
+    cell = results.setdefault(problem_key, empty_cell())
+    if cell["minute"] is not None:
+        # Попытки после решения не учитываются
+        return False
+
+    if frozen:
+        cell["pending"] += 1
+    if status == SubmissionStatus.ACCEPTED:
+        cell["minute"] = minute
+        cell["solved_after_freeze"] = frozen
+    else:
+        cell["attempts"] += 1
+        if not frozen:
+            cell["visible_attempts"] += 1
+    return True
+
+
+def results_from_attempts(
+        attempts: Iterable[Tuple[str, str, datetime, SubmissionStatus]],
+        start_time: datetime,
+        freeze_at: Optional[datetime] = None,
+) -> Dict[str, Dict[str, dict]]:
+    """
+    Строит строки таблицы с нуля по попыткам (user_id, problem_id,
+    момент отправки, вердикт) в любом порядке — для перепроверок и
+    восстановления таблицы из журнала.
+
+    Returns:
+        {user_id: {problem_id: клетка}}
+    """
+    rows: Dict[str, Dict[str, dict]] = {}
+    for user_id, problem_id, submitted_at, status in sorted(attempts, key=lambda attempt: attempt[2]):
+        frozen = freeze_at is not None and submitted_at >= freeze_at
+        apply_verdict(
+            rows.setdefault(user_id, {}), problem_id, SubmissionStatus(status),
+            contest_minute(start_time, submitted_at), frozen,
+        )
+    return rows
+
+
+def view_cell(cell: Optional[dict], frozen_view: bool) -> dict:
+    """Клетка для отображения: решена ли, попытки, минута, ожидающие попытки."""
+    if cell is None:
+        return {"solved": False, "attempts": 0, "minute": None, "pending": 0}
+
+    solved = cell["minute"] is not None and not (frozen_view and cell["solved_after_freeze"])
+    if solved:
+        return {"solved": True, "attempts": cell["attempts"], "minute": cell["minute"], "pending": 0}
+    if frozen_view:
+        return {"solved": False, "attempts": cell["visible_attempts"], "minute": None, "pending": cell["pending"]}
+    return {"solved": False, "attempts": cell["attempts"], "minute": None, "pending": 0}
+
+
+def summarize(cells: List[dict], penalty_minutes: int) -> Tuple[int, int, int]:
+    """(решено, штраф, минута последней сдачи) по клеткам view_cell."""
+    solved = penalty = last_minute = 0
+    for cell in cells:
+        if cell["solved"]:
+            solved += 1
+            penalty += cell["minute"] + penalty_minutes * cell["attempts"]
+            last_minute = max(last_minute, cell["minute"])
+    return solved, penalty, last_minute
+
+
+def assign_ranks(rows: List[dict]) -> List[dict]:
+    """Сортирует строки (с ключами solved, penalty, last_minute) и проставляет места."""
+    rows.sort(key=lambda row: (-row["solved"], row["penalty"], row["last_minute"], row["username"]))
+    rank = 0
+    previous = None
+    for position, row in enumerate(rows, start=1):
+        key = (row["solved"], row["penalty"], row["last_minute"])
+        if key != previous:
+            rank, previous = position, key
+        row["rank"] = rank
+    return rows
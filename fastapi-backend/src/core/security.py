@@ -5,7 +5,9 @@
 """
 
 import hashlib
+import hmac
 import secrets
+import time
 import logging
 from datetime import datetime, timedelta, timezone
 from typing import Optional, Union, List
@@ -18,7 +20,11 @@ from jose import JWTError, jwt
 from passlib.context import CryptContext
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from .cache import LRUCache
 from .config import settings
+from .hashing import run_hashing
+from .metrics import register_cache
+from ..services.revocation_service import is_token_revoked
 
 # Настройка логирования
 logger = logging.getLogger(__name__)
@@ -34,6 +40,13 @@ oauth2_scheme = OAuth2PasswordBearer(
 )
 
 
+# Проверенные payload access токенов: sha256(токен) -> payload.
+# Запись живёт до exp токена; payload общий для запросов — только для чтения
+access_token_cache: LRUCache[dict] = register_cache(
+    "access_tokens", LRUCache(maxsize=settings.ACCESS_TOKEN_CACHE_SIZE)
+)
+
+
 class Role(str, Enum):
     """Роли пользователей в системе."""
     STUDENT = "student"
@@ -51,22 +64,19 @@ class Role(str, Enum):
 
 
 class PasswordService:
-    """Сервис для работы с паролями."""
+    """
+    Сервис для работы с паролями.
+    bcrypt выполняется в пуле потоков (core.hashing), не блокируя event loop.
+    """
 
     @staticmethod
-    def hash_password(password: str) -> str:
-        """
-        Хэширует пароль с использованием bcrypt.
-        bcrypt имеет ограничение в 72 байта.
-        """
+    def _hash_password_sync(password: str) -> str:
+        # bcrypt имеет ограничение в 72 байта
         password_bytes = password.encode("utf-8")[:72]
         return pwd_context.hash(password_bytes.decode("utf-8", errors="ignore"))
 
     @staticmethod
-    def verify_password(plain_password: str, hashed_password: str) -> bool:
-        """Проверяет пароль против хэша."""
-        if not hashed_password:
-            return False
+    def _verify_password_sync(plain_password: str, hashed_password: str) -> bool:
         plain_bytes = plain_password.encode("utf-8")[:72]
         try:
             return pwd_context.verify(plain_bytes, hashed_password)
@@ -75,25 +85,16 @@ class PasswordService:
             return False
 
     @staticmethod
-    def hash_refresh_token(token: str) -> str:
-        """
-        Создаёт безопасный хэш для refresh токена.
-        Используем SHA256 + bcrypt для дополнительной безопасности.
-        """
-        sha256_hash = hashlib.sha256(token.encode()).hexdigest()
-        return pwd_context.hash(sha256_hash)
+    async def hash_password(password: str) -> str:
+        """Хэширует пароль с использованием bcrypt."""
+        return await run_hashing(PasswordService._hash_password_sync, password)
 
     @staticmethod
-    def verify_refresh_token(token: str, hashed_token: str) -> bool:
-        """Проверяет refresh токен против хэша."""
-        if not hashed_token:
-            return False
-        sha256_hash = hashlib.sha256(token.encode()).hexdigest()
-        try:
-            return pwd_context.verify(sha256_hash, hashed_token)
-        except Exception as e:
-            logger.warning(f"Ошибка верификации refresh токена: {e}")
+    async def verify_password(plain_password: str, hashed_password: str) -> bool:
+        """Проверяет пароль против хэша."""
+        if not hashed_password:
             return False
+        return await run_hashing(PasswordService._verify_password_sync, plain_password, hashed_password)
 
 
 class TokenService:
@@ -192,14 +193,34 @@ class TokenService:
         """
         Верифицирует access токен.
 
+        Подпись проверяется один раз на токен: затем payload берётся
+        из access_token_cache до истечения exp.
+
         Returns:
             Payload если токен валиден и является access токеном, иначе None
         """
+        key = hashlib.sha256(token.encode("utf-8")).digest()
+        payload = access_token_cache.get(key)
+        if payload is not None:
+            return payload
+
         payload = TokenService.decode_token(token)
         if payload and payload.get("token_type") == "access":
+            ttl = payload.get("exp", 0) - time.time()
+            if ttl > 0:
+                access_token_cache.set(key, payload, ttl=ttl)
             return payload
         return None
 
+    @staticmethod
+    def refresh_token_digest(token: str) -> str:
+        """
+        HMAC-SHA256 refresh токена для хранения в БД.
+        Без ключа по утёкшей таблице нельзя проверить даже украденный токен.
+        """
+        key = (settings.REFRESH_TOKEN_HMAC_KEY or settings.SECRET_KEY).encode("utf-8")
+        return hmac.new(key, token.encode("utf-8"), hashlib.sha256).hexdigest()
+
     @staticmethod
     def verify_refresh_token(token: str) -> Optional[dict]:
         """
@@ -216,10 +237,14 @@ class TokenService:
 
 # === ЗАВИСИМОСТИ (Dependencies) ===
 
-async def get_current_user_id(token: str = Depends(oauth2_scheme)) -> UUID:
+async def get_token_payload(token: str = Depends(oauth2_scheme)) -> dict:
     """
-    Извлекает ID пользователя из access токена.
-    Используется как базовая зависимость.
+    Возвращает полный payload токена.
+    Полезно когда нужен доступ к роли без запроса в БД.
+
+    FastAPI вычисляет зависимость один раз на запрос, поэтому
+    get_current_user_id и require_roles в одном обработчике
+    разделяют одну проверку токена.
     """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -233,20 +258,17 @@ async def get_current_user_id(token: str = Depends(oauth2_scheme)) -> UUID:
         logger.warning("Попытка доступа с невалидным access токеном")
         raise credentials_exception
 
-    user_id_str = payload.get("sub") or payload.get("user_id")
-    if not user_id_str:
+    if await is_token_revoked(payload.get("jti")):
+        logger.warning("Попытка доступа с отозванным access токеном")
         raise credentials_exception
 
-    try:
-        return UUID(user_id_str)
-    except ValueError:
-        raise credentials_exception
+    return payload
 
 
-def get_token_payload(token: str = Depends(oauth2_scheme)) -> dict:
+async def get_current_user_id(payload: dict = Depends(get_token_payload)) -> UUID:
     """
-    Возвращает полный payload токена.
-    Полезно когда нужен доступ к роли без запроса в БД.
+    Извлекает ID пользователя из access токена.
+    Используется как базовая зависимость.
     """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -254,11 +276,14 @@ def get_token_payload(token: str = Depends(oauth2_scheme)) -> dict:
         headers={"WWW-Authenticate": "Bearer"},
     )
 
-    payload = TokenService.verify_access_token(token)
-    if not payload:
+    user_id_str = payload.get("sub") or payload.get("user_id")
+    if not user_id_str:
         raise credentials_exception
 
-    return payload
+    try:
+        return UUID(user_id_str)
+    except ValueError:
+        raise credentials_exception
 
 
 def require_roles(*allowed_roles: Union[Role, str]):
@@ -1,6 +1,12 @@
 
 from .user_models import User
-from .problem_models import Problem, TestCase, Example
-from .submission_models import Submission
+from .problem_models import Problem, ProblemTestSet, TestCase, Example
+from .submission_models import Submission, SubmissionEvent
+from .stats_models import ProblemStats, UserScore, UserSolvedProblem, UserDailyActivity, PlatformDailyActivity
+from .access_models import ProblemAccess
+from .rating_models import RatingHistory
+from .contest_models import Contest, ContestProblem, ContestParticipant, ContestReplaySnapshot
+from .token_models import RefreshToken, RevokedToken
+from .throttle_models import LoginThrottleBucket
 
 from .base import DifficultyLevel, CheckerType, SubmissionStatus
\ No newline at end of file
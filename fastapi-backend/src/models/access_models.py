@@ -0,0 +1,33 @@
+# fastapi-backend/src/models/access_models.py
+
+from sqlalchemy import PrimaryKeyConstraint
+
+from .base import Base, Column, UUID, String, DateTime, ForeignKey, datetime
+
+# Значения ProblemAccess.source
+ACCESS_SOURCE_DIRECT = "direct"
+ACCESS_SOURCE_GROUP_PREFIX = "group:"
+
+
+def group_access_source(group_id) -> str:
+    """Источник доступа для задачи, назначенной группе."""
+    return f"{ACCESS_SOURCE_GROUP_PREFIX}{group_id}"
+
+
+class ProblemAccess(Base):
+    """
+    Доступ студента к непубличной задаче.
+
+    Одна строка на каждый источник доступа: прямое назначение ("direct")
+    или назначение группе, в которой состоит студент ("group:<group_id>").
+    Первичный ключ начинается с user_id, поэтому список доступных задач
+    студента читается по индексу.
+    """
+    __tablename__ = "problem_access"
+    __table_args__ = (PrimaryKeyConstraint("user_id", "problem_id", "source"),)
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    problem_id = Column(UUID(as_uuid=True), ForeignKey("problems.id", ondelete="CASCADE"), nullable=False, index=True)
+    source = Column(String(64), nullable=False)
+
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
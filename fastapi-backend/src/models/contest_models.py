@@ -1,12 +1,96 @@
-from .base import Base, Column, UUID, String,  DateTime, ForeignKey, relationship, uuid, Boolean
-from .base import DifficultyLevel, CheckerType
+from sqlalchemy import Index, PrimaryKeyConstraint
+
+from .base import Base, Column, UUID, String, Text, Integer, DateTime, ForeignKey, JSON, Boolean, relationship, datetime, uuid
+
 
 class Contest(Base):
+    """
+    Соревнование: набор задач и окно времени [start_time, end_time).
+
+    С freeze_at до публикации итогов (unfrozen) участники видят
+    замороженную таблицу: попытки после заморозки отображаются как «ожидающие».
+    """
     __tablename__ = "contests"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     title = Column(String(200), nullable=False)
-    start_time = Column(DateTime, nullable=False)
+    description = Column(Text, nullable=True)
+    author_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True, index=True)
+
+    start_time = Column(DateTime, nullable=False, index=True)
     end_time = Column(DateTime, nullable=False)
-    problem_ids = Column(UUID(as_uuid=True), ForeignKey("problems.id"), nullable=False)
-    participants = relationship("Participant", backref="contest")
+    freeze_at = Column(DateTime, nullable=True)
+    unfrozen = Column(Boolean, nullable=False, default=False, server_default="false")
+
+    # Штраф в минутах за каждую неудачную попытку по решённой задаче
+    penalty_minutes = Column(Integer, nullable=False, default=20, server_default="20")
+
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    problems = relationship(
+        "ContestProblem", back_populates="contest",
+        order_by="ContestProblem.order_index", cascade="all, delete-orphan",
+    )
+
+
+class ContestProblem(Base):
+    """Задача соревнования с буквой (A, B, ...) и позицией в таблице."""
+    __tablename__ = "contest_problems"
+    __table_args__ = (PrimaryKeyConstraint("contest_id", "problem_id"),)
+
+    contest_id = Column(UUID(as_uuid=True), ForeignKey("contests.id", ondelete="CASCADE"), nullable=False)
+    problem_id = Column(UUID(as_uuid=True), ForeignKey("problems.id", ondelete="CASCADE"), nullable=False, index=True)
+    label = Column(String(8), nullable=False)
+    order_index = Column(Integer, nullable=False)
+
+    contest = relationship("Contest", back_populates="problems")
+    problem = relationship("Problem")
+
+
+class ContestParticipant(Base):
+    """
+    Участник соревнования и его строка в таблице результатов.
+
+    results — клетки по задачам (ключ — id задачи, см. core.scoreboard);
+    solved/penalty — итог без учёта заморозки. Строка обновляется
+    в транзакции вердикта, updated_at позволяет воркерам подтягивать
+    только изменившиеся строки.
+    """
+    __tablename__ = "contest_participants"
+    __table_args__ = (PrimaryKeyConstraint("contest_id", "user_id"),)
+
+    contest_id = Column(UUID(as_uuid=True), ForeignKey("contests.id", ondelete="CASCADE"), nullable=False)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    registered_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    solved = Column(Integer, nullable=False, default=0, server_default="0")
+    penalty = Column(Integer, nullable=False, default=0, server_default="0")
+    results = Column(JSON, nullable=False, default=dict)
+
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+
+Index("ix_contest_participants_sync", ContestParticipant.contest_id, ContestParticipant.updated_at)
+
+
+class ContestReplaySnapshot(Base):
+    """
+    Снимок свёртки журнала попыток соревнования на момент as_of.
+
+    state — последний известный к as_of вердикт каждой попытки:
+    {submission_id: [user_id, problem_id, submitted_at (ISO), status]}.
+    Восстановление таблицы начинается с ближайшего снимка и дочитывает
+    только события после него.
+    """
+    __tablename__ = "contest_replay_snapshots"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    contest_id = Column(UUID(as_uuid=True), ForeignKey("contests.id", ondelete="CASCADE"), nullable=False)
+    as_of = Column(DateTime, nullable=False)
+    # Сколько событий свёрнуто в снимок (для отладки и метрик)
+    events = Column(Integer, nullable=False, default=0)
+    state = Column(JSON, nullable=False, default=dict)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+
+Index("ix_contest_replay_snapshots_contest_as_of", ContestReplaySnapshot.contest_id, ContestReplaySnapshot.as_of)
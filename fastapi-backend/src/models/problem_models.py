@@ -3,7 +3,7 @@
 from .base import Base, Column, UUID, String, Integer, Text, DateTime, ForeignKey, Enum, relationship, datetime, uuid, Boolean
 from .base import DifficultyLevel, CheckerType
 from sqlalchemy.dialects.postgresql import ARRAY
-from sqlalchemy import  text
+from sqlalchemy import  text, BigInteger, UniqueConstraint
 
 class Problem(Base):
     __tablename__ = "problems"
@@ -23,14 +23,70 @@ class Problem(Base):
     is_public = Column(Boolean, default=False)
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    # Растёт при любом изменении условия, примеров, тестов или лимитов
+    revision = Column(Integer, nullable=False, default=1, server_default="1")
+
+    # Мягкое удаление: задача скрыта, зависимые строки удаляет фоновая очистка
+    deleted_at = Column(DateTime, nullable=True, index=True)
+
+    # Устарело: прямые назначения теперь в problem_access
+    # (перенос — scripts/migrate_problem_access.py), колонка больше не читается
     assigned_student_ids = Column(
         ARRAY(UUID(as_uuid=True)),
         nullable=False,
         server_default=text("'{}'")
     )
+
+    # Текущая (последняя) неизменяемая версия набора тестов и лимитов
+    current_test_set_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("problem_test_sets.id", use_alter=True, name="fk_problems_current_test_set_id"),
+        nullable=True,
+    )
+
     author = relationship("User", back_populates="problems") 
     examples = relationship("Example", back_populates="problem")
-    test_cases = relationship("TestCase", back_populates="problem")
+    current_test_set = relationship("ProblemTestSet", foreign_keys=[current_test_set_id], post_update=True)
+    # Тесты текущей версии; тесты старых версий остаются в БД, но сюда не попадают.
+    # У задачи без версий (scripts/backfill_test_sets.py ещё не запускался) —
+    # её тесты без версии, как в ProblemRepository.get_test_cases
+    test_cases = relationship(
+        "TestCase",
+        primaryjoin="""or_(
+            Problem.current_test_set_id == foreign(TestCase.test_set_id),
+            and_(
+                Problem.current_test_set_id.is_(None),
+                Problem.id == foreign(TestCase.problem_id),
+                TestCase.test_set_id.is_(None),
+            ),
+        )""",
+        order_by="TestCase.order_index",
+        viewonly=True,
+    )
+
+
+class ProblemTestSet(Base):
+    """
+    Неизменяемая версия набора тестов задачи вместе с лимитами.
+
+    Любое изменение тестов или лимитов создаёт новую версию; попытка
+    запоминает версию, на которой её проверяли, поэтому id версии —
+    стабильный ключ для кэшей и дедупликации.
+    """
+    __tablename__ = "problem_test_sets"
+    __table_args__ = (UniqueConstraint("problem_id", "version", name="uq_problem_test_sets_version"),)
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    problem_id = Column(UUID(as_uuid=True), ForeignKey("problems.id"), nullable=False, index=True)
+    version = Column(Integer, nullable=False)
+
+    time_limit = Column(Integer, nullable=False, default=1000)
+    memory_limit = Column(Integer, nullable=False, default=256)
+    checker_type = Column(Enum(CheckerType), nullable=False, default=CheckerType.EXACT)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    test_cases = relationship("TestCase", back_populates="test_set", order_by="TestCase.order_index")
 
 
 class TestCase(Base):
@@ -39,13 +95,28 @@ class TestCase(Base):
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     problem_id = Column(UUID(as_uuid=True), ForeignKey("problems.id"))
+    test_set_id = Column(UUID(as_uuid=True), ForeignKey("problem_test_sets.id"), nullable=True, index=True)
+
+    # Устаревшее хранение в БД: заполнено только у строк, ещё не перенесённых
+    # в файловое хранилище (см. src/storage/test_storage.py).
+    input_data = Column(Text, nullable=True)
+    output_data = Column(Text, nullable=True)
+
+    # Файловое хранилище: контентный адрес и размер в байтах
+    input_sha256 = Column(String(64), nullable=True, index=True)
+    input_size = Column(BigInteger, nullable=True)
+    output_sha256 = Column(String(64), nullable=True, index=True)
+    output_size = Column(BigInteger, nullable=True)
 
-    input_data = Column(Text, nullable=False)
-    output_data = Column(Text, nullable=False)
     order_index = Column(Integer, nullable=False)
     is_sample = Column(Boolean, default=False)
 
-    problem = relationship("Problem", back_populates="test_cases")
+    problem = relationship("Problem")
+    test_set = relationship("ProblemTestSet", back_populates="test_cases")
+
+    @property
+    def is_file_backed(self) -> bool:
+        return self.input_sha256 is not None and self.output_sha256 is not None
 
 
 class Example(Base):
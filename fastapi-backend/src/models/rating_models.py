@@ -0,0 +1,38 @@
+# fastapi-backend/src/models/rating_models.py
+
+from sqlalchemy import Index, UniqueConstraint
+
+from .base import Base, Column, UUID, String, Integer, DateTime, ForeignKey, datetime, uuid
+
+# Значения RatingHistory.source_type
+RATING_SOURCE_ASSIGNMENT = "assignment"
+RATING_SOURCE_CONTEST = "contest"
+
+
+class RatingHistory(Base):
+    """
+    Изменение рейтинга пользователя по итогам одного рейтингового события
+    (назначения группе или соревнования).
+
+    Уникальность (source_type, source_id, user_id) не даёт пересчитать одно
+    событие дважды; индекс (user_id, created_at) отдаёт историю пользователя.
+    """
+    __tablename__ = "rating_history"
+    __table_args__ = (
+        UniqueConstraint("source_type", "source_id", "user_id", name="uq_rating_history_source_user"),
+        Index("ix_rating_history_user_created", "user_id", "created_at"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+
+    source_type = Column(String(32), nullable=False)
+    source_id = Column(UUID(as_uuid=True), nullable=False)
+
+    old_rating = Column(Integer, nullable=False)
+    new_rating = Column(Integer, nullable=False)
+    delta = Column(Integer, nullable=False)
+    # Место в событии (при равенстве — худшее из разделённых)
+    rank = Column(Integer, nullable=False)
+
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
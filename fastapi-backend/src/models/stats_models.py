@@ -0,0 +1,111 @@
+# fastapi-backend/src/models/stats_models.py
+
+from sqlalchemy import BigInteger, Date, Index
+
+from .base import Base, Column, UUID, String, Integer, DateTime, ForeignKey, Enum, datetime, SubmissionStatus
+
+
+class ProblemStats(Base):
+    """
+    Агрегированная статистика по задаче.
+
+    Обновляется инкрементально в той же транзакции, что и вердикт попытки,
+    поэтому страница статистики читает одну строку по первичному ключу.
+    """
+    __tablename__ = "problem_stats"
+
+    problem_id = Column(UUID(as_uuid=True), ForeignKey("problems.id", ondelete="CASCADE"), primary_key=True)
+
+    total_submissions = Column(Integer, nullable=False, default=0, server_default="0")
+    accepted_submissions = Column(Integer, nullable=False, default=0, server_default="0")
+    wrong_answer_count = Column(Integer, nullable=False, default=0, server_default="0")
+    time_limit_count = Column(Integer, nullable=False, default=0, server_default="0")
+    runtime_error_count = Column(Integer, nullable=False, default=0, server_default="0")
+    compile_error_count = Column(Integer, nullable=False, default=0, server_default="0")
+    internal_error_count = Column(Integer, nullable=False, default=0, server_default="0")
+
+    # Суммы для средних значений (по вердиктам ACCEPTED и WRONG_ANSWER)
+    metrics_count = Column(Integer, nullable=False, default=0, server_default="0")
+    sum_time_ms = Column(BigInteger, nullable=False, default=0, server_default="0")
+    sum_memory_mb = Column(BigInteger, nullable=False, default=0, server_default="0")
+
+    distinct_solvers = Column(Integer, nullable=False, default=0, server_default="0")
+
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class UserScore(Base):
+    """
+    Материализованная строка лидерборда студента.
+
+    solved_count и last_accepted_at обновляются в транзакции первого
+    ACCEPTED по задаче,
+    rating — вместе с users.rating. Топ-N читается сканом индекса
+    ix_user_scores_rank без агрегации по submissions.
+    """
+    __tablename__ = "user_scores"
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+
+    # Количество различных решённых задач (строк user_solved_problems)
+    solved_count = Column(Integer, nullable=False, default=0, server_default="0")
+    rating = Column(Integer, nullable=False, default=1500, server_default="1500")
+    last_accepted_at = Column(DateTime, nullable=True)
+
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+Index(
+    "ix_user_scores_rank",
+    UserScore.solved_count.desc(), UserScore.rating.desc(), UserScore.last_accepted_at,
+)
+
+
+class UserSolvedProblem(Base):
+    """
+    Задача, решённая пользователем: одна строка на пару (пользователь, задача).
+
+    Вставляется при первом ACCEPTED; первичный ключ (user_id, problem_id)
+    отвечает на «решена ли задача» и «что решил пользователь» по индексу.
+    """
+    __tablename__ = "user_solved_problems"
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    problem_id = Column(UUID(as_uuid=True), ForeignKey("problems.id", ondelete="CASCADE"), primary_key=True, index=True)
+
+    # Время отправки первой принятой попытки
+    first_ac_at = Column(DateTime, nullable=False)
+    # Сколько проверенных неудачных попыток было до неё
+    attempts_before_ac = Column(Integer, nullable=False, default=0, server_default="0")
+
+
+class UserDailyActivity(Base):
+    """
+    Попытки пользователя за день (UTC) — данные для тепловой карты профиля.
+
+    Увеличивается в транзакции вердикта; год активности читается
+    диапазоном по первичному ключу (user_id, day).
+    """
+    __tablename__ = "user_daily_activity"
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)
+
+    submissions = Column(Integer, nullable=False, default=0, server_default="0")
+    accepted = Column(Integer, nullable=False, default=0, server_default="0")
+
+
+class PlatformDailyActivity(Base):
+    """
+    Попытки на платформе за день (UTC) в разрезе языка и вердикта.
+
+    Первичный ключ начинается с day, поэтому графики за период читаются
+    одним диапазоном индекса.
+    """
+    __tablename__ = "platform_daily_activity"
+
+    day = Column(Date, primary_key=True)
+    language = Column(String(50), primary_key=True)
+    status = Column(Enum(SubmissionStatus), primary_key=True)
+
+    count = Column(Integer, nullable=False, default=0, server_default="0")
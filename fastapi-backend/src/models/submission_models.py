@@ -1,13 +1,20 @@
 from .base import Base, Column, UUID, String, Text, DateTime, ForeignKey, Enum, JSON, Integer, relationship, datetime, uuid
 from .base import SubmissionStatus 
+from sqlalchemy import BigInteger, Index
 
 class Submission(Base):
     """Модель для хранения отправленных решений студентов."""
     __tablename__ = "submissions"
+    # Попытки пользователя по задаче (первое ACCEPTED, попытки до него)
+    __table_args__ = (Index("ix_submissions_user_problem", "user_id", "problem_id"),)
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     problem_id = Column(UUID(as_uuid=True), ForeignKey("problems.id"), nullable=False)
+    # Версия набора тестов, на которой была проверена попытка
+    test_set_id = Column(UUID(as_uuid=True), ForeignKey("problem_test_sets.id"), nullable=True, index=True)
+    # Соревнование, в рамках которого отправлена попытка
+    contest_id = Column(UUID(as_uuid=True), ForeignKey("contests.id", ondelete="SET NULL"), nullable=True, index=True)
 
     user = relationship("User", back_populates="submissions")
     problem = relationship("Problem")
@@ -25,4 +32,33 @@ class Submission(Base):
     submitted_at = Column(DateTime, default=datetime.utcnow)
 
     def __repr__(self):
-        return f"<Submission id={self.id} user_id={self.user_id}>, problem_id={self.problem_id}> status: {self.status}"
\ No newline at end of file
+        return f"<Submission id={self.id} user_id={self.user_id}>, problem_id={self.problem_id}> status: {self.status}"
+
+
+# Типы событий журнала попыток
+SUBMISSION_EVENT_SUBMITTED = "submitted"
+SUBMISSION_EVENT_VERDICT = "verdict"
+SUBMISSION_EVENT_REJUDGED = "rejudged"
+
+
+class SubmissionEvent(Base):
+    """
+    Журнал попыток (только добавление): отправка, вердикт, перепроверка.
+
+    submissions хранит лишь последний вердикт; по журналу можно восстановить,
+    какой вердикт был у попытки в любой момент (см. services/replay_service.py).
+    """
+    __tablename__ = "submission_events"
+    __table_args__ = (Index("ix_submission_events_contest_created", "contest_id", "created_at"),)
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    submission_id = Column(UUID(as_uuid=True), nullable=False, index=True)
+    user_id = Column(UUID(as_uuid=True), nullable=False, index=True)
+    problem_id = Column(UUID(as_uuid=True), nullable=False, index=True)
+    contest_id = Column(UUID(as_uuid=True), nullable=True)
+
+    event_type = Column(String(16), nullable=False)
+    status = Column(Enum(SubmissionStatus), nullable=False)
+    # Момент отправки попытки (по нему попытка попадает в таблицу)
+    submitted_at = Column(DateTime, nullable=False)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
@@ -0,0 +1,20 @@
+# fastapi-backend/src/models/throttle_models.py
+
+from sqlalchemy import Integer, PrimaryKeyConstraint
+
+from .base import Base, Column, String, DateTime
+
+
+class LoginThrottleBucket(Base):
+    """
+    Счётчик попыток входа за одно фиксированное окно — общий для всех
+    воркеров режим ограничения (LOGIN_THROTTLE_BACKEND=postgres).
+    Скользящее окно оценивается по текущему и прошлому окну ключа.
+    """
+    __tablename__ = "login_throttle_buckets"
+    __table_args__ = (PrimaryKeyConstraint("key", "window_start"),)
+
+    # "ip:<адрес>" или "account:<email>"
+    key = Column(String(320), nullable=False)
+    window_start = Column(DateTime, nullable=False, index=True)
+    hits = Column(Integer, nullable=False, default=0)
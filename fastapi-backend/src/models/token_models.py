@@ -0,0 +1,45 @@
+# fastapi-backend/src/models/token_models.py
+
+from .base import Base, Column, UUID, String, DateTime, ForeignKey, datetime, uuid
+
+
+class RefreshToken(Base):
+    """
+    Выданный refresh токен: одна строка на токен (а не на пользователя).
+
+    Хранится только HMAC-SHA256 токена. Токен — длинная случайная строка,
+    подбирать его бессмысленно, поэтому медленный bcrypt здесь не нужен.
+
+    Токены одного входа образуют семейство (family_id): при ротации старый
+    токен помечается rotated_at, новый получает то же семейство. Повторное
+    предъявление заменённого токена — признак кражи, отзывается всё
+    семейство. Активные семейства пользователя — его сессии на устройствах.
+    """
+    __tablename__ = "refresh_tokens"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    family_id = Column(UUID(as_uuid=True), nullable=False, index=True)
+    # hex HMAC-SHA256 токена (TokenService.refresh_token_digest)
+    digest = Column(String(64), nullable=False, unique=True)
+    user_agent = Column(String(255), nullable=True)
+
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False, index=True)
+    rotated_at = Column(DateTime, nullable=True)
+    revoked_at = Column(DateTime, nullable=True)
+
+
+class RevokedToken(Base):
+    """
+    Отозванный до истечения access токен (по claim jti).
+
+    Строка нужна только до expires_at (exp токена): после него подпись
+    и так не пройдёт проверку, поэтому истёкшие записи удаляет очистка.
+    """
+    __tablename__ = "revoked_tokens"
+
+    jti = Column(String(64), primary_key=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=True, index=True)
+    expires_at = Column(DateTime, nullable=False, index=True)
+    revoked_at = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
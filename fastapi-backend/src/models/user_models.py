@@ -5,6 +5,10 @@ from .base import (
 )
 from sqlalchemy import Boolean
 
+# Рейтинг нового участника
+INITIAL_RATING = 1500
+
+
 class Role(str, Enum):
     STUDENT = "student"
     TEACHER = "teacher"
@@ -29,17 +33,18 @@ class User(Base):
     role: Role = Column(String(50), nullable=False, index=True, default=Role.STUDENT.value)
     full_name: str | None = Column(String(200), nullable=True)
     university_id: str | None = Column(String(100), nullable=True, index=True)
-    rating: int = Column(Integer, default=1500)
+    rating: int = Column(Integer, default=INITIAL_RATING)
 
     created_at: datetime = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
     updated_at: datetime = Column(
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
     )
 
-    refresh_token_hash: str | None = Column(String, nullable=True)
-
     is_active: bool = Column(Boolean, default=True, nullable=False, server_default="true")
 
+    # Мягкое удаление: пользователь скрыт, зависимые строки удаляет фоновая очистка
+    deleted_at: datetime | None = Column(DateTime, nullable=True, index=True)
+
     # --- Связи ---
     problems = relationship("Problem", back_populates="author", cascade="all, delete-orphan")
     submissions = relationship("Submission", back_populates="user", cascade="all, delete-orphan")
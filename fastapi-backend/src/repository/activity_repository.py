@@ -0,0 +1,117 @@
+# fastapi-backend/src/repository/activity_repository.py
+from datetime import date
+from typing import List, Optional
+import uuid
+
+from sqlalchemy import select, delete, func, cast, Date
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.base import SubmissionStatus
+from ..models.stats_models import UserDailyActivity, PlatformDailyActivity
+from ..models.submission_models import Submission
+from .problem_stats_repository import FINAL_STATUSES
+
+
+class ActivityRepository:
+    """
+    Репозиторий дневных агрегатов активности.
+
+    Учитываются попытки с финальным вердиктом (как в problem_stats),
+    по дню отправки попытки в UTC.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def record_verdict(self, submission: Submission) -> None:
+        """Учитывает вердикт попытки. Не коммитит."""
+        status = SubmissionStatus(submission.status)
+        if status not in FINAL_STATUSES:
+            return
+
+        day = submission.created_at.date()
+        accepted = 1 if status == SubmissionStatus.ACCEPTED else 0
+
+        user_stmt = insert(UserDailyActivity).values(
+            user_id=submission.user_id, day=day, submissions=1, accepted=accepted
+        )
+        user_stmt = user_stmt.on_conflict_do_update(
+            index_elements=[UserDailyActivity.user_id, UserDailyActivity.day],
+            set_={
+                "submissions": UserDailyActivity.submissions + 1,
+                "accepted": UserDailyActivity.accepted + user_stmt.excluded.accepted,
+            },
+        )
+        await self.db.execute(user_stmt)
+
+        platform_stmt = insert(PlatformDailyActivity).values(
+            day=day, language=submission.language, status=status, count=1
+        )
+        platform_stmt = platform_stmt.on_conflict_do_update(
+            index_elements=[PlatformDailyActivity.day, PlatformDailyActivity.language, PlatformDailyActivity.status],
+            set_={"count": PlatformDailyActivity.count + 1},
+        )
+        await self.db.execute(platform_stmt)
+
+    async def get_user_activity(self, user_id: uuid.UUID, since: date) -> List[UserDailyActivity]:
+        stmt = (
+            select(UserDailyActivity)
+            .where(UserDailyActivity.user_id == user_id, UserDailyActivity.day >= since)
+            .order_by(UserDailyActivity.day)
+        )
+        return list((await self.db.execute(stmt)).scalars().all())
+
+    async def get_platform_activity(self, since: date) -> List[PlatformDailyActivity]:
+        stmt = (
+            select(PlatformDailyActivity)
+            .where(PlatformDailyActivity.day >= since)
+            .order_by(PlatformDailyActivity.day, PlatformDailyActivity.language, PlatformDailyActivity.status)
+        )
+        return list((await self.db.execute(stmt)).scalars().all())
+
+    async def rebuild(self, since: Optional[date] = None) -> tuple:
+        """
+        Пересчитывает агрегаты из таблицы submissions (бэкфилл или починка).
+        С since пересчитываются только дни начиная с него.
+
+        Returns:
+            (строк user_daily_activity, строк platform_daily_activity)
+        """
+        day = cast(Submission.created_at, Date)
+        final = Submission.status.in_(FINAL_STATUSES)
+
+        user_rows = (
+            select(
+                Submission.user_id,
+                day,
+                func.count(),
+                func.count().filter(Submission.status == SubmissionStatus.ACCEPTED),
+            )
+            .where(final)
+            .group_by(Submission.user_id, day)
+        )
+        platform_rows = (
+            select(day, Submission.language, Submission.status, func.count())
+            .where(final)
+            .group_by(day, Submission.language, Submission.status)
+        )
+
+        clear_user = delete(UserDailyActivity)
+        clear_platform = delete(PlatformDailyActivity)
+        if since is not None:
+            user_rows = user_rows.where(Submission.created_at >= since)
+            platform_rows = platform_rows.where(Submission.created_at >= since)
+            clear_user = clear_user.where(UserDailyActivity.day >= since)
+            clear_platform = clear_platform.where(PlatformDailyActivity.day >= since)
+
+        await self.db.execute(clear_user)
+        await self.db.execute(clear_platform)
+        users = await self.db.execute(
+            insert(UserDailyActivity).from_select(["user_id", "day", "submissions", "accepted"], user_rows)
+        )
+        platform = await self.db.execute(
+            insert(PlatformDailyActivity).from_select(["day", "language", "status", "count"], platform_rows)
+        )
+        await self.db.commit()
+        return users.rowcount, platform.rowcount
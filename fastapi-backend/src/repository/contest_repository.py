@@ -0,0 +1,244 @@
+# fastapi-backend/src/repository/contest_repository.py
+from datetime import datetime
+from typing import List, Optional, Sequence
+import uuid
+
+from sqlalchemy import select, update, exists, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from ..core.scoreboard import apply_verdict, contest_minute, view_cell, summarize, results_from_attempts
+from ..models.base import SubmissionStatus
+from ..models.contest_models import Contest, ContestProblem, ContestParticipant
+from ..models.problem_models import Problem
+from ..models.submission_models import Submission
+from ..models.user_models import User
+from .rating_repository import starting_rating
+
+
+def contest_label(index: int) -> str:
+    """A, B, ..., Z, AA, AB, ..."""
+    label = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        label = chr(ord("A") + remainder) + label
+    return label
+
+
+class ContestRepository:
+    """Репозиторий соревнований, участников и строк таблицы результатов."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def create_contest(self, contest: Contest, problem_ids: Sequence[uuid.UUID]) -> Contest:
+        contest.problems = [
+            ContestProblem(problem_id=problem_id, label=contest_label(index), order_index=index)
+            for index, problem_id in enumerate(problem_ids)
+        ]
+        self.db.add(contest)
+        await self.db.commit()
+        return await self.get_by_id(contest.id)
+
+    async def get_by_id(self, contest_id: uuid.UUID) -> Optional[Contest]:
+        stmt = (
+            select(Contest)
+            .where(Contest.id == contest_id)
+            .options(selectinload(Contest.problems).selectinload(ContestProblem.problem))
+        )
+        result = await self.db.execute(stmt)
+        return result.scalars().first()
+
+    async def list_contests(self, skip: int = 0, limit: int = 50) -> List[Contest]:
+        stmt = select(Contest).order_by(Contest.start_time.desc()).offset(skip).limit(limit)
+        result = await self.db.execute(stmt)
+        return list(result.scalars().all())
+
+    async def get_starting_between(self, since: datetime, until: datetime) -> List:
+        """Соревнования, начинающиеся в (since, until]: строки (id, start_time)."""
+        stmt = select(Contest.id, Contest.start_time).where(
+            Contest.start_time > since,
+            Contest.start_time <= until,
+        )
+        return (await self.db.execute(stmt)).all()
+
+    async def get_problem_details(self, contest_id: uuid.UUID) -> List[ContestProblem]:
+        """Задачи соревнования с условиями и примерами (для участников после старта)."""
+        stmt = (
+            select(ContestProblem)
+            .where(ContestProblem.contest_id == contest_id)
+            .options(selectinload(ContestProblem.problem).selectinload(Problem.examples))
+            .order_by(ContestProblem.order_index)
+        )
+        result = await self.db.execute(stmt)
+        return list(result.scalars().all())
+
+    async def has_problem(self, contest_id: uuid.UUID, problem_id: uuid.UUID) -> bool:
+        stmt = select(exists().where(
+            ContestProblem.contest_id == contest_id,
+            ContestProblem.problem_id == problem_id,
+        ))
+        return bool((await self.db.execute(stmt)).scalar())
+
+    async def is_registered(self, contest_id: uuid.UUID, user_id: uuid.UUID) -> bool:
+        stmt = select(exists().where(
+            ContestParticipant.contest_id == contest_id,
+            ContestParticipant.user_id == user_id,
+        ))
+        return bool((await self.db.execute(stmt)).scalar())
+
+    async def register(self, contest_id: uuid.UUID, user_id: uuid.UUID) -> bool:
+        """Регистрирует участника. Возвращает False, если он уже зарегистрирован."""
+        now = datetime.utcnow()
+        stmt = (
+            insert(ContestParticipant)
+            .values(contest_id=contest_id, user_id=user_id, registered_at=now, results={}, updated_at=now)
+            .on_conflict_do_nothing(index_elements=[ContestParticipant.contest_id, ContestParticipant.user_id])
+            .returning(ContestParticipant.user_id)
+        )
+        inserted = (await self.db.execute(stmt)).first()
+        await self.db.commit()
+        return inserted is not None
+
+    async def count_participants(self, contest_id: uuid.UUID) -> int:
+        stmt = select(func.count()).where(ContestParticipant.contest_id == contest_id)
+        return (await self.db.execute(stmt)).scalar() or 0
+
+    async def record_verdict(self, submission: Submission) -> bool:
+        """
+        Обновляет строку участника по вердикту попытки соревнования.
+        Не коммитит — изменение попадает в транзакцию вердикта. Строка
+        блокируется, чтобы параллельные вердикты участника не потерялись.
+
+        Returns:
+            Изменилась ли строка
+        """
+        contest = await self.db.get(Contest, submission.contest_id)
+        if contest is None:
+            return False
+
+        stmt = (
+            select(ContestParticipant)
+            .where(
+                ContestParticipant.contest_id == submission.contest_id,
+                ContestParticipant.user_id == submission.user_id,
+            )
+            .with_for_update()
+        )
+        participant = (await self.db.execute(stmt)).scalars().first()
+        if participant is None:
+            return False
+
+        results = {key: dict(cell) for key, cell in (participant.results or {}).items()}
+        frozen = contest.freeze_at is not None and submission.created_at >= contest.freeze_at
+        changed = apply_verdict(
+            results,
+            str(submission.problem_id),
+            SubmissionStatus(submission.status),
+            contest_minute(contest.start_time, submission.created_at),
+            frozen,
+        )
+        if not changed:
+            return False
+
+        solved, penalty, _ = summarize(
+            [view_cell(cell, frozen_view=False) for cell in results.values()], contest.penalty_minutes
+        )
+        participant.results = results
+        participant.solved = solved
+        participant.penalty = penalty
+        participant.updated_at = datetime.utcnow()
+        return True
+
+    async def rebuild_participant(self, contest_id: uuid.UUID, user_id: uuid.UUID) -> bool:
+        """
+        Пересчитывает строку участника по всем его попыткам в соревновании
+        (после перепроверки инкрементальное обновление неприменимо).
+        Не коммитит; изменения попыток должны быть сброшены (flush) заранее.
+        """
+        contest = await self.db.get(Contest, contest_id)
+        stmt = (
+            select(ContestParticipant)
+            .where(ContestParticipant.contest_id == contest_id, ContestParticipant.user_id == user_id)
+            .with_for_update()
+        )
+        participant = (await self.db.execute(stmt)).scalars().first()
+        if contest is None or participant is None:
+            return False
+
+        attempts = await self.db.execute(
+            select(Submission.problem_id, Submission.created_at, Submission.status)
+            .where(Submission.contest_id == contest_id, Submission.user_id == user_id)
+        )
+        key = str(user_id)
+        results = results_from_attempts(
+            ((key, str(problem_id), created_at, status) for problem_id, created_at, status in attempts),
+            contest.start_time,
+            contest.freeze_at,
+        ).get(key, {})
+
+        solved, penalty, _ = summarize(
+            [view_cell(cell, frozen_view=False) for cell in results.values()], contest.penalty_minutes
+        )
+        participant.results = results
+        participant.solved = solved
+        participant.penalty = penalty
+        participant.updated_at = datetime.utcnow()
+        return True
+
+    async def get_participant_names(self, contest_id: uuid.UUID) -> List:
+        """Участники соревнования: строки (user_id, username)."""
+        stmt = (
+            select(ContestParticipant.user_id, User.username)
+            .join(User, User.id == ContestParticipant.user_id)
+            .where(ContestParticipant.contest_id == contest_id)
+        )
+        return (await self.db.execute(stmt)).all()
+
+    async def get_rows_updated_since(self, contest_id: uuid.UUID, since: Optional[datetime]) -> List:
+        """
+        Строки таблицы, изменившиеся после since (все, если since пуст).
+
+        Returns:
+            Строки (user_id, username, results, updated_at)
+        """
+        stmt = (
+            select(
+                ContestParticipant.user_id,
+                User.username,
+                ContestParticipant.results,
+                ContestParticipant.updated_at,
+            )
+            .join(User, User.id == ContestParticipant.user_id)
+            .where(ContestParticipant.contest_id == contest_id)
+        )
+        if since is not None:
+            stmt = stmt.where(ContestParticipant.updated_at > since)
+        return (await self.db.execute(stmt)).all()
+
+    async def set_unfrozen(self, contest_id: uuid.UUID) -> None:
+        await self.db.execute(update(Contest).where(Contest.id == contest_id).values(unfrozen=True))
+        await self.db.commit()
+
+    async def get_rating_participants(self, contest_id: uuid.UUID) -> List:
+        """
+        Участники, сделавшие хотя бы одну учтённую попытку.
+
+        Returns:
+            Строки (user_id, rating, solved, penalty, results)
+        """
+        stmt = (
+            select(
+                User.id,
+                starting_rating(User.rating),
+                ContestParticipant.solved,
+                ContestParticipant.penalty,
+                ContestParticipant.results,
+            )
+            .join(User, User.id == ContestParticipant.user_id)
+            .where(ContestParticipant.contest_id == contest_id, User.deleted_at.is_(None))
+        )
+        rows = (await self.db.execute(stmt)).all()
+        return [row for row in rows if row.results]
@@ -1,13 +1,28 @@
 # src/repository/group_repository.py
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete
+from sqlalchemy import select, delete, func, case, and_
 from sqlalchemy.orm import selectinload
 from uuid import UUID
 from typing import List, Optional
 
+from ..models.base import SubmissionStatus
 from ..models.group_models import Group, GroupAssignment, group_members
 from ..models.user_models import User
 from ..models.problem_models import Problem
+from ..models.submission_models import Submission
+from .problem_access_repository import ProblemAccessRepository
+
+# Статусы от худшего к лучшему: «лучший статус» клетки — максимум по этому порядку
+PROGRESS_STATUS_ORDER = (
+    SubmissionStatus.PENDING,
+    SubmissionStatus.IN_PROGRESS,
+    SubmissionStatus.INTERNAL_ERROR,
+    SubmissionStatus.COMPILE_ERROR,
+    SubmissionStatus.RUNTIME_ERROR,
+    SubmissionStatus.TIME_LIMIT,
+    SubmissionStatus.WRONG_ANSWER,
+    SubmissionStatus.ACCEPTED,
+)
 
 
 class GroupRepository:
@@ -33,6 +48,8 @@ class GroupRepository:
     async def add_student(self, group: Group, student: User):
         if student not in group.students:
             group.students.append(student)
+            await self.db.flush()
+            await ProblemAccessRepository(self.db).grant_group_member(group.id, student.id)
             await self.db.commit()
 
     async def get_student_count(self, group_id: UUID) -> int:
@@ -50,6 +67,8 @@ class GroupRepository:
 
     async def create_assignment(self, assignment: GroupAssignment) -> GroupAssignment:
         self.db.add(assignment)
+        await self.db.flush()
+        await ProblemAccessRepository(self.db).grant_group_problem(assignment.group_id, assignment.problem_id)
         await self.db.commit()
         await self.db.refresh(assignment)
         return assignment
@@ -80,20 +99,95 @@ class GroupRepository:
             .join(Group, GroupAssignment.group_id == Group.id)
             .join(Problem, GroupAssignment.problem_id == Problem.id)
             .join(group_members, Group.id == group_members.c.group_id)
-            .where(group_members.c.user_id == student_id)
+            .where(group_members.c.user_id == student_id, Problem.deleted_at.is_(None))
             .order_by(GroupAssignment.deadline)
         )
         result = await self.db.execute(stmt)
         return result.all()
 
     async def delete_assignment(self, assignment_id: UUID) -> bool:
-        stmt = delete(GroupAssignment).where(GroupAssignment.id == assignment_id)
-        result = await self.db.execute(stmt)
+        stmt = (
+            delete(GroupAssignment)
+            .where(GroupAssignment.id == assignment_id)
+            .returning(GroupAssignment.group_id, GroupAssignment.problem_id)
+        )
+        deleted = (await self.db.execute(stmt)).first()
+        if deleted is None:
+            return False
+
+        await ProblemAccessRepository(self.db).revoke_group_problem(deleted.group_id, deleted.problem_id)
         await self.db.commit()
-        return result.rowcount > 0
+        return True
 
     async def get_assignment_by_id(self, assignment_id: UUID) -> Optional[GroupAssignment]:
         stmt = select(GroupAssignment).where(GroupAssignment.id == assignment_id).options(
             selectinload(GroupAssignment.group))
         result = await self.db.execute(stmt)
-        return result.scalars().first()
\ No newline at end of file
+        return result.scalars().first()
+
+    # --- Progress ---
+
+    async def get_progress_rows(self, group_id: UUID):
+        """
+        Матрица прогресса группы одним запросом: строка на пару
+        (студент, назначение). Попытки агрегируются один раз по всем
+        парам (студент группы, задача группы), затем присоединяются
+        к декартову произведению студентов и назначений.
+
+        Строки студента без назначений содержат пустые поля назначения.
+        best_status — индекс в PROGRESS_STATUS_ORDER.
+        """
+        status_rank = case(
+            {status: index for index, status in enumerate(PROGRESS_STATUS_ORDER)},
+            value=Submission.status,
+        )
+        members = select(group_members.c.user_id).where(group_members.c.group_id == group_id)
+        problems = select(GroupAssignment.problem_id).where(GroupAssignment.group_id == group_id)
+
+        cells = (
+            select(
+                Submission.user_id,
+                Submission.problem_id,
+                func.count().label("attempts"),
+                func.max(status_rank).label("best_status"),
+                func.min(Submission.created_at)
+                .filter(Submission.status == SubmissionStatus.ACCEPTED)
+                .label("first_ac_at"),
+            )
+            .where(Submission.user_id.in_(members), Submission.problem_id.in_(problems))
+            .group_by(Submission.user_id, Submission.problem_id)
+            .subquery()
+        )
+
+        stmt = (
+            select(
+                User.id.label("user_id"),
+                User.username,
+                User.full_name,
+                GroupAssignment.id.label("assignment_id"),
+                GroupAssignment.problem_id,
+                GroupAssignment.deadline,
+                Problem.title.label("problem_title"),
+                cells.c.attempts,
+                cells.c.best_status,
+                cells.c.first_ac_at,
+            )
+            .select_from(group_members)
+            .join(User, User.id == group_members.c.user_id)
+            .outerjoin(
+                GroupAssignment,
+                and_(
+                    GroupAssignment.group_id == group_members.c.group_id,
+                    GroupAssignment.problem_id.in_(select(Problem.id).where(Problem.deleted_at.is_(None))),
+                ),
+            )
+            .outerjoin(Problem, Problem.id == GroupAssignment.problem_id)
+            .outerjoin(
+                cells,
+                and_(cells.c.user_id == User.id, cells.c.problem_id == GroupAssignment.problem_id),
+            )
+            .where(group_members.c.group_id == group_id, User.deleted_at.is_(None))
+            .order_by(User.username, GroupAssignment.deadline, GroupAssignment.id)
+        )
+        result = await self.db.execute(stmt)
+        return result.all()
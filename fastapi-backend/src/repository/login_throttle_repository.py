@@ -0,0 +1,37 @@
+# fastapi-backend/src/repository/login_throttle_repository.py
+from datetime import datetime, timedelta
+from typing import Tuple
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.throttle_models import LoginThrottleBucket
+
+
+class LoginThrottleRepository:
+    """Общие для воркеров счётчики попыток входа (фиксированные окна)."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_counts(self, key: str, window_start: datetime, window: timedelta) -> Tuple[int, int]:
+        """(попыток в текущем окне, попыток в прошлом окне) — одним запросом."""
+        stmt = select(LoginThrottleBucket.window_start, LoginThrottleBucket.hits).where(
+            LoginThrottleBucket.key == key,
+            LoginThrottleBucket.window_start.in_([window_start, window_start - window]),
+        )
+        counts = {row.window_start: row.hits for row in await self.db.execute(stmt)}
+        return counts.get(window_start, 0), counts.get(window_start - window, 0)
+
+    async def hit(self, key: str, window_start: datetime) -> None:
+        """Атомарно увеличивает счётчик окна (без коммита)."""
+        stmt = (
+            insert(LoginThrottleBucket)
+            .values(key=key, window_start=window_start, hits=1)
+            .on_conflict_do_update(
+                index_elements=[LoginThrottleBucket.key, LoginThrottleBucket.window_start],
+                set_={"hits": LoginThrottleBucket.hits + 1},
+            )
+        )
+        await self.db.execute(stmt)
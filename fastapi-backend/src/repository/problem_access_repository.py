@@ -0,0 +1,102 @@
+# fastapi-backend/src/repository/problem_access_repository.py
+from typing import Iterable
+import uuid
+
+from sqlalchemy import select, delete, exists, literal
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.access_models import ProblemAccess, ACCESS_SOURCE_DIRECT, group_access_source
+from ..models.group_models import GroupAssignment, group_members
+from ..models.problem_models import Problem
+
+
+def has_problem_access(user_id: uuid.UUID):
+    """
+    Условие для выборок задач: задача публичная или выдана студенту.
+
+    Коррелированный EXISTS идёт по первичному ключу problem_access
+    (user_id, problem_id, ...), без скана массива по всей таблице problems.
+    """
+    return (Problem.is_public == True) | exists().where(
+        ProblemAccess.user_id == user_id,
+        ProblemAccess.problem_id == Problem.id,
+    )
+
+
+class ProblemAccessRepository:
+    """
+    Репозиторий таблицы problem_access.
+
+    Методы не коммитят: доступ меняется в той же транзакции, что и
+    назначение задачи или состав группы.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def _insert(self, rows: list) -> None:
+        if rows:
+            await self.db.execute(insert(ProblemAccess).values(rows).on_conflict_do_nothing())
+
+    # --- Прямое назначение ---
+
+    async def set_direct(self, problem_id: uuid.UUID, user_ids: Iterable[uuid.UUID]) -> None:
+        """Заменяет список студентов, которым задача выдана напрямую."""
+        user_ids = set(user_ids)
+        stmt = delete(ProblemAccess).where(
+            ProblemAccess.problem_id == problem_id,
+            ProblemAccess.source == ACCESS_SOURCE_DIRECT,
+        )
+        if user_ids:
+            stmt = stmt.where(ProblemAccess.user_id.notin_(user_ids))
+        await self.db.execute(stmt)
+        await self._insert([
+            {"user_id": user_id, "problem_id": problem_id, "source": ACCESS_SOURCE_DIRECT}
+            for user_id in user_ids
+        ])
+
+    # --- Доступ через группы ---
+
+    async def grant_group_problem(self, group_id: uuid.UUID, problem_id: uuid.UUID) -> None:
+        """Выдаёт задачу всем участникам группы (новое назначение)."""
+        members = select(
+            group_members.c.user_id,
+            literal(problem_id, ProblemAccess.problem_id.type),
+            literal(group_access_source(group_id)),
+        ).where(group_members.c.group_id == group_id)
+        await self.db.execute(
+            insert(ProblemAccess)
+            .from_select(["user_id", "problem_id", "source"], members)
+            .on_conflict_do_nothing()
+        )
+
+    async def revoke_group_problem(self, group_id: uuid.UUID, problem_id: uuid.UUID) -> None:
+        """Отзывает задачу у группы, если других назначений этой задачи в группе нет."""
+        still_assigned = await self.db.scalar(
+            select(exists().where(
+                GroupAssignment.group_id == group_id,
+                GroupAssignment.problem_id == problem_id,
+            ))
+        )
+        if still_assigned:
+            return
+        await self.db.execute(
+            delete(ProblemAccess).where(
+                ProblemAccess.problem_id == problem_id,
+                ProblemAccess.source == group_access_source(group_id),
+            )
+        )
+
+    async def grant_group_member(self, group_id: uuid.UUID, user_id: uuid.UUID) -> None:
+        """Выдаёт новому участнику все задачи, назначенные группе."""
+        problems = select(
+            literal(user_id, ProblemAccess.user_id.type),
+            GroupAssignment.problem_id,
+            literal(group_access_source(group_id)),
+        ).where(GroupAssignment.group_id == group_id).distinct()
+        await self.db.execute(
+            insert(ProblemAccess)
+            .from_select(["user_id", "problem_id", "source"], problems)
+            .on_conflict_do_nothing()
+        )
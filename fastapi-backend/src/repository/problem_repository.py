@@ -2,38 +2,101 @@
 from unittest import result
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete, func, or_, desc
+from sqlalchemy import select, delete, update, func, or_, desc, exists, union
 from sqlalchemy.orm import selectinload
-from typing import Optional, List
+from starlette.concurrency import run_in_threadpool
+from typing import Optional, List, Tuple, Dict, Set
 from uuid import UUID
+from datetime import datetime
 import uuid
 
 from ..models.base import SubmissionStatus
-from ..models.problem_models import Problem, Example, TestCase
+from ..models.problem_models import Problem, ProblemTestSet, Example, TestCase
 from ..models.submission_models import Submission
+from ..storage.test_storage import TestDataStorage, get_test_storage
+from .problem_stats_repository import ProblemStatsRepository, STATUS_COUNTER_COLUMNS
+from .problem_access_repository import ProblemAccessRepository, has_problem_access
 
+# Поля задачи, изменение которых создаёт новую версию набора тестов
+TEST_SET_LIMIT_FIELDS = ("time_limit", "memory_limit", "checker_type")
+
+# Поля теста, копируемые в новую версию (данные в хранилище не копируются — только адреса)
+TEST_CASE_COPY_FIELDS = (
+    "order_index", "is_sample", "input_data", "output_data",
+    "input_sha256", "input_size", "output_sha256", "output_size",
+)
 
 
 class ProblemRepository:
     """Репозиторий для доступа к данным о Задачах и их Тестах."""
     
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, storage: Optional[TestDataStorage] = None):
         self.db = db
+        self._storage = storage
+
+    @property
+    def storage(self) -> TestDataStorage:
+        if self._storage is None:
+            self._storage = get_test_storage()
+        return self._storage
+
+    async def store_test_data(self, test_data: dict) -> dict:
+        """
+        Переносит input/output теста в файловое хранилище, оставляя метаданные.
+        Запись (с fsync) идёт в пуле потоков.
+        """
+        data = dict(test_data)
+        input_blob = await run_in_threadpool(self.storage.put_text, data.pop("input_data"))
+        output_blob = await run_in_threadpool(self.storage.put_text, data.pop("output_data"))
+        data.update(
+            input_sha256=input_blob.sha256,
+            input_size=input_blob.size,
+            output_sha256=output_blob.sha256,
+            output_size=output_blob.size,
+        )
+        return data
+
+    async def read_test_data(self, test: TestCase) -> Tuple[str, str]:
+        """
+        Возвращает (input, expected_output) теста независимо от места хранения.
+        Чтение файлов идёт в пуле потоков.
+        """
+        if test.is_file_backed:
+            return (
+                await run_in_threadpool(self.storage.read_text, test.input_sha256),
+                await run_in_threadpool(self.storage.read_text, test.output_sha256),
+            )
+        return test.input_data, test.output_data
 
     async def get_problem_by_id_with_tests(self, problem_id: uuid.UUID) -> Optional[Problem]:
         stmt = (
             select(Problem)
-            .where(Problem.id == problem_id)
+            .where(Problem.id == problem_id, Problem.deleted_at.is_(None))
             .options(
                 selectinload(Problem.test_cases),
-                selectinload(Problem.examples)
+                selectinload(Problem.examples),
+                selectinload(Problem.current_test_set),
             )
         )
         result = await self.db.execute(stmt)
         return result.scalars().first()
     
-    async def create_problem(self, problem_data: dict, examples_data: List[dict], test_cases_data: List[dict]) -> Problem:
-        """Создает новую задачу, включая тесты и примеры."""
+    async def create_problem(
+            self,
+            problem_data: dict,
+            examples_data: List[dict],
+            test_cases_data: List[dict],
+            tests_stored: bool = False,
+            commit: bool = True,
+    ) -> Problem:
+        """
+        Создает новую задачу, включая тесты (версия 1) и примеры.
+
+        tests_stored=True — данные тестов уже лежат в хранилище, и в
+        test_cases_data переданы хэши и размеры (импорт архива).
+        commit=False — только flush: вызывающий создаёт несколько задач
+        и коммитит их одной транзакцией.
+        """
         
         db_problem = Problem(**problem_data)
         self.db.add(db_problem)
@@ -42,41 +105,195 @@ class ProblemRepository:
         problem_id = db_problem.id
         
         db_examples = [Example(problem_id=problem_id, **ex_data) for ex_data in examples_data]
-        db_tests = [
-            TestCase(problem_id=problem_id, order_index=idx, **test_data) 
+        self.db.add_all(db_examples)
+
+        tests_data = [
+            {"order_index": idx, **(test_data if tests_stored else await self.store_test_data(test_data))}
             for idx, test_data in enumerate(test_cases_data)
         ]
-        
-        self.db.add_all(db_examples)
-        self.db.add_all(db_tests)
-        
+        await self._create_test_set_version(db_problem, tests_data)
+
+        if not commit:
+            return db_problem
         await self.db.commit()
         await self.db.refresh(db_problem)
         return db_problem
 
-    async def list_public_problems(self) -> List[Problem]:
-        """Получает список всех опубликованных задач."""
-        stmt = (
-            select(Problem).where(Problem.is_public == True)
-            .options(
-                selectinload(Problem.test_cases),
-                selectinload(Problem.examples)
+    # === Версии набора тестов ===
+
+    async def _create_test_set_version(
+            self, problem: Problem, tests_data: List[dict], limits: Optional[dict] = None
+    ) -> List[TestCase]:
+        """
+        Создаёт новую неизменяемую версию тестов и делает её текущей.
+        Не коммитит — вызывающий метод сохраняет всё одной транзакцией.
+        """
+        limits = limits or {}
+        for key, value in limits.items():
+            setattr(problem, key, value)
+
+        last_version = (await self.db.execute(
+            select(func.max(ProblemTestSet.version)).where(ProblemTestSet.problem_id == problem.id)
+        )).scalar()
+
+        test_set = ProblemTestSet(
+            problem_id=problem.id,
+            version=(last_version or 0) + 1,
+            time_limit=problem.time_limit or 1000,
+            memory_limit=problem.memory_limit or 256,
+            checker_type=problem.checker_type,
+        )
+        self.db.add(test_set)
+        await self.db.flush()
+
+        db_tests = [
+            TestCase(problem_id=problem.id, test_set_id=test_set.id, **test_data)
+            for test_data in tests_data
+        ]
+        self.db.add_all(db_tests)
+        problem.current_test_set_id = test_set.id
+        await self.db.flush()
+        return db_tests
+
+    async def _fork_test_set(
+            self,
+            problem: Problem,
+            limits: Optional[dict] = None,
+            replace: Optional[Dict[int, dict]] = None,
+            append: Optional[List[dict]] = None,
+    ) -> List[TestCase]:
+        """
+        Создаёт новую версию на основе текущей: копирует метаданные тестов,
+        подменяя поля тестов из replace (по order_index) и добавляя append.
+        Ревизию задачи увеличивает вызывающий — ровно один раз на изменение.
+        """
+        current_tests = await self.get_test_cases(problem.id)
+        tests_data = []
+        for test in current_tests:
+            data = {field: getattr(test, field) for field in TEST_CASE_COPY_FIELDS}
+            data.update((replace or {}).get(test.order_index, {}))
+            tests_data.append(data)
+
+        next_index = max((t["order_index"] for t in tests_data), default=-1) + 1
+        for offset, extra in enumerate(append or []):
+            tests_data.append({"order_index": next_index + offset, **extra})
+
+        return await self._create_test_set_version(problem, tests_data, limits)
+
+    async def delete_unreferenced_test_sets(self, batch_size: int = 100) -> int:
+        """
+        Удаляет пачку старых версий, на которые не ссылается ни задача
+        (как на текущую), ни одна попытка.
+
+        Returns:
+            Количество удалённых версий (0 — мусора больше нет)
+        """
+        garbage_stmt = (
+            select(ProblemTestSet.id)
+            .where(
+                ~exists().where(Problem.current_test_set_id == ProblemTestSet.id),
+                ~exists().where(Submission.test_set_id == ProblemTestSet.id),
             )
+            .limit(batch_size)
+        )
+        garbage_ids = (await self.db.execute(garbage_stmt)).scalars().all()
+        if not garbage_ids:
+            return 0
+
+        await self.db.execute(delete(TestCase).where(TestCase.test_set_id.in_(garbage_ids)))
+        await self.db.execute(delete(ProblemTestSet).where(ProblemTestSet.id.in_(garbage_ids)))
+        await self.db.commit()
+        return len(garbage_ids)
+
+    async def get_referenced_digests(self) -> Set[str]:
+        """Все адреса файлов, на которые ссылаются тесты любых версий."""
+        stmt = union(
+            select(TestCase.input_sha256.label("sha256")).where(TestCase.input_sha256.isnot(None)),
+            select(TestCase.output_sha256.label("sha256")).where(TestCase.output_sha256.isnot(None)),
         )
         result = await self.db.execute(stmt)
+        return set(result.scalars().all())
+
+    async def list_public_problems(self) -> List[Problem]:
+        """Получает список всех опубликованных задач."""
+        stmt = select(Problem).where(Problem.is_public == True, Problem.deleted_at.is_(None))
+        result = await self.db.execute(stmt)
         return result.scalars().all()
 
     async def get_test_cases(self, problem_id:uuid.UUID) ->List[TestCase]:
-
-        stmt = select(TestCase).where(TestCase.problem_id == problem_id).order_by(TestCase.order_index).limit(100)
+        """Тесты текущей версии задачи (для задач без версий — все её тесты)."""
+        current_set_id = (await self.db.execute(
+            select(Problem.current_test_set_id).where(Problem.id == problem_id)
+        )).scalar()
+
+        stmt = select(TestCase)
+        if current_set_id is not None:
+            stmt = stmt.where(TestCase.test_set_id == current_set_id)
+        else:
+            stmt = stmt.where(TestCase.problem_id == problem_id, TestCase.test_set_id.is_(None))
+        stmt = stmt.order_by(TestCase.order_index)
 
         result = await self.db.execute(stmt)
         return result.scalars().all()
 
+    async def get_test_case(self, problem_id: uuid.UUID, test_id: uuid.UUID) -> Optional[TestCase]:
+        """
+        Находит тест по id любой версии и возвращает его аналог в текущей версии.
+        order_index теста стабилен между версиями.
+        """
+        stmt = select(TestCase).where(TestCase.id == test_id, TestCase.problem_id == problem_id)
+        test = (await self.db.execute(stmt)).scalars().first()
+        if not test:
+            return None
+
+        current_set_id = (await self.db.execute(
+            select(Problem.current_test_set_id).where(Problem.id == problem_id)
+        )).scalar()
+        if test.test_set_id == current_set_id:
+            return test
+
+        stmt = select(TestCase).where(
+            TestCase.test_set_id == current_set_id,
+            TestCase.order_index == test.order_index,
+        )
+        return (await self.db.execute(stmt)).scalars().first()
+
+    async def add_test_case(self, problem_id: uuid.UUID, is_sample: bool = False) -> TestCase:
+        """Добавляет пустой тест в конец списка новой версией набора тестов."""
+        problem = await self.get_problem_by_id(problem_id)
+        empty_test = {"is_sample": is_sample, **await self.store_test_data({"input_data": "", "output_data": ""})}
+        tests = await self._fork_test_set(problem, append=[empty_test])
+        problem.revision = (problem.revision or 0) + 1
+        await self.db.commit()
+        return tests[-1]
+
+    async def set_test_blob(self, test: TestCase, kind: str, sha256: str, size: int) -> TestCase:
+        """
+        Привязывает к тесту загруженный файл (kind: input | output).
+        Создаёт новую версию набора тестов и возвращает тест из неё.
+        """
+        overrides = {}
+        if not test.is_file_backed:
+            # Переносим и вторую половину теста, чтобы тест целиком жил в хранилище
+            overrides.update(await self.store_test_data({
+                "input_data": test.input_data or "",
+                "output_data": test.output_data or "",
+            }))
+            overrides.update(input_data=None, output_data=None)
+
+        overrides[f"{kind}_sha256"] = sha256
+        overrides[f"{kind}_size"] = size
+
+        problem = await self.get_problem_by_id(test.problem_id)
+        tests = await self._fork_test_set(problem, replace={test.order_index: overrides})
+        problem.revision = (problem.revision or 0) + 1
+        await self.db.commit()
+        return next(t for t in tests if t.order_index == test.order_index)
+
     async def get_problem_by_id(self,problem_id:uuid.UUID) ->Optional[Problem]:
 
         stmt =(
-            select(Problem).where(Problem.id == problem_id)
+            select(Problem).where(Problem.id == problem_id, Problem.deleted_at.is_(None))
         )
         result = await self.db.execute(stmt)
         return result.scalars().first()
@@ -89,32 +306,18 @@ class ProblemRepository:
         return result.scalars().first() is not None
 
     async def delete_problem(self, problem_id: uuid.UUID) -> Optional[uuid.UUID]:
-        """Удаляет задачу и ВСЕ связанные данные (каскадное удаление).
+        """Мягко удаляет задачу: она сразу скрывается из всех выборок.
 
-        Порядок удаления:
-        1. Submissions (ссылаются на problems)
-        2. TestCases (ссылаются на problems)
-        3. Examples (ссылаются на problems)
-        4. Problem (родительская таблица)
+        Submissions, тесты и примеры удаляются позже фоновой очисткой
+        пачками (см. services/purge_service.py), чтобы не держать долгие
+        блокировки на популярных задачах.
         """
-
-        # 1. Удаляем все submissions для этой задачи
-        await self.db.execute(
-            delete(Submission).where(Submission.problem_id == problem_id)
-        )
-
-        # 2. Удаляем все test cases для этой задачи
-        await self.db.execute(
-            delete(TestCase).where(TestCase.problem_id == problem_id)
-        )
-
-        # 3. Удаляем все examples для этой задачи
-        await self.db.execute(
-            delete(Example).where(Example.problem_id == problem_id)
+        stmt = (
+            update(Problem)
+            .where(Problem.id == problem_id, Problem.deleted_at.is_(None))
+            .values(deleted_at=datetime.utcnow())
+            .returning(Problem.id)
         )
-
-        # 4. Наконец удаляем саму задачу (теперь безопасно!)
-        stmt = delete(Problem).where(Problem.id == problem_id).returning(Problem.id)
         result = await self.db.execute(stmt)
         await self.db.commit()
 
@@ -125,7 +328,7 @@ class ProblemRepository:
 
     async  def list_public_problems_with_filters(self, difficulty=None,skip=0, limit=50) -> List[Problem]:
 
-        stmt = select(Problem).where(Problem.is_public == True)
+        stmt = select(Problem).where(Problem.is_public == True, Problem.deleted_at.is_(None))
 
         if difficulty:
             stmt = stmt.where(Problem.difficulty == difficulty)
@@ -137,10 +340,20 @@ class ProblemRepository:
         result = await self.db.execute(stmt)
         return result.scalars().all()
 
+    async def get_user_problem_ids(self, user_id: uuid.UUID) -> List[uuid.UUID]:
+        """Id всех задач пользователя (для массовой выгрузки)."""
+        stmt = (
+            select(Problem.id)
+            .where(Problem.user_id == user_id, Problem.deleted_at.is_(None))
+            .order_by(Problem.created_at)
+        )
+        result = await self.db.execute(stmt)
+        return result.scalars().all()
+
     async def get_user_problems(self, user_id:uuid.UUID) -> List[Problem]:
 
         stmt = (
-            select(Problem).where(Problem.user_id == user_id)
+            select(Problem).where(Problem.user_id == user_id, Problem.deleted_at.is_(None))
             .order_by(Problem.created_at.desc())
             .limit(100)
 
@@ -154,7 +367,7 @@ class ProblemRepository:
     async def update_problem(self, problem_id:uuid.UUID, data: dict) -> Optional[Problem]:
 
         stmt = (
-            select(Problem).where(Problem.id == problem_id)
+            select(Problem).where(Problem.id == problem_id, Problem.deleted_at.is_(None))
         )
 
         result = await self.db.execute(stmt)
@@ -164,9 +377,22 @@ class ProblemRepository:
         if db_problem is None:
             return None
 
+        # Изменение лимитов — новая версия набора тестов
+        limits = {
+            key: data[key] for key in TEST_SET_LIMIT_FIELDS
+            if key in data and data[key] is not None and data[key] != getattr(db_problem, key)
+        }
+        if limits:
+            await self._fork_test_set(db_problem, limits=limits)
+
+        # Прямое назначение студентам хранится в problem_access
+        if 'assigned_student_ids' in data:
+            await ProblemAccessRepository(self.db).set_direct(problem_id, data.pop('assigned_student_ids') or [])
+
         for key, value in data.items():
-            if key not in ['id', 'created_at']:
+            if key not in ['id', 'created_at', 'current_test_set_id', 'revision']:
                 setattr(db_problem, key, value)
+        db_problem.revision = (db_problem.revision or 0) + 1
 
         await self.db.commit()
 
@@ -174,74 +400,113 @@ class ProblemRepository:
         return db_problem
 
     async def get_problem_statistics(self, problem_id:uuid.UUID) ->dict:
+        """Статистика задачи: одно чтение problem_stats по первичному ключу."""
+        stats = await ProblemStatsRepository(self.db).get(problem_id)
 
-
-        total_submissions_stmt = (
-            select(func.count(Submission.id))
-            .where(Submission.problem_id == problem_id)
-        )
-
-        accepted_submissions_stmt = (
-            select(func.count(Submission.id))
-            .where(Submission.problem_id == problem_id)
-            .where(Submission.status == SubmissionStatus.ACCEPTED)
-        )
-
-        avg_submissions_stmt = (
-            select(
-                func.avg(Submission.execution_time).label('avg_time'),
-                func.avg(Submission.memory_used).label('avg_memory'),
-            )
-            .where(or_(
-                Submission.status == SubmissionStatus.ACCEPTED,
-                Submission.status == SubmissionStatus.WRONG_ANSWER,
-            ))
-        )
-
-        total_submissions = (await self.db.execute(total_submissions_stmt)).scalar() or 0
-        accepted_submissions = (await self.db.execute(accepted_submissions_stmt)).scalar() or 0
-        avg_metrics_result = (await self.db.execute(avg_submissions_stmt)).one_or_none()
-
-
-        avg_time = avg_metrics_result.avg_time if avg_metrics_result else None
-        avg_memory = avg_metrics_result.avg_memory if avg_metrics_result else None
+        total_submissions = stats.total_submissions if stats else 0
+        accepted_submissions = stats.accepted_submissions if stats else 0
 
         if total_submissions > 0:
             success_rate = (accepted_submissions / total_submissions) * 100
         else:
             success_rate = 0
 
+        if stats and stats.metrics_count:
+            avg_time = stats.sum_time_ms / stats.metrics_count
+            avg_memory = stats.sum_memory_mb / stats.metrics_count
+        else:
+            avg_time = avg_memory = None
+
         return {
             'total_submissions': total_submissions,
             'accepted_submissions': accepted_submissions,
             'success_rate': round(success_rate, 2),
             'avg_time_ms': round(avg_time, 2) if avg_time else None,
             'avg_memory_mb': round(avg_memory, 2) if avg_memory else None,
+            'distinct_solvers': stats.distinct_solvers if stats else 0,
+            'status_counts': {
+                status.value: getattr(stats, column) if stats else 0
+                for status, column in STATUS_COUNTER_COLUMNS.items()
+            },
         }
 
     async def list_available_problems(self, user_id: uuid.UUID, skip: int = 0, limit: int  = 50) -> List[Problem]:
         stmt = select(Problem).where(
-            or_(Problem.is_public == True,
-                Problem.assigned_student_ids.contains([user_id]))
-        ).order_by(Problem.created_at.desc()).offset(skip).limit(limit)
+            Problem.deleted_at.is_(None),
+            has_problem_access(user_id),
+        ).options(selectinload(Problem.author)).order_by(Problem.created_at.desc()).offset(skip).limit(limit)
 
         result = await self.db.execute(stmt)
 
         return result.scalars().all()
 
+    async def get_problem_revision_for_student(self, problem_id: UUID, user_id: UUID) -> Optional[int]:
+        """Лёгкая проверка доступа: только номер ревизии, без условия и тестов."""
+        stmt = (
+            select(Problem.revision)
+            .where(
+                Problem.id == problem_id,
+                Problem.deleted_at.is_(None),
+                has_problem_access(user_id),
+            )
+        )
+        result = await self.db.execute(stmt)
+        return result.scalar()
+
+    async def get_problem_for_statement(self, problem_id: UUID) -> Optional[Problem]:
+        """
+        Условие задачи с примерами и открытыми тестами без проверки доступа —
+        для построения общего кэшированного ответа (доступ проверяется до кэша).
+        """
+        stmt = (
+            select(Problem)
+            .where(Problem.id == problem_id, Problem.deleted_at.is_(None))
+            .options(
+                selectinload(Problem.examples),
+                selectinload(Problem.test_cases.and_(TestCase.is_sample == True)),
+            )
+        )
+        result = await self.db.execute(stmt)
+        return result.scalars().first()
+
+    async def get_problem_for_export(self, problem_id: UUID) -> Optional[Problem]:
+        """
+        Задача с примерами и текущей версией лимитов, без тестов:
+        тесты текущей версии выгрузка берёт через get_test_cases.
+        """
+        stmt = (
+            select(Problem)
+            .where(Problem.id == problem_id, Problem.deleted_at.is_(None))
+            .options(
+                selectinload(Problem.examples),
+                selectinload(Problem.current_test_set),
+            )
+        )
+        result = await self.db.execute(stmt)
+        return result.scalars().first()
+
+    async def get_test_set_with_tests(self, test_set_id: UUID) -> Optional[ProblemTestSet]:
+        """Неизменяемая версия тестов вместе со всеми тестами (для проверки решений)."""
+        stmt = (
+            select(ProblemTestSet)
+            .where(ProblemTestSet.id == test_set_id)
+            .options(selectinload(ProblemTestSet.test_cases))
+        )
+        result = await self.db.execute(stmt)
+        return result.scalars().first()
+
     async def get_problem_by_id_for_student(self, problem_id: UUID, user_id: UUID) -> Optional[Problem]:
         stmt = (
             select(Problem)
             .where(
                 Problem.id == problem_id,
-                or_(
-                    Problem.is_public == True,
-                    Problem.assigned_student_ids.contains([user_id])
-                )
+                Problem.deleted_at.is_(None),
+                has_problem_access(user_id),
             )
             .options(
                 selectinload(Problem.examples),
-                selectinload(Problem.test_cases)
+                # Скрытые тесты студенту не нужны и не должны загружаться вовсе
+                selectinload(Problem.test_cases.and_(TestCase.is_sample == True)),
             )
         )
         result = await self.db.execute(stmt)
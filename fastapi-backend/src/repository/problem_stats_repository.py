@@ -0,0 +1,129 @@
+# fastapi-backend/src/repository/problem_stats_repository.py
+from datetime import datetime
+from typing import Optional
+import uuid
+
+from sqlalchemy import select, delete, func, distinct, and_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.base import SubmissionStatus
+from ..models.stats_models import ProblemStats
+from ..models.submission_models import Submission
+
+# Вердикт -> колонка счётчика в problem_stats
+STATUS_COUNTER_COLUMNS = {
+    SubmissionStatus.ACCEPTED: "accepted_submissions",
+    SubmissionStatus.WRONG_ANSWER: "wrong_answer_count",
+    SubmissionStatus.TIME_LIMIT: "time_limit_count",
+    SubmissionStatus.RUNTIME_ERROR: "runtime_error_count",
+    SubmissionStatus.COMPILE_ERROR: "compile_error_count",
+    SubmissionStatus.INTERNAL_ERROR: "internal_error_count",
+}
+
+# Вердикты, по которым считаются средние время и память
+METRIC_STATUSES = (SubmissionStatus.ACCEPTED, SubmissionStatus.WRONG_ANSWER)
+
+FINAL_STATUSES = tuple(STATUS_COUNTER_COLUMNS)
+
+COUNTER_COLUMNS = (
+    "total_submissions", *STATUS_COUNTER_COLUMNS.values(),
+    "metrics_count", "sum_time_ms", "sum_memory_mb", "distinct_solvers",
+)
+
+
+class ProblemStatsRepository:
+    """Репозиторий инкрементальной статистики задач."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get(self, problem_id: uuid.UUID) -> Optional[ProblemStats]:
+        return await self.db.get(ProblemStats, problem_id)
+
+    async def record_verdict(self, submission: Submission, first_solve: bool) -> None:
+        """
+        Учитывает вердикт попытки. Не коммитит — изменения попадают
+        в транзакцию, которая сохраняет сам вердикт.
+
+        Args:
+            submission: попытка с уже выставленным финальным статусом
+            first_solve: первое ли это ACCEPTED пользователя по задаче
+        """
+        status = SubmissionStatus(submission.status)
+        if status not in STATUS_COUNTER_COLUMNS:
+            return
+
+        increments = dict.fromkeys(COUNTER_COLUMNS, 0)
+        increments["total_submissions"] = 1
+        increments[STATUS_COUNTER_COLUMNS[status]] = 1
+        if status in METRIC_STATUSES and submission.execution_time is not None:
+            increments["metrics_count"] = 1
+            increments["sum_time_ms"] = submission.execution_time
+            increments["sum_memory_mb"] = submission.memory_used or 0
+        if first_solve:
+            increments["distinct_solvers"] = 1
+
+        stmt = insert(ProblemStats).values(
+            problem_id=submission.problem_id, updated_at=datetime.utcnow(), **increments
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ProblemStats.problem_id],
+            set_={
+                **{
+                    name: getattr(ProblemStats, name) + getattr(stmt.excluded, name)
+                    for name, value in increments.items() if value
+                },
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+        await self.db.execute(stmt)
+
+    async def delete(self, problem_id: uuid.UUID) -> None:
+        await self.db.execute(delete(ProblemStats).where(ProblemStats.problem_id == problem_id))
+
+    async def rebuild(self, problem_id: Optional[uuid.UUID] = None) -> int:
+        """
+        Пересчитывает статистику из таблицы submissions (для бэкфилла).
+
+        Returns:
+            Количество задач, для которых записана статистика
+        """
+        def count_status(status: SubmissionStatus):
+            return func.count().filter(Submission.status == status)
+
+        is_metric = and_(
+            Submission.status.in_(METRIC_STATUSES),
+            Submission.execution_time.isnot(None),
+        )
+
+        aggregate = (
+            select(
+                Submission.problem_id,
+                func.count(),
+                *[count_status(status) for status in STATUS_COUNTER_COLUMNS],
+                func.count().filter(is_metric),
+                func.coalesce(func.sum(Submission.execution_time).filter(is_metric), 0),
+                func.coalesce(func.sum(func.coalesce(Submission.memory_used, 0)).filter(is_metric), 0),
+                func.count(distinct(Submission.user_id)).filter(
+                    Submission.status == SubmissionStatus.ACCEPTED
+                ),
+                func.now(),
+            )
+            .where(Submission.status.in_(FINAL_STATUSES))
+            .group_by(Submission.problem_id)
+        )
+
+        if problem_id is not None:
+            aggregate = aggregate.where(Submission.problem_id == problem_id)
+            await self.delete(problem_id)
+        else:
+            await self.db.execute(delete(ProblemStats))
+
+        result = await self.db.execute(
+            insert(ProblemStats).from_select(
+                ["problem_id", *COUNTER_COLUMNS, "updated_at"], aggregate
+            )
+        )
+        await self.db.commit()
+        return result.rowcount
@@ -0,0 +1,161 @@
+# fastapi-backend/src/repository/rating_repository.py
+from datetime import datetime
+from typing import List, Sequence
+import uuid
+
+from sqlalchemy import select, update, exists, func, bindparam, Integer
+from sqlalchemy.dialects.postgresql import ARRAY, UUID, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.group_models import GroupAssignment, group_members
+from ..models.rating_models import RatingHistory
+from ..models.stats_models import UserScore, UserSolvedProblem
+from ..models.submission_models import Submission
+from ..models.user_models import User, INITIAL_RATING
+
+
+def starting_rating(rating_column):
+    """
+    Рейтинг, с которым пользователь входит в пересчёт.
+
+    Самостоятельно зарегистрированные пользователи раньше получали
+    rating = 0; пересчёт никогда не опускает рейтинг ниже 1, поэтому
+    0 (как и NULL) означает «ещё без рейтинга» — берётся INITIAL_RATING.
+    """
+    return func.coalesce(func.nullif(rating_column, 0), INITIAL_RATING)
+
+
+def rating_changes_table(user_ids, old_ratings, new_ratings, ranks):
+    """
+    Набор изменений как таблица: unnest(:user_ids, :old_ratings, ...) AS changes(...).
+
+    Каждый столбец передаётся одним параметром-массивом, поэтому размер
+    запроса не зависит от числа участников (у VALUES (...), (...) на
+    десятках тысяч строк упирается в лимит asyncpg в 32767 параметров).
+    """
+    return func.unnest(
+        bindparam("user_ids", list(user_ids), type_=ARRAY(UUID(as_uuid=True))),
+        bindparam("old_ratings", [int(r) for r in old_ratings], type_=ARRAY(Integer)),
+        bindparam("new_ratings", [int(r) for r in new_ratings], type_=ARRAY(Integer)),
+        bindparam("ranks", [int(r) for r in ranks], type_=ARRAY(Integer)),
+    ).table_valued("user_id", "old_rating", "new_rating", "rank").render_derived(name="changes")
+
+
+class RatingRepository:
+    """Репозиторий рейтинговых пересчётов и истории рейтинга."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def is_rated(self, source_type: str, source_id: uuid.UUID) -> bool:
+        stmt = select(exists().where(
+            RatingHistory.source_type == source_type,
+            RatingHistory.source_id == source_id,
+        ))
+        return bool((await self.db.execute(stmt)).scalar())
+
+    async def get_assignment_participants(self, assignment: GroupAssignment) -> List:
+        """
+        Участники назначения: студенты группы, отправившие хотя бы одну
+        попытку по задаче до дедлайна.
+
+        Returns:
+            Строки (user_id, rating, first_ac_at, attempts_before_ac);
+            first_ac_at пуст, если задача не решена до дедлайна.
+        """
+        submitted = exists().where(
+            Submission.user_id == User.id,
+            Submission.problem_id == assignment.problem_id,
+            Submission.created_at <= assignment.deadline,
+        )
+        stmt = (
+            select(
+                User.id,
+                starting_rating(User.rating),
+                UserSolvedProblem.first_ac_at,
+                UserSolvedProblem.attempts_before_ac,
+            )
+            .select_from(group_members)
+            .join(User, User.id == group_members.c.user_id)
+            .outerjoin(
+                UserSolvedProblem,
+                (UserSolvedProblem.user_id == User.id)
+                & (UserSolvedProblem.problem_id == assignment.problem_id)
+                & (UserSolvedProblem.first_ac_at <= assignment.deadline),
+            )
+            .where(
+                group_members.c.group_id == assignment.group_id,
+                User.deleted_at.is_(None),
+                submitted,
+            )
+        )
+        return (await self.db.execute(stmt)).all()
+
+    async def apply_changes(
+            self,
+            source_type: str,
+            source_id: uuid.UUID,
+            user_ids: Sequence[uuid.UUID],
+            old_ratings: Sequence[int],
+            new_ratings: Sequence[int],
+            ranks: Sequence[int],
+    ) -> int:
+        """
+        Записывает результат пересчёта тремя запросами на всех участников:
+        история, users.rating и user_scores.rating. Не коммитит.
+
+        История пишется первой: повторный пересчёт того же события
+        упирается в uq_rating_history_source_user до изменения рейтингов.
+
+        К рейтингу прибавляется изменение (new - old), а не записывается
+        new: рейтинги читались до расчёта, и параллельно пересчитанное
+        событие с теми же участниками иначе затёрло бы своё изменение.
+
+        Returns:
+            Количество обновлённых пользователей
+        """
+        changes = rating_changes_table(user_ids, old_ratings, new_ratings, ranks)
+
+        await self.db.execute(
+            insert(RatingHistory).from_select(
+                ["id", "user_id", "source_type", "source_id",
+                 "old_rating", "new_rating", "delta", "rank", "created_at"],
+                select(
+                    func.gen_random_uuid(),
+                    changes.c.user_id,
+                    bindparam("source_type", source_type),
+                    bindparam("source_id", source_id, type_=UUID(as_uuid=True)),
+                    changes.c.old_rating,
+                    changes.c.new_rating,
+                    changes.c.new_rating - changes.c.old_rating,
+                    changes.c.rank,
+                    bindparam("created_at", datetime.utcnow()),
+                ),
+            )
+        )
+
+        delta = changes.c.new_rating - changes.c.old_rating
+        result = await self.db.execute(
+            update(User)
+            .where(User.id == changes.c.user_id)
+            .values(rating=func.greatest(starting_rating(User.rating) + delta, 1))
+        )
+        # Лидерборд повторяет users.rating (уже с изменениями этой транзакции)
+        await self.db.execute(
+            update(UserScore)
+            .where(UserScore.user_id == changes.c.user_id)
+            .values(
+                rating=select(User.rating).where(User.id == UserScore.user_id).scalar_subquery(),
+                updated_at=datetime.utcnow(),
+            )
+        )
+        return result.rowcount
+
+    async def get_user_history(self, user_id: uuid.UUID, limit: int = 50) -> List[RatingHistory]:
+        stmt = (
+            select(RatingHistory)
+            .where(RatingHistory.user_id == user_id)
+            .order_by(RatingHistory.created_at.desc())
+            .limit(limit)
+        )
+        return list((await self.db.execute(stmt)).scalars().all())
@@ -0,0 +1,92 @@
+# fastapi-backend/src/repository/refresh_token_repository.py
+from datetime import datetime
+from typing import List, Optional
+import uuid
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.token_models import RefreshToken
+
+
+class RefreshTokenRepository:
+    """Refresh токены пользователей (по строке на токен, см. RefreshToken)."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def add(
+            self,
+            user_id: uuid.UUID,
+            family_id: uuid.UUID,
+            digest: str,
+            expires_at: datetime,
+            user_agent: Optional[str] = None,
+    ) -> RefreshToken:
+        """Добавляет токен (без коммита)."""
+        token = RefreshToken(
+            user_id=user_id,
+            family_id=family_id,
+            digest=digest,
+            expires_at=expires_at,
+            user_agent=user_agent[:255] if user_agent else None,
+        )
+        self.db.add(token)
+        return token
+
+    async def get_by_digest(self, digest: str) -> Optional[RefreshToken]:
+        stmt = select(RefreshToken).where(RefreshToken.digest == digest)
+        return (await self.db.execute(stmt)).scalars().first()
+
+    async def mark_rotated(self, token_id: uuid.UUID) -> bool:
+        """
+        Помечает токен заменённым, если он ещё действителен.
+        Условный UPDATE: из двух одновременных ротаций проходит одна.
+        """
+        stmt = (
+            update(RefreshToken)
+            .where(
+                RefreshToken.id == token_id,
+                RefreshToken.rotated_at.is_(None),
+                RefreshToken.revoked_at.is_(None),
+            )
+            .values(rotated_at=datetime.utcnow())
+        )
+        result = await self.db.execute(stmt)
+        return result.rowcount > 0
+
+    async def revoke_family(self, family_id: uuid.UUID, user_id: Optional[uuid.UUID] = None) -> int:
+        """Отзывает все токены семейства (без коммита)."""
+        stmt = (
+            update(RefreshToken)
+            .where(RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None))
+            .values(revoked_at=datetime.utcnow())
+        )
+        if user_id is not None:
+            stmt = stmt.where(RefreshToken.user_id == user_id)
+        result = await self.db.execute(stmt)
+        return result.rowcount
+
+    async def revoke_user(self, user_id: uuid.UUID) -> int:
+        """Отзывает все токены пользователя (без коммита)."""
+        stmt = (
+            update(RefreshToken)
+            .where(RefreshToken.user_id == user_id, RefreshToken.revoked_at.is_(None))
+            .values(revoked_at=datetime.utcnow())
+        )
+        result = await self.db.execute(stmt)
+        return result.rowcount
+
+    async def list_active(self, user_id: uuid.UUID) -> List[RefreshToken]:
+        """Текущие (не заменённые и не отозванные) токены — по одному на сессию."""
+        stmt = (
+            select(RefreshToken)
+            .where(
+                RefreshToken.user_id == user_id,
+                RefreshToken.rotated_at.is_(None),
+                RefreshToken.revoked_at.is_(None),
+                RefreshToken.expires_at > datetime.utcnow(),
+            )
+            .order_by(RefreshToken.created_at.desc())
+        )
+        return list((await self.db.execute(stmt)).scalars().all())
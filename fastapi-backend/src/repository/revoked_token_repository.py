@@ -0,0 +1,39 @@
+# fastapi-backend/src/repository/revoked_token_repository.py
+from datetime import datetime
+from typing import List, Optional
+import uuid
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.token_models import RevokedToken
+
+
+class RevokedTokenRepository:
+    """Список отозванных access токенов (jti)."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def add(self, jti: str, user_id: Optional[uuid.UUID], expires_at: datetime) -> None:
+        """Добавляет jti (повторный отзыв ничего не меняет). Без коммита."""
+        stmt = (
+            insert(RevokedToken)
+            .values(jti=jti, user_id=user_id, expires_at=expires_at, revoked_at=datetime.utcnow())
+            .on_conflict_do_nothing(index_elements=[RevokedToken.jti])
+        )
+        await self.db.execute(stmt)
+
+    async def is_revoked(self, jti: str) -> bool:
+        stmt = select(RevokedToken.jti).where(
+            RevokedToken.jti == jti, RevokedToken.expires_at > datetime.utcnow()
+        )
+        return (await self.db.execute(stmt)).first() is not None
+
+    async def get_active_jtis(self, revoked_after: Optional[datetime] = None) -> List[str]:
+        """jti ещё не истёкших токенов, отозванных после revoked_after (все — если None)."""
+        stmt = select(RevokedToken.jti).where(RevokedToken.expires_at > datetime.utcnow())
+        if revoked_after is not None:
+            stmt = stmt.where(RevokedToken.revoked_at > revoked_after)
+        return list((await self.db.execute(stmt)).scalars().all())
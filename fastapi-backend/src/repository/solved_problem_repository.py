@@ -0,0 +1,144 @@
+# fastapi-backend/src/repository/solved_problem_repository.py
+from typing import Iterable, List, Set
+import uuid
+
+from sqlalchemy import select, delete, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.base import SubmissionStatus
+from ..models.problem_models import Problem
+from ..models.stats_models import UserSolvedProblem
+from ..models.submission_models import Submission
+
+# Проверенные, но не принятые попытки (учитываются в attempts_before_ac)
+FAILED_STATUSES = (
+    SubmissionStatus.WRONG_ANSWER,
+    SubmissionStatus.TIME_LIMIT,
+    SubmissionStatus.RUNTIME_ERROR,
+    SubmissionStatus.COMPILE_ERROR,
+)
+
+SOLVED_COLUMNS = ["user_id", "problem_id", "first_ac_at", "attempts_before_ac"]
+
+
+def attempts_before(user_id, problem_id, before):
+    """Число неудачных проверенных попыток пользователя по задаче до момента before."""
+    return (
+        select(func.count())
+        .where(
+            Submission.user_id == user_id,
+            Submission.problem_id == problem_id,
+            Submission.status.in_(FAILED_STATUSES),
+            Submission.created_at < before,
+        )
+        .scalar_subquery()
+    )
+
+
+class SolvedProblemRepository:
+    """Репозиторий решённых задач (таблица user_solved_problems)."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def record_accepted(self, submission: Submission) -> bool:
+        """
+        Отмечает задачу решённой. Не коммитит.
+
+        Returns:
+            True, если это первое ACCEPTED пользователя по задаче
+        """
+        stmt = (
+            insert(UserSolvedProblem)
+            .values(
+                user_id=submission.user_id,
+                problem_id=submission.problem_id,
+                first_ac_at=submission.created_at,
+                attempts_before_ac=attempts_before(
+                    submission.user_id, submission.problem_id, submission.created_at
+                ),
+            )
+            .on_conflict_do_nothing(index_elements=[UserSolvedProblem.user_id, UserSolvedProblem.problem_id])
+            .returning(UserSolvedProblem.problem_id)
+        )
+        result = await self.db.execute(stmt)
+        return result.first() is not None
+
+    async def get_solved_ids(self, user_id: uuid.UUID, problem_ids: Iterable[uuid.UUID]) -> Set[uuid.UUID]:
+        """Какие из переданных задач пользователь уже решил (для отметок в каталоге)."""
+        problem_ids = list(problem_ids)
+        if not problem_ids:
+            return set()
+        stmt = select(UserSolvedProblem.problem_id).where(
+            UserSolvedProblem.user_id == user_id,
+            UserSolvedProblem.problem_id.in_(problem_ids),
+        )
+        result = await self.db.execute(stmt)
+        return set(result.scalars().all())
+
+    async def get_user_stats(self, user_id: uuid.UUID, recent_limit: int = 10) -> dict:
+        """Статистика профиля: решено всего, по сложности и последние решения."""
+        by_difficulty = await self.db.execute(
+            select(
+                Problem.difficulty,
+                func.count(),
+                func.coalesce(func.sum(UserSolvedProblem.attempts_before_ac), 0),
+            )
+            .join(Problem, Problem.id == UserSolvedProblem.problem_id)
+            .where(UserSolvedProblem.user_id == user_id, Problem.deleted_at.is_(None))
+            .group_by(Problem.difficulty)
+        )
+        solved_by_difficulty = {}
+        solved_count = failed_attempts = 0
+        for difficulty, count, attempts in by_difficulty.all():
+            solved_by_difficulty[difficulty.value] = count
+            solved_count += count
+            failed_attempts += attempts
+
+        recent = await self.db.execute(
+            select(Problem.id, Problem.title, Problem.slug, UserSolvedProblem.first_ac_at)
+            .join(Problem, Problem.id == UserSolvedProblem.problem_id)
+            .where(UserSolvedProblem.user_id == user_id, Problem.deleted_at.is_(None))
+            .order_by(UserSolvedProblem.first_ac_at.desc())
+            .limit(recent_limit)
+        )
+
+        return {
+            "solved_count": solved_count,
+            "solved_by_difficulty": solved_by_difficulty,
+            "avg_attempts_before_ac": round(failed_attempts / solved_count, 2) if solved_count else None,
+            "recent_solved": [
+                {"problem_id": str(row.id), "title": row.title, "slug": row.slug, "solved_at": row.first_ac_at}
+                for row in recent.all()
+            ],
+        }
+
+    async def rebuild_for_users(self, user_ids: List[uuid.UUID]) -> int:
+        """
+        Пересчитывает решённые задачи пользователей из submissions (для бэкфилла).
+        Не коммитит.
+
+        Returns:
+            Количество записанных строк
+        """
+        first_ac = (
+            select(
+                Submission.user_id,
+                Submission.problem_id,
+                func.min(Submission.created_at).label("first_ac_at"),
+            )
+            .where(Submission.user_id.in_(user_ids), Submission.status == SubmissionStatus.ACCEPTED)
+            .group_by(Submission.user_id, Submission.problem_id)
+            .subquery()
+        )
+        rows = select(
+            first_ac.c.user_id,
+            first_ac.c.problem_id,
+            first_ac.c.first_ac_at,
+            attempts_before(first_ac.c.user_id, first_ac.c.problem_id, first_ac.c.first_ac_at),
+        )
+
+        await self.db.execute(delete(UserSolvedProblem).where(UserSolvedProblem.user_id.in_(user_ids)))
+        result = await self.db.execute(insert(UserSolvedProblem).from_select(SOLVED_COLUMNS, rows))
+        return result.rowcount
@@ -0,0 +1,60 @@
+# fastapi-backend/src/repository/submission_event_repository.py
+from datetime import datetime
+from typing import List, Optional
+import uuid
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.contest_models import ContestReplaySnapshot
+from ..models.submission_models import Submission, SubmissionEvent
+
+
+class SubmissionEventRepository:
+    """Журнал событий попыток и снимки его свёртки для соревнований."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def record(self, submission: Submission, event_type: str) -> None:
+        """
+        Добавляет событие с текущим статусом попытки.
+        Не коммитит — событие попадает в транзакцию самой попытки.
+        """
+        self.db.add(SubmissionEvent(
+            submission_id=submission.id,
+            user_id=submission.user_id,
+            problem_id=submission.problem_id,
+            contest_id=submission.contest_id,
+            event_type=event_type,
+            status=submission.status,
+            submitted_at=submission.created_at,
+            created_at=datetime.utcnow(),
+        ))
+
+    async def get_contest_events(
+            self, contest_id: uuid.UUID, after: Optional[datetime], until: datetime
+    ) -> List[SubmissionEvent]:
+        """События соревнования с created_at в (after, until] в порядке записи."""
+        stmt = select(SubmissionEvent).where(
+            SubmissionEvent.contest_id == contest_id,
+            SubmissionEvent.created_at <= until,
+        )
+        if after is not None:
+            stmt = stmt.where(SubmissionEvent.created_at > after)
+        stmt = stmt.order_by(SubmissionEvent.created_at, SubmissionEvent.id)
+        return list((await self.db.execute(stmt)).scalars().all())
+
+    async def get_nearest_snapshot(self, contest_id: uuid.UUID, at: datetime) -> Optional[ContestReplaySnapshot]:
+        """Последний снимок с as_of не позже at."""
+        stmt = (
+            select(ContestReplaySnapshot)
+            .where(ContestReplaySnapshot.contest_id == contest_id, ContestReplaySnapshot.as_of <= at)
+            .order_by(ContestReplaySnapshot.as_of.desc())
+            .limit(1)
+        )
+        return (await self.db.execute(stmt)).scalars().first()
+
+    async def save_snapshot(self, contest_id: uuid.UUID, as_of: datetime, state: dict, events: int) -> None:
+        """Сохраняет снимок (без коммита)."""
+        self.db.add(ContestReplaySnapshot(contest_id=contest_id, as_of=as_of, state=state, events=events))
@@ -21,13 +21,17 @@ class SubmissionRepository:
         user_id: UUID,
         problem_id: UUID,
         language: str,
-        code: str
+        code: str,
+        test_set_id: Optional[UUID] = None,
+        contest_id: Optional[UUID] = None,
     ) -> Submission:
         """Создать новую попытку решения."""
         submission = Submission(
             id=uuid.uuid4(),
             user_id=user_id,
             problem_id=problem_id,
+            test_set_id=test_set_id,
+            contest_id=contest_id,
             language=language,
             code=code,
             status=SubmissionStatus.PENDING,
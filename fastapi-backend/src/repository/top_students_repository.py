@@ -1,6 +1,6 @@
 from sqlalchemy.engine import row
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete, func, and_, or_, desc
+from sqlalchemy import select, delete, func, and_, or_, desc, exists, literal
 from sqlalchemy.orm import selectinload
 from typing import Optional, List, Dict, Any
 from uuid import UUID
@@ -11,6 +11,7 @@ from slugify import slugify
 from ..models.base import SubmissionStatus, DifficultyLevel
 from ..models.problem_models import Problem, Example, TestCase
 from ..models.submission_models import Submission
+from ..models.stats_models import UserScore
 from ..models.user_models import User
 
 class TopStudentsRepository:
@@ -20,17 +21,14 @@ class TopStudentsRepository:
 
 
     async def get_top_students(self, limit: int = 10) -> List[Dict]:
-        ac_subquery = (
-            select(
-                Submission.user_id,
-                func.count().label("ac_count")
-            )
-            .where(Submission.status == SubmissionStatus.ACCEPTED)  # ← AC, не ACCEPTED!
-            .group_by(Submission.user_id)
-            .subquery()
-        )
+        """
+        Топ студентов по числу решённых задач (различных, без повторных
+        принятых попыток) и рейтингу.
 
-        # Основной запрос
+        Читает материализованную таблицу user_scores сканом индекса
+        ix_user_scores_rank (solved_count ведётся по user_solved_problems);
+        users подтягиваются по первичному ключу только для попавших в топ строк.
+        """
         stmt = (
             select(
                 User.id,
@@ -38,16 +36,41 @@ class TopStudentsRepository:
                 User.full_name,
                 User.email,
                 User.university_id,
-                User.rating,
-                func.coalesce(ac_subquery.c.ac_count, 0).label("solved_count")
+                UserScore.rating,
+                UserScore.solved_count,
+            )
+            .join(User, User.id == UserScore.user_id)
+            .where(User.role == "student", User.deleted_at.is_(None))
+            .order_by(
+                UserScore.solved_count.desc(),
+                UserScore.rating.desc(),
+                UserScore.last_accepted_at,
             )
-            .join(ac_subquery, User.id == ac_subquery.c.user_id, isouter=True)
-            .where(User.role == "student")
-            .order_by(desc("solved_count"), desc(User.rating))
             .limit(limit)
         )
-        result = await self.db.execute(stmt)
-        rows = result.fetchall()
+        rows = (await self.db.execute(stmt)).fetchall()
+
+        if len(rows) < limit:
+            # Студенты без решённых задач в user_scores не попадают
+            no_score = (
+                select(
+                    User.id,
+                    User.username,
+                    User.full_name,
+                    User.email,
+                    User.university_id,
+                    User.rating,
+                    literal(0).label("solved_count"),
+                )
+                .where(
+                    User.role == "student",
+                    User.deleted_at.is_(None),
+                    ~exists().where(UserScore.user_id == User.id),
+                )
+                .order_by(User.rating.desc())
+                .limit(limit - len(rows))
+            )
+            rows += (await self.db.execute(no_score)).fetchall()
 
         return [
             {
@@ -60,4 +83,4 @@ class TopStudentsRepository:
                 "solved_count": row.solved_count,
             }
             for row in rows
-        ]
\ No newline at end of file
+        ]
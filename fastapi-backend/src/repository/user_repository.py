@@ -1,8 +1,9 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete, func, and_, or_
+from sqlalchemy import select, delete, update, func, and_, or_, cast, String
 from sqlalchemy.orm import selectinload
 from typing import Optional, List, Dict, Any
 from uuid import UUID
+from datetime import datetime
 import uuid as uuid_lib
 import re
 from slugify import slugify
@@ -10,7 +11,9 @@ from slugify import slugify
 from ..models.base import SubmissionStatus, DifficultyLevel
 from ..models.problem_models import Problem, Example, TestCase
 from ..models.submission_models import Submission
-from ..models.user_models import User
+from ..models.user_models import User, INITIAL_RATING
+from .refresh_token_repository import RefreshTokenRepository
+from .user_score_repository import UserScoreRepository
 
 class UserRepository:
 
@@ -27,7 +30,7 @@ class UserRepository:
             hashed_password=hashed_password,
             full_name=full_name,
             role=role,
-            rating=1500
+            rating=INITIAL_RATING
         )
         self.db.add(user)
         await self.db.commit()
@@ -36,24 +39,24 @@ class UserRepository:
 
 
     async def get_user_by_id(self, user_id: uuid_lib.UUID) -> Optional[User]:
-        stmt = select(User).where(User.id == user_id)
+        stmt = select(User).where(User.id == user_id, User.deleted_at.is_(None))
         result = await self.db.execute(stmt)
         return result.scalars().first()
 
     async def get_user_by_email(self, email: str) -> Optional[User]:
 
-        stmt = select(User).where(User.email == email)
+        stmt = select(User).where(User.email == email, User.deleted_at.is_(None))
         result = await self.db.execute(stmt)
         return result.scalars().first()
 
     async def get_user_by_username(self, username: str) -> Optional[User]:
-        stmt = select(User).where(User.username == username)
+        stmt = select(User).where(User.username == username, User.deleted_at.is_(None))
         result = await self.db.execute(stmt)
         return result.scalars().first()
 
     async def update_user(self, user_id:uuid_lib.UUID, data: Dict[str, Any]) -> Optional[User]:
 
-        stmt = select(User).where(User.id == user_id)
+        stmt = select(User).where(User.id == user_id, User.deleted_at.is_(None))
         result = await self.db.execute(stmt)
         user = result.scalars().first()
 
@@ -63,6 +66,11 @@ class UserRepository:
         for key, value in data.items():
             if key not in ['id', 'created_at'] and hasattr(user, key):
                 setattr(user, key, value)
+        if 'rating' in data:
+            await UserScoreRepository(self.db).set_rating(user_id, user.rating)
+        if data.get('is_active') is False:
+            # Деактивированный пользователь не должен обновлять access токены
+            await RefreshTokenRepository(self.db).revoke_user(user_id)
         await self.db.commit()
         await self.db.refresh(user)
         return user
@@ -75,29 +83,52 @@ class UserRepository:
         if not user:
             return None
 
-        user.rating = max(0, user.rating, rating_delta)
+        user.update_rating(rating_delta)
+        await UserScoreRepository(self.db).set_rating(user_id, user.rating)
         await self.db.commit()
         await self.db.refresh(user)
         return user
 
     async def delete_user(self, user_id:uuid_lib.UUID) -> bool:
-
-        stmt = delete(User).where(User.id == user_id)
+        """Мягко удаляет пользователя и деактивирует его.
+
+        Попытки, задачи и группы удаляет фоновая очистка пачками
+        (см. services/purge_service.py).
+
+        Email и username сразу освобождаются: уникальные индексы покрывают
+        и удалённые строки, а проверки занятости их уже не видят. К значениям
+        добавляется id («deleted-<id>+<email>», «<username>~<id>»), исходные
+        остаются читаемыми до очистки. Refresh токены отзываются в той же
+        транзакции.
+        """
+        suffix = cast(User.id, String)
+        stmt = (
+            update(User)
+            .where(User.id == user_id, User.deleted_at.is_(None))
+            .values(
+                deleted_at=datetime.utcnow(),
+                is_active=False,
+                email="deleted-" + suffix + "+" + func.left(User.email, 200),
+                username=func.left(User.username, 55) + "~" + suffix,
+            )
+        )
         result = await self.db.execute(stmt)
+        if result.rowcount:
+            await RefreshTokenRepository(self.db).revoke_user(user_id)
         await self.db.commit()
         return result.rowcount > 0
 
 
     async def list_users(self, skip: int = 0, limit: int = 100) -> List[User]:
 
-        stmt = select(User).offset(skip).limit(limit)
+        stmt = select(User).where(User.deleted_at.is_(None)).offset(skip).limit(limit)
         result = await self.db.execute(stmt)
         return result.scalars().all()
 
     async def get_top_students(self, limit: int = 10) -> List[User]:
         stmt = (
             select(User)
-            .where(User.role == "student")
+            .where(User.role == "student", User.deleted_at.is_(None))
             .order_by(User.rating.desc())
             .limit(limit)
         )
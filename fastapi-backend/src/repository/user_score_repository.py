@@ -0,0 +1,85 @@
+# fastapi-backend/src/repository/user_score_repository.py
+from datetime import datetime
+import uuid
+
+from sqlalchemy import select, update, delete, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.stats_models import UserScore, UserSolvedProblem
+from ..models.user_models import User
+from .rating_repository import starting_rating
+
+
+class UserScoreRepository:
+    """Репозиторий материализованного лидерборда (таблица user_scores)."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def record_solved(self, user_id: uuid.UUID, solved_at: datetime) -> None:
+        """
+        Учитывает новую решённую задачу (первое ACCEPTED по ней). Не коммитит —
+        изменение попадает в транзакцию, которая сохраняет вердикт.
+        """
+        stmt = insert(UserScore).values(
+            user_id=user_id,
+            solved_count=1,
+            rating=starting_rating(select(User.rating).where(User.id == user_id).scalar_subquery()),
+            last_accepted_at=solved_at,
+            updated_at=datetime.utcnow(),
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[UserScore.user_id],
+            set_={
+                "solved_count": UserScore.solved_count + 1,
+                "last_accepted_at": func.greatest(UserScore.last_accepted_at, stmt.excluded.last_accepted_at),
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+        await self.db.execute(stmt)
+
+    async def set_rating(self, user_id: uuid.UUID, rating: int) -> None:
+        """Синхронизирует рейтинг с users.rating (без коммита)."""
+        await self.db.execute(
+            update(UserScore)
+            .where(UserScore.user_id == user_id)
+            .values(rating=rating, updated_at=datetime.utcnow())
+        )
+
+    async def rebuild(self) -> int:
+        """
+        Пересчитывает таблицу из user_solved_problems (бэкфилл или починка).
+
+        Returns:
+            Количество записанных строк
+        """
+        solved = (
+            select(
+                UserSolvedProblem.user_id,
+                func.count().label("solved_count"),
+                func.max(UserSolvedProblem.first_ac_at).label("last_accepted_at"),
+            )
+            .group_by(UserSolvedProblem.user_id)
+            .subquery()
+        )
+        rows = (
+            select(
+                solved.c.user_id,
+                solved.c.solved_count,
+                starting_rating(User.rating),
+                solved.c.last_accepted_at,
+                func.now(),
+            )
+            .select_from(solved)
+            .join(User, User.id == solved.c.user_id)
+        )
+
+        await self.db.execute(delete(UserScore))
+        result = await self.db.execute(
+            insert(UserScore).from_select(
+                ["user_id", "solved_count", "rating", "last_accepted_at", "updated_at"], rows
+            )
+        )
+        await self.db.commit()
+        return result.rowcount
@@ -0,0 +1,65 @@
+# src/schemas/contest_schemas.py
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+from typing import List, Optional
+from datetime import datetime
+from uuid import UUID
+
+from .schemas import ExampleResponse
+
+
+class ContestCreate(BaseModel):
+    title: str = Field(..., min_length=3, max_length=200)
+    description: Optional[str] = None
+    start_time: datetime
+    end_time: datetime
+    freeze_at: Optional[datetime] = Field(None, description="Заморозка таблицы (между началом и концом)")
+    penalty_minutes: int = Field(20, ge=0, le=240)
+    problem_ids: List[UUID] = Field(..., min_length=1, max_length=26)
+
+    @model_validator(mode="after")
+    def check_window(self):
+        if self.end_time <= self.start_time:
+            raise ValueError("end_time должен быть позже start_time")
+        if self.freeze_at is not None and not (self.start_time <= self.freeze_at <= self.end_time):
+            raise ValueError("freeze_at должен быть между start_time и end_time")
+        if len(set(self.problem_ids)) != len(self.problem_ids):
+            raise ValueError("Задачи в соревновании не должны повторяться")
+        return self
+
+
+class ContestProblemItem(BaseModel):
+    label: str
+    problem_id: UUID
+    title: str
+
+
+class ContestResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    title: str
+    description: Optional[str] = None
+    author_id: Optional[UUID] = None
+    start_time: datetime
+    end_time: datetime
+    freeze_at: Optional[datetime] = None
+    unfrozen: bool
+    penalty_minutes: int
+    status: str  # upcoming | running | finished
+
+
+class ContestDetailResponse(ContestResponse):
+    participants: int = 0
+    is_registered: bool = False
+    problems: List[ContestProblemItem] = []  # пусто до начала (кроме автора)
+
+
+class ContestProblemStatement(BaseModel):
+    """Условие задачи для участника соревнования"""
+    label: str
+    problem_id: UUID
+    title: str
+    description: str
+    time_limit: Optional[int] = None
+    memory_limit: Optional[int] = None
+    examples: List[ExampleResponse] = []
@@ -47,4 +47,31 @@ class StudentAssignmentDTO(BaseModel):
     problem_id: UUID
     problem_title: str
     deadline: datetime
-    is_overdue: bool
\ No newline at end of file
+    is_overdue: bool
+
+
+class ProgressAssignment(BaseModel):
+    """Столбец матрицы прогресса"""
+    assignment_id: UUID
+    problem_id: UUID
+    problem_title: str
+    deadline: datetime
+
+class ProgressCell(BaseModel):
+    """Клетка матрицы: попытки студента по задаче назначения"""
+    best_status: Optional[str] = None  # None — попыток не было
+    attempts: int = 0
+    first_ac_at: Optional[datetime] = None
+    is_late: bool = False  # первое ACCEPTED после дедлайна
+
+class ProgressStudentRow(BaseModel):
+    """Строка матрицы: клетки в порядке столбцов assignments"""
+    user_id: UUID
+    username: str
+    full_name: Optional[str] = None
+    cells: List[ProgressCell]
+
+class GroupProgressResponse(BaseModel):
+    group_id: UUID
+    assignments: List[ProgressAssignment]
+    students: List[ProgressStudentRow]
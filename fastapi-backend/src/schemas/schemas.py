@@ -1,6 +1,6 @@
 # fastapi-backend/src/schemas/schemas.py
 
-from pydantic import BaseModel, ConfigDict, Field, EmailStr
+from pydantic import BaseModel, ConfigDict, Field, EmailStr, model_validator
 from typing import List, Literal, Optional
 from datetime import datetime
 import uuid
@@ -45,6 +45,15 @@ class Token(BaseModel):
     token_type: str = "bearer"
 
 
+class SessionResponse(BaseModel):
+    """Активная сессия пользователя (семейство refresh токенов одного входа)."""
+    family_id: uuid.UUID
+    user_agent: Optional[str] = None
+    last_used_at: datetime
+    expires_at: datetime
+    current: bool = False
+
+
 # ============ TEST CASE & EXAMPLE SCHEMAS ============
 
 class TestCaseCreate(BaseModel):
@@ -54,17 +63,41 @@ class TestCaseCreate(BaseModel):
     is_sample: bool = Field(False, description="Если True, тест виден студенту.")
 
 
+def test_data_url(problem_id: uuid.UUID, test_id: uuid.UUID, kind: str) -> str:
+    """Адрес потоковой выгрузки input/output теста (GET, поддерживает Range)."""
+    return f"/api/teacher/problems/{problem_id}/tests/{test_id}/{kind}"
+
+
 class TestCaseResponse(BaseModel):
-    """Ответ с тестовым случаем."""
+    """
+    Ответ с тестовым случаем.
+
+    Данные тестов хранятся в файловом хранилище и в ответ не встраиваются:
+    input_data/output_data заполнены только у тестов, ещё не перенесённых
+    в хранилище. Содержимое скачивается по input_url/output_url, а
+    *_sha256/*_size позволяют не скачивать уже имеющиеся файлы.
+    """
     model_config = ConfigDict(from_attributes=True)
 
     id: uuid.UUID
     problem_id: uuid.UUID
-    input_data: str
-    output_data: str
+    input_data: Optional[str] = None
+    output_data: Optional[str] = None
+    input_sha256: Optional[str] = None
+    input_size: Optional[int] = None
+    output_sha256: Optional[str] = None
+    output_size: Optional[int] = None
+    input_url: Optional[str] = Field(None, description="Скачать input теста")
+    output_url: Optional[str] = Field(None, description="Скачать output теста")
     is_sample: bool
     order_index: int
 
+    @model_validator(mode="after")
+    def fill_download_urls(self):
+        self.input_url = test_data_url(self.problem_id, self.id, "input")
+        self.output_url = test_data_url(self.problem_id, self.id, "output")
+        return self
+
 
 class ExampleCreate(BaseModel):
     """Создание примера."""
@@ -131,6 +164,30 @@ class ProblemResponse(ProblemBase):
     test_cases: List[TestCaseResponse] = []
 
 
+class SampleTestResponse(BaseModel):
+    """Открытый тест (is_sample), который можно показать студенту."""
+    id: uuid.UUID
+    order_index: int
+    input_data: str
+    output_data: str
+
+
+class StudentProblemListItem(ProblemBase):
+    """Задача в каталоге студента с отметкой «решена»."""
+    solved: bool = False
+
+
+class StudentProblemResponse(ProblemBase):
+    """Условие задачи для студента: лимиты, примеры и только открытые тесты."""
+    user_id: uuid.UUID
+    description: str
+    time_limit: Optional[int] = None
+    memory_limit: Optional[int] = None
+    created_at: datetime
+    examples: List[ExampleResponse] = []
+    sample_tests: List[SampleTestResponse] = []
+
+
 # ============ SUBMISSION SCHEMAS ============
 
 class SubmissionCreate(BaseModel):
@@ -138,6 +195,7 @@ class SubmissionCreate(BaseModel):
     problem_id: uuid.UUID = Field(..., description="ID задачи.")
     language: SUPPORTED_LANGUAGES = Field(..., description="Язык программирования.")
     code: str = Field(..., min_length=10, description="Исходный код решения.")
+    contest_id: Optional[uuid.UUID] = Field(None, description="ID соревнования (попытка в рамках соревнования).")
 
 
 class SubmissionResponse(BaseModel):
@@ -55,6 +55,18 @@ class UserRatingUpdate(BaseModel):
     )
 
 
+class RatingHistoryItem(BaseModel):
+    model_config = {"from_attributes": True}
+
+    source_type: str
+    source_id: UUID
+    old_rating: int
+    new_rating: int
+    delta: int
+    rank: int
+    created_at: datetime
+
+
 class UserResponse(BaseModel):
     id: UUID
     username: str
@@ -77,5 +89,5 @@ class UserResponse(BaseModel):
 
     model_config = {
         "from_attributes": True,
-        "exclude": {"hashed_password", "refresh_token_hash"}
+        "exclude": {"hashed_password"}
     }
\ No newline at end of file
@@ -4,16 +4,16 @@ import uuid
 from typing import List, Optional
 
 from fastapi import HTTPException
-from passlib.context import CryptContext
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.util import await_only
 
+from ..core.events import publish_user_changed
+from ..core.security import PasswordService
 from ..models.user_models import User
 from ..repository.user_repository import UserRepository
 from  ..schemas.user_schemas import  UserResponse, CreateUserRequest, UpdateUserRequest
 from ..services.user_service import UserService
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
 
@@ -34,7 +34,7 @@ class AdminUserService(UserService):
             raise ValueError("Username уже занят")
 
         # Хеширование пароля
-        hashed_password = pwd_context.hash(data.password)
+        hashed_password = await PasswordService.hash_password(data.password)
 
         user = await self.user_repository.create_user(
             email=data.email,
@@ -59,12 +59,18 @@ class AdminUserService(UserService):
             if existing and existing.id != user_id:
                 raise HTTPException(status_code=400, detail="Email already exists")
 
-        return await self.user_repository.update_user(user_id,updated_data)
+        user = await self.user_repository.update_user(user_id,updated_data)
+        await publish_user_changed(user_id)
+        return user
 
     async def delete_user_as_admin(self, user_id: uuid.UUID) -> bool:
-        return await self.user_repository.delete_user(user_id)
+        deleted = await self.user_repository.delete_user(user_id)
+        await publish_user_changed(user_id)
+        return deleted
 
     async def  change_user_role(self, user_id: uuid.UUID, new_role: str) -> Optional[User]:
         if new_role not in ["STUDENT", "ADMIN", "TEACHER"]:
             raise ValueError("Неверная роль")
-        return await self.user_repository.update_user(user_id,{"role":new_role})
+        user = await self.user_repository.update_user(user_id,{"role":new_role})
+        await publish_user_changed(user_id)
+        return user
@@ -5,7 +5,9 @@
 """
 
 import logging
-from typing import Optional
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
 from uuid import UUID, uuid4
 
 from fastapi import Depends, HTTPException, status
@@ -13,9 +15,16 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
 
-from ..database import get_db
-from ..models.user_models import User
-from ..schemas.schemas import UserCreate
+from ..database import get_db, AsyncSessionLocal
+from ..core.cache import SingleFlightCache
+from ..core.config import settings
+from ..core.events import on_user_changed
+from ..core.metrics import register_cache
+from ..models.token_models import RefreshToken
+from ..models.user_models import User, INITIAL_RATING
+from ..repository.refresh_token_repository import RefreshTokenRepository
+from .revocation_service import revoke_token
+from ..schemas.schemas import UserCreate, SessionResponse
 from ..core.security import (
     Role,
     PasswordService,
@@ -27,6 +36,47 @@ from ..core.security import (
 logger = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True)
+class Principal:
+    """
+    Минимум о пользователе для проверки доступа: большинству обработчиков
+    нужны только id и роль. Роль приведена к значению Role (lowercase).
+    """
+    id: UUID
+    username: str
+    role: str
+    is_active: bool
+
+
+# Принципалы по user_id; None — пользователь не найден или удалён.
+# Сбрасывается событием user_changed (в своём воркере), в остальных — по TTL
+principal_cache: SingleFlightCache[Optional[Principal]] = register_cache("principals", SingleFlightCache(
+    maxsize=settings.PRINCIPAL_CACHE_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+))
+
+
+@on_user_changed
+def invalidate_principal(user_id: UUID) -> None:
+    principal_cache.invalidate(lambda key: key == user_id)
+
+
+async def _load_principal(user_id: UUID) -> Optional[Principal]:
+    async with AsyncSessionLocal() as session:
+        stmt = select(User.id, User.username, User.role, User.is_active).where(
+            User.id == user_id, User.deleted_at.is_(None)
+        )
+        row = (await session.execute(stmt)).first()
+    if row is None:
+        return None
+    role = row.role.value if hasattr(row.role, "value") else str(row.role).lower()
+    return Principal(id=row.id, username=row.username, role=role, is_active=bool(row.is_active))
+
+
+def _refresh_error(detail: str) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=detail)
+
+
 class AuthService:
     """Сервис для аутентификации и управления пользователями."""
 
@@ -34,16 +84,17 @@ class AuthService:
         self.db = db
         self._password_service = PasswordService()
         self._token_service = TokenService()
+        self._refresh_repo = RefreshTokenRepository(db)
 
     # === Работа с паролями ===
 
-    def hash_password(self, password: str) -> str:
-        """Хэширует пароль."""
-        return self._password_service.hash_password(password)
+    async def hash_password(self, password: str) -> str:
+        """Хэширует пароль (в пуле хэширования)."""
+        return await self._password_service.hash_password(password)
 
-    def verify_password(self, plain_password: str, hashed_password: str) -> bool:
-        """Проверяет пароль."""
-        return self._password_service.verify_password(plain_password, hashed_password)
+    async def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        """Проверяет пароль (в пуле хэширования)."""
+        return await self._password_service.verify_password(plain_password, hashed_password)
 
     # === Работа с токенами ===
 
@@ -61,28 +112,21 @@ class AuthService:
         """Декодирует токен."""
         return self._token_service.decode_token(token)
 
-    def verify_refresh_token_string(self, token: str, hashed_token: str) -> bool:
-        """
-        Проверяет refresh токен против хэша в БД.
-        ВАЖНО: Использует правильную схему SHA256 + bcrypt.
-        """
-        return self._password_service.verify_refresh_token(token, hashed_token)
-
 
     async def get_user_by_id(self, user_id: UUID) -> Optional[User]:
         """Получает пользователя по ID."""
-        stmt = select(User).where(User.id == user_id)
+        stmt = select(User).where(User.id == user_id, User.deleted_at.is_(None))
         result = await self.db.execute(stmt)
         return result.scalars().first()
 
     async def get_user_by_email(self, email: str) -> Optional[User]:
         """Получает пользователя по email."""
-        stmt = select(User).where(User.email == email.lower().strip())
+        stmt = select(User).where(User.email == email.lower().strip(), User.deleted_at.is_(None))
         result = await self.db.execute(stmt)
         return result.scalars().first()
 
     async def get_user_by_username(self, username: str) -> Optional[User]:
-        stmt = select(User).where(User.username == username.strip())
+        stmt = select(User).where(User.username == username.strip(), User.deleted_at.is_(None))
         result = await self.db.execute(stmt)
         return result.scalar_one_or_none()
 
@@ -123,7 +167,7 @@ class AuthService:
             role = role.value
 
         # Создание пользователя
-        hashed_password = self.hash_password(user_data.password)
+        hashed_password = await self.hash_password(user_data.password)
 
         db_user = User(
             id=uuid4(),
@@ -132,7 +176,7 @@ class AuthService:
             hashed_password=hashed_password,
             role=role,
             full_name=user_data.full_name,
-            rating=0
+            rating=INITIAL_RATING
         )
 
         try:
@@ -164,14 +208,111 @@ class AuthService:
                 detail="Ошибка при создании пользователя"
             )
 
-    async def update_refresh_token(self, user: User, refresh_token: Optional[str]) -> None:
-        if refresh_token:
-            user.refresh_token_hash = self._password_service.hash_refresh_token(refresh_token)
-        else:
-            user.refresh_token_hash = None
+    # === Refresh токены и сессии ===
 
+    async def issue_refresh_token(
+            self, user: User, user_agent: Optional[str] = None, family_id: Optional[UUID] = None
+    ) -> str:
+        """
+        Выдаёт refresh токен и сохраняет его HMAC.
+        Без family_id начинается новая сессия (вход с устройства).
+        """
+        token = self.create_refresh_token(user)
+        await self._refresh_repo.add(
+            user_id=user.id,
+            family_id=family_id or uuid4(),
+            digest=self._token_service.refresh_token_digest(token),
+            expires_at=datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+            user_agent=user_agent,
+        )
         await self.db.commit()
-        await self.db.refresh(user)
+        return token
+
+    async def rotate_refresh_token(self, token: str, user_agent: Optional[str] = None) -> Tuple[User, str]:
+        """
+        Ротация refresh токена: предъявленный помечается заменённым,
+        новый выдаётся в том же семействе.
+
+        Raises:
+            HTTPException 401: токен недействителен, отозван или использован повторно
+        """
+        if not self._token_service.verify_refresh_token(token):
+            raise _refresh_error("Недействительный refresh токен")
+
+        stored = await self._refresh_repo.get_by_digest(self._token_service.refresh_token_digest(token))
+        if stored is None:
+            raise _refresh_error("Refresh токен недействителен")
+        if stored.revoked_at is not None:
+            raise _refresh_error("Refresh токен был отозван")
+        if stored.rotated_at is not None or not await self._refresh_repo.mark_rotated(stored.id):
+            await self._reject_reused_token(stored)
+
+        user = await self.get_user_by_id(stored.user_id)
+        if not user:
+            await self.db.rollback()
+            logger.warning(f"Пользователь не найден при refresh: {stored.user_id}")
+            raise _refresh_error("Пользователь не найден")
+
+        new_token = await self.issue_refresh_token(user, user_agent or stored.user_agent, stored.family_id)
+        return user, new_token
+
+    async def _reject_reused_token(self, stored: RefreshToken) -> None:
+        """
+        Токен уже заменён. Сразу после ротации это гонка параллельных
+        вкладок; позже — повтор украденного токена: отзываем всё семейство.
+        """
+        await self.db.refresh(stored)
+        grace = timedelta(seconds=settings.REFRESH_TOKEN_REUSE_GRACE_SECONDS)
+        if stored.rotated_at is not None and stored.rotated_at >= datetime.utcnow() - grace:
+            raise _refresh_error("Refresh токен уже обновлён")
+
+        await self._refresh_repo.revoke_family(stored.family_id)
+        await self.db.commit()
+        logger.warning(f"Повторное использование refresh токена: пользователь {stored.user_id}, "
+                       f"сессия {stored.family_id} отозвана")
+        raise _refresh_error("Refresh токен недействителен")
+
+    async def revoke_refresh_token(self, token: str) -> Optional[UUID]:
+        """
+        Выход: отзывает сессию, к которой относится токен.
+
+        Returns:
+            ID пользователя или None, если токен не найден
+        """
+        stored = await self._refresh_repo.get_by_digest(self._token_service.refresh_token_digest(token))
+        if stored is None:
+            return None
+        await self._refresh_repo.revoke_family(stored.family_id)
+        await self.db.commit()
+        return stored.user_id
+
+    async def revoke_access_token(self, token: str) -> bool:
+        """Отзывает access токен до истечения (например, при выходе)."""
+        payload = self._token_service.verify_access_token(token)
+        if not payload:
+            return False
+        await revoke_token(self.db, payload)
+        return True
+
+    async def list_sessions(self, user_id: UUID, current_token: Optional[str] = None) -> List[SessionResponse]:
+        """Активные сессии пользователя; current — сессия текущего refresh токена."""
+        current_digest = self._token_service.refresh_token_digest(current_token) if current_token else None
+        return [
+            SessionResponse(
+                family_id=token.family_id,
+                user_agent=token.user_agent,
+                last_used_at=token.created_at,
+                expires_at=token.expires_at,
+                current=token.digest == current_digest,
+            )
+            for token in await self._refresh_repo.list_active(user_id)
+        ]
+
+    async def revoke_session(self, user_id: UUID, family_id: UUID) -> bool:
+        """Отзывает сессию пользователя на одном устройстве."""
+        revoked = await self._refresh_repo.revoke_family(family_id, user_id=user_id)
+        await self.db.commit()
+        return revoked > 0
 
     async def authenticate_user(self, email: str, password: str) -> Optional[User]:
         user = await self.get_user_by_email(email)
@@ -180,7 +321,7 @@ class AuthService:
             logger.debug(f"Пользователь не найден: {email}")
             return None
 
-        if not self.verify_password(password, user.hashed_password):
+        if not await self.verify_password(password, user.hashed_password):
             logger.debug(f"Неверный пароль для: {email}")
             return None
 
@@ -220,19 +361,37 @@ async def get_current_user(
     return user
 
 
-async def get_current_active_user(user: User = Depends(get_current_user)) -> User:
+async def get_current_principal(user_id: UUID = Depends(get_current_user_id)) -> Principal:
+    """
+    Текущий пользователь без обращения к БД (если он есть в кэше).
+    Для обработчиков, которым нужны только id, роль и активность.
+    """
+    principal = await principal_cache.get_or_build(user_id, lambda: _load_principal(user_id))
+
+    if principal is None:
+        logger.warning(f"Пользователь не найден в БД: {user_id}")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Пользователь не найден",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    return principal
+
+
+async def get_current_active_user(user: Principal = Depends(get_current_principal)) -> Principal:
     """Проверяет, что пользователь активен."""
-    if hasattr(user, 'is_active') and not user.is_active:
+    if not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Пользователь деактивирован"
         )
     return user
-# === Зависимости для ролей (используют get_current_user) ===
+# === Зависимости для ролей (используют кэшированный Principal) ===
 
-async def get_current_teacher(user: User = Depends(get_current_user)) -> User:
+async def get_current_teacher(user: Principal = Depends(get_current_principal)) -> Principal:
     """Требует роль teacher или admin."""
-    role = user.role.value if hasattr(user.role, 'value') else str(user.role).lower()
+    role = user.role
 
     if role not in [Role.TEACHER.value, Role.ADMIN.value]:
         raise HTTPException(
@@ -242,9 +401,9 @@ async def get_current_teacher(user: User = Depends(get_current_user)) -> User:
     return user
 
 
-async def get_current_student(user: User = Depends(get_current_user)) -> User:
+async def get_current_student(user: Principal = Depends(get_current_principal)) -> Principal:
     """Требует роль student."""
-    role = user.role.value if hasattr(user.role, 'value') else str(user.role).lower()
+    role = user.role
 
     if role != Role.STUDENT.value:
         raise HTTPException(
@@ -254,9 +413,9 @@ async def get_current_student(user: User = Depends(get_current_user)) -> User:
     return user
 
 
-async def get_current_student_or_teacher_or_admin(user: User = Depends(get_current_user)) -> User:
+async def get_current_student_or_teacher_or_admin(user: Principal = Depends(get_current_principal)) -> Principal:
     """Разрешает любую роль (student, teacher, admin)."""
-    role = user.role.value if hasattr(user.role, 'value') else str(user.role).lower()
+    role = user.role
 
     if role not in [Role.STUDENT.value, Role.TEACHER.value, Role.ADMIN.value]:
         raise HTTPException(
@@ -270,8 +429,10 @@ async def get_current_student_or_teacher_or_admin(user: User = Depends(get_curre
 
 __all__ = [
     "AuthService",
+    "Principal",
     "get_auth_service",
     "get_current_user",
+    "get_current_principal",
     "get_current_active_user",
     "get_current_teacher",
     "get_current_student",
@@ -0,0 +1,288 @@
+# fastapi-backend/src/services/contest_service.py
+
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, List, Optional, Tuple
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.cache import SingleFlightCache
+from ..core.config import settings
+from ..core.events import on_problems_changed
+from ..core.metrics import register_cache
+from ..database import AsyncSessionLocal
+from ..models.contest_models import Contest
+from ..models.rating_models import RATING_SOURCE_CONTEST
+from .auth_service import Principal
+from ..repository.contest_repository import ContestRepository
+from ..repository.problem_repository import ProblemRepository
+from ..repository.submission_repository import SubmissionRepository
+from ..schemas.contest_schemas import (
+    ContestCreate, ContestResponse, ContestDetailResponse,
+    ContestProblemItem, ContestProblemStatement
+)
+from ..schemas.schemas import ExampleResponse
+from .rating_service import RatingService
+from .replay_service import ReplayService
+from .submission_service import SubmissionService
+from .scoreboard_service import get_scoreboard_snapshot, forget_scoreboard, scoreboard_events
+
+# Результат участника для рейтинга: решённые важнее штрафа
+RATING_SOLVED_WEIGHT = 1_000_000
+
+_statements_adapter = TypeAdapter(List[ContestProblemStatement])
+
+# Условия задач соревнования (JSON), общие для всех участников: contest_id -> bytes.
+# На старте все участники запрашивают их одновременно — строится один раз
+contest_statements_cache: SingleFlightCache[bytes] = register_cache("contest_statements", SingleFlightCache(
+    maxsize=settings.CONTEST_SCOREBOARD_CACHE_SIZE,
+    ttl=settings.CONTEST_STATEMENTS_CACHE_TTL_SECONDS,
+))
+
+
+@on_problems_changed
+def invalidate_contest_statements() -> None:
+    contest_statements_cache.invalidate()
+
+
+async def _render_contest_statements(contest_id: UUID) -> bytes:
+    async with AsyncSessionLocal() as session:
+        items = await ContestRepository(session).get_problem_details(contest_id)
+        statements = [
+            ContestProblemStatement(
+                label=item.label,
+                problem_id=item.problem_id,
+                title=item.problem.title,
+                description=item.problem.description,
+                time_limit=item.problem.time_limit,
+                memory_limit=item.problem.memory_limit,
+                examples=[ExampleResponse.model_validate(example) for example in item.problem.examples],
+            )
+            for item in items
+        ]
+    return _statements_adapter.dump_json(statements)
+
+
+async def get_contest_statements(contest_id: UUID) -> bytes:
+    """Условия задач соревнования; доступ должен быть проверен вызывающим."""
+    return await contest_statements_cache.get_or_build(contest_id, lambda: _render_contest_statements(contest_id))
+
+
+def to_naive_utc(moment: Optional[datetime]) -> Optional[datetime]:
+    """В БД время хранится как UTC без таймзоны."""
+    if moment is None or moment.tzinfo is None:
+        return moment
+    return moment.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def to_aware_utc(moment: Optional[datetime]) -> Optional[datetime]:
+    return moment.replace(tzinfo=timezone.utc) if moment else None
+
+
+def contest_status(contest: Contest, now: Optional[datetime] = None) -> str:
+    now = now or datetime.utcnow()
+    if now < contest.start_time:
+        return "upcoming"
+    if now < contest.end_time:
+        return "running"
+    return "finished"
+
+
+class ContestService:
+    """Соревнования: создание, регистрация, задачи, таблица результатов, рейтинг."""
+
+    def __init__(self, db: AsyncSession, current_user: Principal):
+        self.db = db
+        self.current_user = current_user
+        self.contest_repo = ContestRepository(db)
+        self.problem_repo = ProblemRepository(db)
+
+    def _can_manage(self, contest: Contest) -> bool:
+        return contest.author_id == self.current_user.id or self.current_user.role == "admin"
+
+    async def _get_contest(self, contest_id: UUID) -> Contest:
+        contest = await self.contest_repo.get_by_id(contest_id)
+        if not contest:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Соревнование не найдено")
+        return contest
+
+    async def _get_managed_contest(self, contest_id: UUID) -> Contest:
+        contest = await self._get_contest(contest_id)
+        if not self._can_manage(contest):
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Нет прав на это соревнование")
+        return contest
+
+    @staticmethod
+    def _to_response(contest: Contest, response_cls=ContestResponse, **extra):
+        return response_cls(
+            id=contest.id,
+            title=contest.title,
+            description=contest.description,
+            author_id=contest.author_id,
+            start_time=to_aware_utc(contest.start_time),
+            end_time=to_aware_utc(contest.end_time),
+            freeze_at=to_aware_utc(contest.freeze_at),
+            unfrozen=contest.unfrozen,
+            penalty_minutes=contest.penalty_minutes,
+            status=contest_status(contest),
+            **extra,
+        )
+
+    async def create_contest(self, data: ContestCreate) -> ContestDetailResponse:
+        """Создать соревнование из своих или публичных задач."""
+        for problem_id in data.problem_ids:
+            problem = await self.problem_repo.get_problem_by_id(problem_id)
+            if not problem:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Задача {problem_id} не найдена")
+            if not problem.is_public and problem.user_id != self.current_user.id and self.current_user.role != "admin":
+                raise HTTPException(
+                    status_code=status.HTTP_403_FORBIDDEN,
+                    detail=f"Нельзя добавить чужую непубличную задачу {problem_id}"
+                )
+
+        contest = Contest(
+            title=data.title,
+            description=data.description,
+            author_id=self.current_user.id,
+            start_time=to_naive_utc(data.start_time),
+            end_time=to_naive_utc(data.end_time),
+            freeze_at=to_naive_utc(data.freeze_at),
+            penalty_minutes=data.penalty_minutes,
+        )
+        created = await self.contest_repo.create_contest(contest, data.problem_ids)
+        return await self.get_contest(created.id)
+
+    async def list_contests(self, skip: int = 0, limit: int = 50) -> List[ContestResponse]:
+        contests = await self.contest_repo.list_contests(skip, limit)
+        return [self._to_response(contest) for contest in contests]
+
+    async def get_contest(self, contest_id: UUID) -> ContestDetailResponse:
+        """Соревнование; список задач виден после начала (автору — всегда)."""
+        contest = await self._get_contest(contest_id)
+        problems = []
+        if self._can_manage(contest) or contest_status(contest) != "upcoming":
+            problems = [
+                ContestProblemItem(label=item.label, problem_id=item.problem_id, title=item.problem.title)
+                for item in contest.problems
+            ]
+        return self._to_response(
+            contest,
+            ContestDetailResponse,
+            participants=await self.contest_repo.count_participants(contest_id),
+            is_registered=await self.contest_repo.is_registered(contest_id, self.current_user.id),
+            problems=problems,
+        )
+
+    async def get_problem_statements(self, contest_id: UUID) -> bytes:
+        """Условия задач: участникам после начала, автору — всегда."""
+        contest = await self._get_contest(contest_id)
+        if not self._can_manage(contest):
+            if contest_status(contest) == "upcoming":
+                raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Соревнование ещё не началось")
+            if not await self.contest_repo.is_registered(contest_id, self.current_user.id):
+                raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Вы не зарегистрированы на соревнование")
+
+        return await get_contest_statements(contest_id)
+
+    async def register(self, contest_id: UUID) -> dict:
+        contest = await self._get_contest(contest_id)
+        if contest_status(contest) == "finished":
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Соревнование уже завершено")
+
+        if not await self.contest_repo.register(contest_id, self.current_user.id):
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Вы уже зарегистрированы")
+        return {"message": "Вы зарегистрированы на соревнование", "contest_id": str(contest_id)}
+
+    async def get_scoreboard(self, contest_id: UUID, full: bool = False) -> Tuple[str, bytes]:
+        """Таблица результатов; без заморозки — только автору."""
+        if full:
+            await self._get_managed_contest(contest_id)
+        snapshot = await get_scoreboard_snapshot(contest_id, full)
+        if snapshot is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Соревнование не найдено")
+        return snapshot
+
+    @staticmethod
+    async def open_scoreboard_stream(contest_id: UUID) -> AsyncIterator[bytes]:
+        """
+        Поток публичной таблицы (SSE). Не использует сессию запроса:
+        соединение может жить часами, а пул БД общий.
+        """
+        if await get_scoreboard_snapshot(contest_id) is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Соревнование не найдено")
+        return scoreboard_events(contest_id)
+
+    async def replay_scoreboard(
+            self, contest_id: UUID, minute: Optional[int] = None, at: Optional[datetime] = None
+    ) -> bytes:
+        """
+        Таблица на минуте minute (по умолчанию — на момент at) с вердиктами
+        на момент at (по умолчанию — текущими, с учётом перепроверок).
+        Автору — всегда, остальным — после публикации итогов.
+        """
+        contest = await self._get_contest(contest_id)
+        if not self._can_manage(contest):
+            published = contest.freeze_at is None or contest.unfrozen
+            if contest_status(contest) != "finished" or not published:
+                raise HTTPException(
+                    status_code=status.HTTP_403_FORBIDDEN,
+                    detail="Повтор таблицы доступен после публикации итогов"
+                )
+
+        now = datetime.utcnow()
+        as_of = min(to_naive_utc(at), now) if at is not None else now
+        if minute is not None:
+            cutoff = contest.start_time + timedelta(minutes=minute)
+        else:
+            cutoff = as_of
+        cutoff = min(cutoff, contest.end_time, as_of)
+        if cutoff < contest.start_time:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Момент раньше начала соревнования")
+
+        return await ReplayService(self.db).replay(contest, cutoff, as_of)
+
+    async def rejudge(self, contest_id: UUID, submission_id: UUID) -> dict:
+        """Перепроверить попытку соревнования (автор или админ)."""
+        await self._get_managed_contest(contest_id)
+        submission_repo = SubmissionRepository(self.db)
+        submission = await submission_repo.get_submission_by_id(submission_id)
+        if submission is None or submission.contest_id != contest_id:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Попытка не найдена в этом соревновании")
+
+        previous = submission.status.value
+        submission = await SubmissionService(submission_repo, self.problem_repo).rejudge_submission(submission)
+        return {
+            "submission_id": str(submission.id),
+            "previous_status": previous,
+            "status": submission.status.value,
+        }
+
+    async def unfreeze(self, contest_id: UUID) -> dict:
+        """Опубликовать итоговую таблицу (после окончания)."""
+        contest = await self._get_managed_contest(contest_id)
+        if contest_status(contest) != "finished":
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Соревнование ещё не завершено")
+
+        await self.contest_repo.set_unfrozen(contest_id)
+        forget_scoreboard(contest_id)
+        return {"message": "Таблица результатов разморожена", "contest_id": str(contest_id)}
+
+    async def rate(self, contest_id: UUID) -> dict:
+        """Пересчитать рейтинг участников по итоговой таблице (один раз)."""
+        contest = await self._get_managed_contest(contest_id)
+        if contest_status(contest) != "finished":
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Соревнование ещё не завершено")
+
+        participants = await self.contest_repo.get_rating_participants(contest_id)
+        if len(participants) < 2:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Для пересчёта рейтинга нужно хотя бы два участника"
+            )
+
+        user_ids = [row[0] for row in participants]
+        ratings = [row[1] for row in participants]
+        scores = [row.solved * RATING_SOLVED_WEIGHT - row.penalty for row in participants]
+        return await RatingService(self.db).apply(RATING_SOURCE_CONTEST, contest_id, user_ids, ratings, scores)
@@ -3,25 +3,92 @@ from typing import List, Dict
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ..core.cache import SingleFlightCache
+from ..core.config import settings
+from ..core.events import on_verdict, on_problems_changed
+from ..core.metrics import register_cache
+from ..database import AsyncSessionLocal
+from ..models.base import SubmissionStatus
 from ..repository.problem_repository import ProblemRepository
 from ..repository.top_students_repository import TopStudentsRepository
+from ..repository.solved_problem_repository import SolvedProblemRepository
+from ..repository.activity_repository import ActivityRepository
 # from ..repository.contest_repository import ContestRepository
-from datetime import datetime
+from datetime import datetime, timedelta
+
+# Общий для всех топ студентов: ключ — limit
+top_students_cache: SingleFlightCache[List[Dict]] = register_cache("top_students", SingleFlightCache(
+    maxsize=32,
+    ttl=settings.DASHBOARD_TOP_STUDENTS_TTL_SECONDS,
+))
+# Задачи, доступные пользователю: ключ — (user_id, skip, limit)
+available_problems_cache: SingleFlightCache[List[Dict]] = register_cache("available_problems", SingleFlightCache(
+    maxsize=settings.DASHBOARD_USER_CACHE_SIZE,
+    ttl=settings.DASHBOARD_USER_CACHE_TTL_SECONDS,
+))
+
+
+@on_verdict
+def invalidate_dashboard_on_verdict(submission) -> None:
+    """ACCEPTED меняет топ и отметки «решена» в списках автора."""
+    if submission.status != SubmissionStatus.ACCEPTED:
+        return
+    top_students_cache.invalidate()
+    available_problems_cache.invalidate(lambda key: key[0] == submission.user_id)
+
+
+@on_problems_changed
+def invalidate_available_problems() -> None:
+    available_problems_cache.invalidate()
 
 
 class DashboardService:
+    """
+    Данные дашборда — первые запросы после входа, поэтому кэшируются.
 
+    Записи строятся в собственной сессии (см. SingleFlightCache): одно
+    построение может обслуживать несколько запросов.
+    """
 
     def __init__(self, db: AsyncSession):
         self.problem_repository = ProblemRepository(db)
         self.top_students_repository = TopStudentsRepository(db)
+        self.solved_problem_repository = SolvedProblemRepository(db)
+        self.activity_repository = ActivityRepository(db)
 
     async  def get_top_students(self, limit: int = 10) -> List[Dict]:
-        return await self.top_students_repository.get_top_students(limit)
+        async def build() -> List[Dict]:
+            async with AsyncSessionLocal() as session:
+                return await TopStudentsRepository(session).get_top_students(limit)
+
+        return await top_students_cache.get_or_build(limit, build)
 
 
     async def get_available_problems(self, user_id : UUID, skip: int = 0, limit: int=20) -> List[Dict]:
-        problems = await self.problem_repository.list_available_problems(user_id, skip, limit)
+        async def build() -> List[Dict]:
+            async with AsyncSessionLocal() as session:
+                return await self._load_available_problems(session, user_id, skip, limit)
+
+        return await available_problems_cache.get_or_build((user_id, skip, limit), build)
+
+    async def get_platform_activity(self, days: int = 365) -> Dict:
+        """Попытки на платформе по дням (UTC), языкам и вердиктам."""
+        today = datetime.utcnow().date()
+        since = today - timedelta(days=days - 1)
+        rows = await self.activity_repository.get_platform_activity(since)
+        return {
+            "from": since,
+            "to": today,
+            "days": [
+                {"day": row.day, "language": row.language, "status": row.status.value, "count": row.count}
+                for row in rows
+            ],
+        }
+
+    @staticmethod
+    async def _load_available_problems(session: AsyncSession, user_id: UUID, skip: int, limit: int) -> List[Dict]:
+        problems = await ProblemRepository(session).list_available_problems(user_id, skip, limit)
+        solved_ids = await SolvedProblemRepository(session).get_solved_ids(user_id, [p.id for p in problems])
 
         return [
             {
@@ -30,7 +97,8 @@ class DashboardService:
                 "slug": p.slug,
                 "difficulty": p.difficulty.value,
                 "is_public": p.is_public,
-                "author": p.author.username if p.author else None
+                "author": p.author.username if p.author else None,
+                "solved": p.id in solved_ids,
             }
             for p in problems
         ]
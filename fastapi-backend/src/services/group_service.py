@@ -5,17 +5,36 @@ from fastapi import HTTPException, status
 from typing import List
 from datetime import datetime, timezone
 
-from ..repository.group_repository import GroupRepository
+from ..core.cache import LRUCache
+from ..core.config import settings
+from ..core.events import on_verdict, publish_problems_changed
+from ..core.metrics import register_cache
+from ..repository.group_repository import GroupRepository, PROGRESS_STATUS_ORDER
 from ..repository.user_repository import UserRepository
 from ..repository.problem_repository import ProblemRepository
 
 from ..schemas.group_schemas import (
     GroupCreate, AddMemberRequest,
     CreateAssignmentRequest, AssignmentResponse,
-    StudentAssignmentDTO
+    StudentAssignmentDTO, GroupProgressResponse, ProgressAssignment,
+    ProgressCell, ProgressStudentRow
 )
 from ..models.group_models import Group, GroupAssignment
 
+# group_id -> (member_ids, GroupProgressResponse)
+group_progress_cache: LRUCache[tuple] = register_cache("group_progress", LRUCache(
+    maxsize=settings.GROUP_PROGRESS_CACHE_SIZE,
+    ttl=settings.GROUP_PROGRESS_CACHE_TTL_SECONDS,
+))
+
+
+@on_verdict
+def invalidate_member_progress(submission) -> None:
+    """Новый вердикт меняет клетки автора во всех его группах."""
+    for group_id, (member_ids, _) in group_progress_cache.items():
+        if submission.user_id in member_ids:
+            group_progress_cache.delete(group_id)
+
 
 class GroupService:
     def __init__(
@@ -63,6 +82,8 @@ class GroupService:
 
         # 4. Добавляем
         await self.group_repo.add_student(group, student)
+        group_progress_cache.delete(group_id)
+        await publish_problems_changed()
         return {"message": f"Студент {student.full_name or student.username} добавлен"}
 
     async def get_student_count(self, group_id: UUID) -> int:
@@ -92,6 +113,8 @@ class GroupService:
             deadline=deadline_naive
         )
         created = await self.group_repo.create_assignment(assignment)
+        group_progress_cache.delete(group_id)
+        await publish_problems_changed()
 
         # 4. Восстанавливаем UTC метку для ответа API
         # Чтобы фронтенд видел 'Z' или '+00:00' и понимал, что это UTC
@@ -131,6 +154,8 @@ class GroupService:
             raise HTTPException(status_code=403, detail="Нет прав удалять это назначение")
 
         await self.group_repo.delete_assignment(assignment_id)
+        group_progress_cache.delete(assignment.group_id)
+        await publish_problems_changed()
         return {"message": "Назначение отменено"}
 
     async def get_student_assignments(self, student_id: UUID) -> List[StudentAssignmentDTO]:
@@ -159,4 +184,59 @@ class GroupService:
                 deadline=deadline_aware,  # Фронт получит дату с Z
                 is_overdue=is_overdue
             ))
-        return result
\ No newline at end of file
+        return result
+
+    async def get_group_progress(self, group_id: UUID, teacher_id: UUID) -> GroupProgressResponse:
+        """Матрица «студенты × назначения» группы (кэшируется на группу)."""
+        group = await self.group_repo.get_by_id(group_id)
+        if not group or group.teacher_id != teacher_id:
+            raise HTTPException(status_code=403, detail="Нет прав на эту группу")
+
+        cached = group_progress_cache.get(group_id)
+        if cached is not None:
+            return cached[1]
+
+        rows = await self.group_repo.get_progress_rows(group_id)
+
+        assignments = {}
+        students = {}
+        cells = {}
+        for row in rows:
+            if row.user_id not in students:
+                students[row.user_id] = row
+            if row.assignment_id is None:
+                continue
+            if row.assignment_id not in assignments:
+                assignments[row.assignment_id] = ProgressAssignment(
+                    assignment_id=row.assignment_id,
+                    problem_id=row.problem_id,
+                    problem_title=row.problem_title,
+                    deadline=row.deadline.replace(tzinfo=timezone.utc),
+                )
+            cells[(row.user_id, row.assignment_id)] = ProgressCell(
+                best_status=PROGRESS_STATUS_ORDER[row.best_status].value if row.best_status is not None else None,
+                attempts=row.attempts or 0,
+                first_ac_at=row.first_ac_at.replace(tzinfo=timezone.utc) if row.first_ac_at else None,
+                is_late=bool(row.first_ac_at and row.first_ac_at > row.deadline),
+            )
+
+        # Порядок столбцов — по дедлайну, как в списках назначений
+        columns = sorted(assignments.values(), key=lambda a: (a.deadline, str(a.assignment_id)))
+        progress = GroupProgressResponse(
+            group_id=group_id,
+            assignments=columns,
+            students=[
+                ProgressStudentRow(
+                    user_id=user_id,
+                    username=row.username,
+                    full_name=row.full_name,
+                    cells=[
+                        cells.get((user_id, column.assignment_id), ProgressCell())
+                        for column in columns
+                    ],
+                )
+                for user_id, row in students.items()
+            ],
+        )
+        group_progress_cache.set(group_id, (frozenset(students), progress))
+        return progress
@@ -0,0 +1,109 @@
+# fastapi-backend/src/services/login_throttle_service.py
+"""
+Ограничение частоты входа (защита от подбора паролей).
+
+Два скользящих окна:
+- по IP — все попытки входа с адреса (лимит с запасом: класс за одним
+  NAT входит одновременно);
+- по аккаунту — неудачные попытки для email, чтобы распределённый
+  по адресам подбор не перебирал пароль одного пользователя.
+
+Проверка идёт до bcrypt: отклонённый запрос не тратит процессор на хэш.
+
+По умолчанию счётчики в памяти воркера (LOGIN_THROTTLE_BACKEND=memory):
+при N воркерах атакующий получает до N лимитов. В режиме postgres
+счётчики общие (таблица login_throttle_buckets) ценой двух коротких
+запросов на попытку; старые окна удаляет фоновая очистка.
+"""
+
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+
+from fastapi import HTTPException, status
+
+from ..core.config import settings
+from ..core.metrics import increment, register_gauge
+from ..core.rate_limit import SlidingWindowCounter, retry_after, window_estimate
+from ..database import AsyncSessionLocal
+from ..repository.login_throttle_repository import LoginThrottleRepository
+
+ip_attempts = SlidingWindowCounter(
+    settings.LOGIN_THROTTLE_IP_WINDOW_SECONDS, settings.LOGIN_THROTTLE_MAX_KEYS
+)
+account_failures = SlidingWindowCounter(
+    settings.LOGIN_THROTTLE_ACCOUNT_WINDOW_SECONDS, settings.LOGIN_THROTTLE_MAX_KEYS
+)
+
+register_gauge("login_throttle.tracked_keys", lambda: len(ip_attempts) + len(account_failures))
+
+
+def _shared() -> bool:
+    return settings.LOGIN_THROTTLE_BACKEND == "postgres"
+
+
+def _window_start(now: float, window: float) -> datetime:
+    return datetime.utcfromtimestamp(now - now % window)
+
+
+async def _peek(counter: SlidingWindowCounter, key: str, limit: int) -> Optional[int]:
+    """None — можно, иначе секунды до Retry-After."""
+    if not _shared():
+        return counter.peek(key, limit)
+
+    now = time.time()
+    window = counter.window
+    async with AsyncSessionLocal() as session:
+        current, previous = await LoginThrottleRepository(session).get_counts(
+            key, _window_start(now, window), timedelta(seconds=window)
+        )
+    elapsed = now % window
+    if window_estimate(current, previous, elapsed, window) >= limit:
+        return retry_after(current, previous, elapsed, window, limit)
+    return None
+
+
+async def _hit(counter: SlidingWindowCounter, key: str) -> None:
+    if not _shared():
+        counter.hit(key)
+        return
+
+    async with AsyncSessionLocal() as session:
+        await LoginThrottleRepository(session).hit(key, _window_start(time.time(), counter.window))
+        await session.commit()
+
+
+def _throttled(retry: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Слишком много попыток входа, повторите позже",
+        headers={"Retry-After": str(retry)},
+    )
+
+
+async def check_login_allowed(ip: Optional[str], email: str) -> None:
+    """
+    Проверяет лимиты до проверки пароля и учитывает попытку с IP.
+
+    Raises:
+        HTTPException 429: лимит по IP или аккаунту исчерпан
+    """
+    account_key = f"account:{email.strip().lower()}"
+    retry = await _peek(account_failures, account_key, settings.LOGIN_THROTTLE_ACCOUNT_LIMIT)
+    if retry is not None:
+        increment("login_throttle.account_blocked")
+        raise _throttled(retry)
+
+    if ip:
+        ip_key = f"ip:{ip}"
+        retry = await _peek(ip_attempts, ip_key, settings.LOGIN_THROTTLE_IP_LIMIT)
+        if retry is not None:
+            increment("login_throttle.ip_blocked")
+            raise _throttled(retry)
+        await _hit(ip_attempts, ip_key)
+
+
+async def record_login_failure(email: str) -> None:
+    """Учитывает неудачную попытку входа в аккаунт."""
+    increment("login_throttle.failures")
+    await _hit(account_failures, f"account:{email.strip().lower()}")
@@ -0,0 +1,97 @@
+# fastapi-backend/src/services/prewarm_service.py
+"""
+Прогрев кэшей перед стартом соревнований.
+
+В первые секунды соревнования все участники запрашивают одни и те же
+условия и отправляют решения одних и тех же задач. За
+CONTEST_PREWARM_LEAD_SECONDS до начала цикл загружает в кэши воркера
+сериализованные условия, данные для проверки (лимиты и тесты) и
+таблицу результатов. Кэши single-flight, поэтому запрос, пришедший во
+время прогрева, не запускает второй загрузки, а ждёт ту же.
+
+Кэши свои у каждого воркера, поэтому цикл работает в каждом процессе
+(без advisory-lock, в отличие от очистки).
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Dict
+from uuid import UUID
+
+from ..core.config import settings
+from ..database import AsyncSessionLocal
+from ..repository.contest_repository import ContestRepository
+from .contest_service import get_contest_statements
+from .problem_service import get_student_problem, get_judge_bundle, make_problem_etag
+from .scoreboard_service import get_scoreboard_snapshot
+
+logger = logging.getLogger(__name__)
+
+# Прогретые соревнования: contest_id -> start_time (перенос старта — повод прогреть снова)
+warmed_contests: Dict[UUID, datetime] = {}
+
+
+async def prewarm_contest(contest_id: UUID) -> int:
+    """
+    Загружает в кэши всё, что понадобится на старте соревнования.
+
+    Returns:
+        Число прогретых задач
+    """
+    async with AsyncSessionLocal() as session:
+        contest = await ContestRepository(session).get_by_id(contest_id)
+    if contest is None:
+        return 0
+
+    warmed = 0
+    for item in contest.problems:
+        problem = item.problem
+        if problem.deleted_at is not None:
+            continue
+        await get_student_problem(problem.id, make_problem_etag(problem.id, problem.revision))
+        await get_judge_bundle(problem)
+        warmed += 1
+
+    await get_contest_statements(contest_id)
+    await get_scoreboard_snapshot(contest_id)
+    return warmed
+
+
+async def prewarm_upcoming_contests() -> None:
+    """Прогревает соревнования, начинающиеся в ближайшие CONTEST_PREWARM_LEAD_SECONDS."""
+    now = datetime.utcnow()
+    lead = timedelta(seconds=settings.CONTEST_PREWARM_LEAD_SECONDS)
+
+    # Уже начавшиеся тоже берём: воркер мог перезапуститься после старта
+    async with AsyncSessionLocal() as session:
+        contests = await ContestRepository(session).get_starting_between(now - lead, now + lead)
+
+    for contest_id, start_time in contests:
+        if warmed_contests.get(contest_id) == start_time:
+            continue
+        try:
+            problems = await prewarm_contest(contest_id)
+        except Exception:
+            # Не мешаем остальным соревнованиям; повторим на следующем проходе
+            logger.exception(f"Ошибка прогрева соревнования {contest_id}")
+            continue
+        warmed_contests[contest_id] = start_time
+        logger.info(f"Прогрет кэш соревнования {contest_id}: задач {problems}")
+
+    for contest_id, start_time in list(warmed_contests.items()):
+        if start_time <= now - lead:
+            del warmed_contests[contest_id]
+
+
+async def run_prewarm_loop() -> None:
+    """Бесконечный цикл прогрева; запускается при старте приложения."""
+    while True:
+        try:
+            await prewarm_upcoming_contests()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Ошибка прогрева кэшей соревнований")
+
+        await asyncio.sleep(settings.CONTEST_PREWARM_POLL_SECONDS)
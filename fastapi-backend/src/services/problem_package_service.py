@@ -0,0 +1,347 @@
+# fastapi-backend/src/services/problem_package_service.py
+"""
+Экспорт и импорт задач tar-архивом.
+
+Формат архива (по каталогу на задачу):
+
+    <slug>/problem.json     условие, лимиты, примеры и список тестов
+    <slug>/tests/000.in     входные данные теста
+    <slug>/tests/000.out    ожидаемый вывод
+
+Архив собирается на лету: заголовки tar формируются вручную, а данные
+тестов читаются из хранилища кусками, поэтому память не зависит от
+размера тестов. Импорт принимает тот же формат.
+"""
+
+import hashlib
+import json
+import os
+import tarfile
+import tempfile
+from typing import AsyncIterator, Iterable, List, Tuple
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
+
+from ..core.config import settings
+from ..core.events import publish_problems_changed
+from ..database import AsyncSessionLocal
+from ..models.base import DifficultyLevel, CheckerType
+from ..models.problem_models import Problem, TestCase
+from .auth_service import Principal
+from ..repository.problem_repository import ProblemRepository
+
+PACKAGE_FORMAT = "online-judge-problem"
+PACKAGE_VERSION = 1
+PACKAGE_MANIFEST = "problem.json"
+
+TAR_BLOCK_SIZE = 512
+TAR_END = b"\0" * (TAR_BLOCK_SIZE * 2)
+
+
+def tar_header(name: str, size: int, mtime: float) -> bytes:
+    """Заголовок записи tar (PAX: без ограничений на длину имени и размер)."""
+    info = tarfile.TarInfo(name)
+    info.size = size
+    info.mtime = int(mtime)
+    info.mode = 0o644
+    return info.tobuf(tarfile.PAX_FORMAT, "utf-8", "surrogateescape")
+
+
+def tar_padding(size: int) -> bytes:
+    """Дополнение данных записи до границы блока tar."""
+    return b"\0" * (-size % TAR_BLOCK_SIZE)
+
+
+def test_file_names(order_index: int) -> tuple:
+    return f"tests/{order_index:03d}.in", f"tests/{order_index:03d}.out"
+
+
+class ProblemPackageService:
+    """Выгрузка задач в архив и загрузка из архива (владелец задачи или админ)."""
+
+    def __init__(self, db: AsyncSession, current_user: Principal):
+        self.db = db
+        self.current_user = current_user
+        self.problem_repo = ProblemRepository(db)
+
+    @property
+    def storage(self):
+        return self.problem_repo.storage
+
+    # === Экспорт ===
+
+    async def get_export_problem(self, problem_id: UUID) -> Problem:
+        """Проверяет, что задачу можно выгрузить."""
+        db_problem = await self.problem_repo.get_problem_by_id(problem_id)
+        if not db_problem:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Задача не найдена"
+            )
+        if db_problem.user_id != self.current_user.id and self.current_user.role != "admin":
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Вы не можете выгружать чужие задачи"
+            )
+        return db_problem
+
+    async def get_export_problem_ids(self) -> List[UUID]:
+        """Id всех задач текущего преподавателя."""
+        return await self.problem_repo.get_user_problem_ids(self.current_user.id)
+
+    async def stream_archive(self, problem_ids: Iterable[UUID]) -> AsyncIterator[bytes]:
+        """
+        Отдаёт tar-архив с задачами кусками.
+
+        Работает в собственной сессии: генератор читается уже после того,
+        как обработчик запроса вернул ответ. Задачи загружаются по одной
+        и сразу выбрасываются из identity map.
+        """
+        async with AsyncSessionLocal() as session:
+            repo = ProblemRepository(session, self.storage)
+            for problem_id in problem_ids:
+                problem = await repo.get_problem_for_export(problem_id)
+                if problem is None:
+                    continue
+                tests = await repo.get_test_cases(problem_id)
+                async for chunk in self._stream_problem(problem, tests):
+                    yield chunk
+                session.expunge_all()
+        yield TAR_END
+
+    async def _stream_problem(self, problem: Problem, tests: List[TestCase]) -> AsyncIterator[bytes]:
+        root = problem.slug or str(problem.id)
+        mtime = problem.created_at.timestamp() if problem.created_at else 0
+        limits = problem.current_test_set or problem
+
+        tests_meta = []
+        for test in tests:
+            input_name, output_name = test_file_names(test.order_index)
+            tests_meta.append({
+                "order_index": test.order_index,
+                "is_sample": bool(test.is_sample),
+                "input": input_name,
+                "output": output_name,
+                **self._digests(test),
+            })
+
+        manifest = json.dumps({
+            "format": PACKAGE_FORMAT,
+            "version": PACKAGE_VERSION,
+            "problem": {
+                "title": problem.title,
+                "slug": problem.slug,
+                "description": problem.description,
+                "difficulty": DifficultyLevel(problem.difficulty).value,
+                "checker_type": CheckerType(limits.checker_type).value,
+                "is_public": bool(problem.is_public),
+                "time_limit": limits.time_limit,
+                "memory_limit": limits.memory_limit,
+            },
+            "examples": [
+                {
+                    "input_data": example.input_data,
+                    "output_data": example.output_data,
+                    "explanation": example.explanation,
+                }
+                for example in problem.examples
+            ],
+            "tests": tests_meta,
+        }, ensure_ascii=False, indent=2).encode("utf-8")
+
+        yield tar_header(f"{root}/{PACKAGE_MANIFEST}", len(manifest), mtime)
+        yield manifest
+        yield tar_padding(len(manifest))
+
+        for test, meta in zip(tests, tests_meta):
+            for kind in ("input", "output"):
+                size = meta[f"{kind}_size"]
+                yield tar_header(f"{root}/{meta[kind]}", size, mtime)
+                async for chunk in self._iter_test_data(test, kind):
+                    yield chunk
+                yield tar_padding(size)
+
+    def _digests(self, test: TestCase) -> dict:
+        if test.is_file_backed:
+            return {
+                "input_sha256": test.input_sha256,
+                "input_size": self.storage.size_of(test.input_sha256),
+                "output_sha256": test.output_sha256,
+                "output_size": self.storage.size_of(test.output_sha256),
+            }
+        # Тест из старых колонок (до переноса в хранилище)
+        digests = {}
+        for kind in ("input", "output"):
+            data = (getattr(test, f"{kind}_data") or "").encode("utf-8")
+            digests[f"{kind}_sha256"] = hashlib.sha256(data).hexdigest()
+            digests[f"{kind}_size"] = len(data)
+        return digests
+
+    async def _iter_test_data(self, test: TestCase, kind: str) -> AsyncIterator[bytes]:
+        if not test.is_file_backed:
+            yield (getattr(test, f"{kind}_data") or "").encode("utf-8")
+            return
+        async for chunk in iterate_in_threadpool(self.storage.iter_range(getattr(test, f"{kind}_sha256"))):
+            yield chunk
+
+    # === Импорт ===
+
+    async def import_archive(self, body: AsyncIterator[bytes]) -> List[dict]:
+        """
+        Создаёт задачи из архива, полученного потоком в теле запроса.
+
+        Тело сначала пишется во временный файл (tar читается с произвольным
+        доступом), данные тестов копируются в хранилище без загрузки в память.
+        Запись, разбор tar и копирование идут в пуле потоков.
+
+        Импорт атомарный: сначала проверяются все манифесты и сохраняются
+        все файлы тестов, затем задачи создаются одной транзакцией. При
+        ошибке не создаётся ни одной задачи (уже сохранённые файлы без
+        ссылок удалит сборка мусора хранилища). Занятый slug получает суффикс.
+
+        Raises:
+            HTTPException 400: архив некорректен
+            HTTPException 413: архив больше PROBLEM_PACKAGE_MAX_BYTES
+        """
+        fd, path = tempfile.mkstemp(dir=self.storage.tmp_dir, suffix=".tar")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                received = 0
+                async for chunk in body:
+                    received += len(chunk)
+                    if received > settings.PROBLEM_PACKAGE_MAX_BYTES:
+                        raise HTTPException(
+                            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                            detail=f"Архив больше {settings.PROBLEM_PACKAGE_MAX_BYTES} байт"
+                        )
+                    await run_in_threadpool(f.write, chunk)
+
+            packages = await run_in_threadpool(self._read_archive, path)
+        finally:
+            if os.path.exists(path):
+                os.unlink(path)
+
+        imported = []
+        try:
+            for problem_data, examples_data, tests_data in packages:
+                problem_data["slug"] = await self._free_slug(problem_data["slug"])
+                problem_data["user_id"] = self.current_user.id
+                db_problem = await self.problem_repo.create_problem(
+                    problem_data, examples_data, tests_data, tests_stored=True, commit=False
+                )
+                imported.append({
+                    "problem_id": str(db_problem.id),
+                    "slug": db_problem.slug,
+                    "title": db_problem.title,
+                    "tests": len(tests_data),
+                })
+            await self.db.commit()
+        except Exception:
+            await self.db.rollback()
+            raise
+
+        await publish_problems_changed()
+        return imported
+
+    @staticmethod
+    def _bad_archive(reason: str) -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Некорректный архив: {reason}"
+        )
+
+    def _read_archive(self, path: str) -> List[Tuple[dict, List[dict], List[dict]]]:
+        """
+        Разбирает все манифесты архива и сохраняет файлы тестов в хранилище.
+        Синхронный — вызывается в пуле потоков.
+        """
+        try:
+            tar = tarfile.open(path, "r:*")
+        except tarfile.TarError:
+            raise self._bad_archive("файл не является tar-архивом")
+
+        with tar:
+            manifests = [
+                member for member in tar.getmembers()
+                if member.isfile() and os.path.basename(member.name) == PACKAGE_MANIFEST
+            ]
+            if not manifests:
+                raise self._bad_archive(f"не найдено ни одного {PACKAGE_MANIFEST}")
+
+            packages = [self._read_manifest(tar, manifest) for manifest in manifests]
+            return [
+                (problem_data, examples_data, self._store_tests(tar, manifest, tests))
+                for manifest, (problem_data, examples_data, tests) in zip(manifests, packages)
+            ]
+
+    def _read_manifest(
+            self, tar: tarfile.TarFile, manifest_member: tarfile.TarInfo
+    ) -> Tuple[dict, List[dict], List[dict]]:
+        """Проверяет problem.json и возвращает (задача, примеры, описания тестов)."""
+        try:
+            package = json.load(tar.extractfile(manifest_member))
+            if package.get("format") != PACKAGE_FORMAT or package.get("version") != PACKAGE_VERSION:
+                raise self._bad_archive(f"{manifest_member.name}: неподдерживаемый формат")
+            meta = package["problem"]
+            problem_data = {
+                "title": meta["title"],
+                "slug": meta["slug"],
+                "description": meta["description"],
+                "difficulty": DifficultyLevel(meta["difficulty"]),
+                "checker_type": CheckerType(meta["checker_type"]),
+                "is_public": bool(meta["is_public"]),
+                "time_limit": int(meta["time_limit"]),
+                "memory_limit": int(meta["memory_limit"]),
+            }
+            examples_data = [
+                {
+                    "input_data": example["input_data"],
+                    "output_data": example["output_data"],
+                    "explanation": example.get("explanation"),
+                }
+                for example in package["examples"]
+            ]
+            tests = sorted(package["tests"], key=lambda test: test["order_index"])
+        except HTTPException:
+            raise
+        except (KeyError, TypeError, ValueError) as e:
+            raise self._bad_archive(f"{manifest_member.name}: {e}")
+
+        if not tests:
+            raise self._bad_archive(f"{manifest_member.name}: задача без тестов")
+        return problem_data, examples_data, tests
+
+    def _store_tests(self, tar: tarfile.TarFile, manifest_member: tarfile.TarInfo, tests: List[dict]) -> List[dict]:
+        root = os.path.dirname(manifest_member.name)
+        tests_data = []
+        for test in tests:
+            stored = {"is_sample": bool(test.get("is_sample"))}
+            for kind in ("input", "output"):
+                stored.update(self._store_member(tar, root, test, kind))
+            tests_data.append(stored)
+        return tests_data
+
+    def _store_member(self, tar: tarfile.TarFile, root: str, test: dict, kind: str) -> dict:
+        name = f"{root}/{test.get(kind)}" if root else str(test.get(kind))
+        try:
+            member = tar.getmember(name)
+        except KeyError:
+            raise self._bad_archive(f"нет файла {name}")
+        if not member.isfile():
+            raise self._bad_archive(f"{name} не является файлом")
+
+        try:
+            blob = self.storage.put_stream(tar.extractfile(member), test.get(f"{kind}_sha256"))
+        except ValueError as e:
+            raise self._bad_archive(f"{name}: {e}")
+        return {f"{kind}_sha256": blob.sha256, f"{kind}_size": blob.size}
+
+    async def _free_slug(self, slug: str) -> str:
+        candidate, suffix = slug, 1
+        while await self.problem_repo.check_slug_exists(candidate):
+            suffix += 1
+            candidate = f"{slug}-{suffix}"
+        return candidate
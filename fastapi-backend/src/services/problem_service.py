@@ -2,13 +2,56 @@
 
 import re
 import uuid
-from typing import List, Optional
+from typing import List, NamedTuple, Optional, Tuple
 
-from ..schemas.schemas import ProblemCreate, ProblemUpdate
+from ..core.cache import SingleFlightCache
+from ..core.config import settings
+from ..core.events import publish_problems_changed
+from ..core.metrics import register_cache
+from ..database import AsyncSessionLocal
+from ..schemas.schemas import (
+    ProblemCreate, ProblemUpdate, StudentProblemResponse, SampleTestResponse, StudentProblemListItem,
+    ExecutionTestInput
+)
 from ..models.problem_models import Problem
 from ..models.base import DifficultyLevel
 from ..repository.problem_repository import ProblemRepository
 from ..repository.submission_repository import SubmissionRepository
+from ..repository.solved_problem_repository import SolvedProblemRepository
+
+
+class JudgeBundle(NamedTuple):
+    """Лимиты и тесты версии задачи в виде, готовом для проверяющего сервиса."""
+    time_limit: int
+    memory_limit: int
+    checker_type: str
+    test_cases: List[dict]
+
+
+# Сериализованные условия задач для студентов: ключ ETag (problem_id + revision) -> (ETag, JSON bytes).
+# Промах по горячему ключу (старт соревнования) строит ответ одним запросом к БД
+problem_response_cache: SingleFlightCache[Optional[Tuple[str, bytes]]] = register_cache(
+    "problem_responses", SingleFlightCache(maxsize=512)
+)
+
+# Данные для проверки по неизменяемой версии тестов: test_set_id -> JudgeBundle.
+# Версия не меняется, поэтому сброс не нужен — только вытеснение по размеру
+judge_bundle_cache: SingleFlightCache[Optional[JudgeBundle]] = register_cache("judge_bundles", SingleFlightCache(
+    maxsize=settings.JUDGE_BUNDLE_CACHE_SIZE
+))
+
+
+def make_problem_etag(problem_id: uuid.UUID, revision: int) -> str:
+    """Сильный ETag по номеру ревизии задачи."""
+    return f'"{problem_id}-{revision}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Проверяет заголовок If-None-Match (список ETag'ов или *)."""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
 
 
 def generate_slug(title: str) -> str:
@@ -23,6 +66,90 @@ def generate_slug(title: str) -> str:
     return slug
 
 
+async def build_student_view(problem_repo: ProblemRepository, problem: Problem) -> StudentProblemResponse:
+    """Собирает условие для студента; в ответ попадают только открытые тесты."""
+    view = StudentProblemResponse.model_validate(problem, from_attributes=True)
+    sample_tests = []
+    for test in problem.test_cases:
+        if not test.is_sample:
+            continue
+        input_data, output_data = await problem_repo.read_test_data(test)
+        sample_tests.append(SampleTestResponse(
+            id=test.id,
+            order_index=test.order_index,
+            input_data=input_data,
+            output_data=output_data,
+        ))
+    view.sample_tests = sample_tests
+    return view
+
+
+async def _render_student_problem(problem_id: uuid.UUID) -> Optional[Tuple[str, bytes]]:
+    # Своя сессия: построение может пережить запрос, который его начал
+    async with AsyncSessionLocal() as session:
+        problem_repo = ProblemRepository(session)
+        problem = await problem_repo.get_problem_for_statement(problem_id)
+        if not problem:
+            return None
+        # Ревизия могла вырасти после проверки доступа — ETag по загруженной
+        body = (await build_student_view(problem_repo, problem)).model_dump_json().encode("utf-8")
+        return make_problem_etag(problem.id, problem.revision), body
+
+
+async def get_student_problem(problem_id: uuid.UUID, etag: str) -> Optional[Tuple[str, bytes]]:
+    """
+    (ETag, JSON) условия задачи по ETag из make_problem_etag.
+    Доступ должен быть проверен вызывающим.
+    """
+    return await problem_response_cache.get_or_build(etag, lambda: _render_student_problem(problem_id))
+
+
+async def _judge_test_cases(problem_repo: ProblemRepository, tests) -> List[dict]:
+    test_cases = []
+    for test in tests:
+        input_data, expected_output = await problem_repo.read_test_data(test)
+        test_cases.append(ExecutionTestInput(
+            id=str(test.id),
+            input_data=input_data,
+            expected_output=expected_output,
+        ).model_dump())
+    return test_cases
+
+
+async def _load_judge_bundle(test_set_id: uuid.UUID) -> Optional[JudgeBundle]:
+    async with AsyncSessionLocal() as session:
+        problem_repo = ProblemRepository(session)
+        test_set = await problem_repo.get_test_set_with_tests(test_set_id)
+        if test_set is None:
+            return None
+
+        test_cases = await _judge_test_cases(problem_repo, test_set.test_cases)
+        return JudgeBundle(test_set.time_limit, test_set.memory_limit, test_set.checker_type.value, test_cases)
+
+
+async def _load_legacy_judge_bundle(problem: Problem) -> JudgeBundle:
+    # Задача, созданная до версионирования (scripts/backfill_test_sets.py
+    # ещё не запускался): тесты без версии, лимиты из самой задачи
+    async with AsyncSessionLocal() as session:
+        problem_repo = ProblemRepository(session)
+        tests = await problem_repo.get_test_cases(problem.id)
+        test_cases = await _judge_test_cases(problem_repo, tests)
+    return JudgeBundle(problem.time_limit, problem.memory_limit, problem.checker_type.value, test_cases)
+
+
+async def get_judge_bundle(problem: Problem) -> Optional[JudgeBundle]:
+    """
+    Лимиты и тесты текущей версии задачи (из кэша по test_set_id).
+    Пустой список тестов означает, что проверять не на чем: вызывающий
+    должен отклонить попытку, а не отправлять её на проверку.
+    """
+    if problem.current_test_set_id is None:
+        # Без кэша: такие задачи редки, а тесты без версии не неизменяемы
+        return await _load_legacy_judge_bundle(problem)
+    test_set_id = problem.current_test_set_id
+    return await judge_bundle_cache.get_or_build(test_set_id, lambda: _load_judge_bundle(test_set_id))
+
+
 class ProblemService:
 
     def __init__(self, problem_repo: ProblemRepository, submission_repo: SubmissionRepository):
@@ -63,20 +190,38 @@ class ProblemService:
         examples_data = [ex.dict() for ex in problem_data.examples]
         test_cases_data = [test.dict() for test in problem_data.test_cases]
 
-        return await self.problem_repo.create_problem(problem_dict, examples_data, test_cases_data)
+        db_problem = await self.problem_repo.create_problem(problem_dict, examples_data, test_cases_data)
+        await publish_problems_changed()
+        return db_problem
 
     async def list_public_problems(self) -> List[Problem]:
         """Получает список всех опубликованных задач."""
         return await self.problem_repo.list_public_problems()
 
 
+    async def list_problems_for_student(self, user_id: uuid.UUID) -> List[StudentProblemListItem]:
+        """Каталог опубликованных задач с отметками о решённых (один индексный запрос)."""
+        problems = await self.problem_repo.list_public_problems()
+        solved_ids = await SolvedProblemRepository(self.problem_repo.db).get_solved_ids(
+            user_id, [p.id for p in problems]
+        )
+        return [
+            StudentProblemListItem(
+                id=p.id, title=p.title, slug=p.slug, difficulty=p.difficulty,
+                is_public=p.is_public, solved=p.id in solved_ids,
+            )
+            for p in problems
+        ]
+
     async  def get_problem_by_ids(self, problem_id: uuid.UUID) -> Optional[Problem]:
 
         return await self.problem_repo.get_problem_by_id(problem_id)
 
     async def update_problem(self, problem_id: uuid.UUID, problem_data: ProblemUpdate) -> Optional[Problem]:
         data = problem_data.dict(exclude_unset=True)
-        return await self.problem_repo.update_problem(problem_id, data)
+        db_problem = await self.problem_repo.update_problem(problem_id, data)
+        await publish_problems_changed()
+        return db_problem
 
     async def get_problem_details_for_student(self, problem_id: str, user_id: uuid.UUID) -> Problem:
         """Получение деталей задачи для студента."""
@@ -89,6 +234,38 @@ class ProblemService:
         problem = await self.problem_repo.get_problem_by_id_for_student(p_uuid, user_id)
         return problem
 
+    async def get_problem_etag_for_student(self, problem_id: str, user_id: uuid.UUID) -> Optional[str]:
+        """
+        ETag задачи для студента без загрузки условия и тестов.
+        None — задачи нет или к ней нет доступа.
+        """
+        try:
+            p_uuid = uuid.UUID(problem_id)
+        except ValueError:
+            return None
+
+        revision = await self.problem_repo.get_problem_revision_for_student(p_uuid, user_id)
+        if revision is None:
+            return None
+        return make_problem_etag(p_uuid, revision)
+
+    async def render_problem_for_student(
+            self, problem_id: str, user_id: uuid.UUID, etag: Optional[str] = None
+    ) -> Optional[Tuple[str, bytes]]:
+        """
+        Возвращает (ETag, сериализованный JSON) задачи для студента.
+        Ответ кэшируется на ревизию задачи и общий для всех пользователей:
+        доступ проверяется до обращения к кэшу (если etag уже получен
+        через get_problem_etag_for_student, проверка не повторяется).
+        Параллельные промахи по одному ETag ждут одно построение.
+        """
+        if etag is None:
+            etag = await self.get_problem_etag_for_student(problem_id, user_id)
+        if etag is None:
+            return None
+
+        return await get_student_problem(uuid.UUID(problem_id), etag)
+
     # async def get_problem_by_id(self, problem_id) -> Optional[Problem]: ...
     # async def update_problem(self, problem_id, data) -> Optional[Problem]: ...
     # async def get_problem_statistics(self, problem_id) -> dict:
@@ -0,0 +1,273 @@
+# fastapi-backend/src/services/purge_service.py
+"""
+Фоновая очистка мягко удалённых задач и пользователей.
+
+Удаление задачи или пользователя только выставляет deleted_at — запись
+сразу пропадает из выборок. Зависимые строки (попытки, тесты, группы)
+удаляет этот модуль пачками по PURGE_BATCH_SIZE строк, коммитя каждую
+пачку отдельно и делая паузу PURGE_PAUSE_SECONDS между пачками, чтобы
+не держать долгих блокировок и не забивать WAL.
+
+Одновременно работает только один воркер: цикл берёт advisory-lock
+Postgres, остальные процессы uvicorn пропускают свой проход.
+"""
+
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from sqlalchemy import Table, String, delete, select, update, func, text, tuple_, cast, literal
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from ..core.config import settings
+from ..database import engine
+from ..models.access_models import ProblemAccess, ACCESS_SOURCE_GROUP_PREFIX
+from ..models.contest_models import ContestProblem, ContestParticipant, ContestReplaySnapshot
+from ..models.group_models import Group, GroupAssignment, group_members
+from ..models.problem_models import Problem, ProblemTestSet, TestCase, Example
+from ..models.rating_models import RatingHistory
+from ..models.stats_models import ProblemStats, UserScore, UserSolvedProblem, UserDailyActivity
+from ..models.submission_models import Submission, SubmissionEvent
+from ..models.throttle_models import LoginThrottleBucket
+from ..models.token_models import RefreshToken, RevokedToken
+from ..models.user_models import User
+
+logger = logging.getLogger(__name__)
+
+# Ключ pg_advisory_lock для цикла очистки
+PURGE_LOCK_KEY = 0x70757267
+
+# Прогресс очистки текущего процесса (отдаётся в /api/admin/purge/status)
+purge_status: Dict[str, Any] = {
+    "running": False,
+    "current": None,
+    "last_started_at": None,
+    "last_finished_at": None,
+    "last_error": None,
+    "purged_problems": 0,
+    "purged_users": 0,
+    "deleted_rows": {},
+}
+
+
+class PurgeService:
+    """Пакетное удаление зависимых строк мягко удалённых сущностей."""
+
+    def __init__(
+            self,
+            conn: AsyncConnection,
+            batch_size: Optional[int] = None,
+            pause_seconds: Optional[float] = None,
+    ):
+        self.conn = conn
+        self.batch_size = batch_size or settings.PURGE_BATCH_SIZE
+        self.pause_seconds = settings.PURGE_PAUSE_SECONDS if pause_seconds is None else pause_seconds
+
+    async def _delete_batched(self, table: Table, *criteria) -> int:
+        """Удаляет строки таблицы пачками, коммитя каждую пачку."""
+        pk = list(table.primary_key.columns)
+        key = pk[0] if len(pk) == 1 else tuple_(*pk)
+        total = 0
+
+        while True:
+            batch = select(*pk).where(*criteria).limit(self.batch_size)
+            result = await self.conn.execute(delete(table).where(key.in_(batch)))
+            await self.conn.commit()
+
+            total += result.rowcount
+            counters = purge_status["deleted_rows"]
+            counters[table.name] = counters.get(table.name, 0) + result.rowcount
+
+            if result.rowcount < self.batch_size:
+                return total
+            await asyncio.sleep(self.pause_seconds)
+
+    async def _delete_solved_batched(self, problem_id: uuid.UUID) -> int:
+        """
+        Удаляет решения задачи пачками и в том же запросе уменьшает
+        user_scores.solved_count решивших её пользователей, чтобы
+        лидерборд не расходился с user_solved_problems.
+        """
+        total = 0
+        while True:
+            batch = (
+                select(UserSolvedProblem.user_id)
+                .where(UserSolvedProblem.problem_id == problem_id)
+                .limit(self.batch_size)
+            )
+            deleted = (
+                delete(UserSolvedProblem)
+                .where(UserSolvedProblem.problem_id == problem_id, UserSolvedProblem.user_id.in_(batch))
+                .returning(UserSolvedProblem.user_id)
+                .cte("deleted")
+            )
+            per_user = (
+                select(deleted.c.user_id, func.count().label("solved"))
+                .group_by(deleted.c.user_id)
+                .cte("per_user")
+            )
+            decrement = (
+                update(UserScore)
+                .where(UserScore.user_id == per_user.c.user_id)
+                .values(solved_count=func.greatest(UserScore.solved_count - per_user.c.solved, 0))
+                .cte("decrement")
+            )
+            count = await self.conn.scalar(select(func.count()).select_from(deleted).add_cte(decrement))
+            await self.conn.commit()
+
+            total += count
+            counters = purge_status["deleted_rows"]
+            table_name = UserSolvedProblem.__tablename__
+            counters[table_name] = counters.get(table_name, 0) + count
+
+            if count < self.batch_size:
+                return total
+            await asyncio.sleep(self.pause_seconds)
+
+    async def purge_problem(self, problem_id: uuid.UUID) -> None:
+        """Удаляет задачу и всё, что на неё ссылается."""
+        purge_status["current"] = {"type": "problem", "id": str(problem_id)}
+
+        await self._delete_batched(Submission.__table__, Submission.problem_id == problem_id)
+        await self._delete_batched(ProblemStats.__table__, ProblemStats.problem_id == problem_id)
+        await self._delete_batched(GroupAssignment.__table__, GroupAssignment.problem_id == problem_id)
+        await self._delete_batched(ProblemAccess.__table__, ProblemAccess.problem_id == problem_id)
+        await self._delete_solved_batched(problem_id)
+        await self._delete_batched(SubmissionEvent.__table__, SubmissionEvent.problem_id == problem_id)
+        # Снимки свёртки журнала содержат попытки по задаче — соберутся заново
+        await self._delete_batched(
+            ContestReplaySnapshot.__table__,
+            ContestReplaySnapshot.contest_id.in_(
+                select(ContestProblem.contest_id).where(ContestProblem.problem_id == problem_id)
+            ),
+        )
+        await self._delete_batched(ContestProblem.__table__, ContestProblem.problem_id == problem_id)
+
+        await self.conn.execute(
+            update(Problem).where(Problem.id == problem_id).values(current_test_set_id=None)
+        )
+        await self.conn.commit()
+
+        await self._delete_batched(TestCase.__table__, TestCase.problem_id == problem_id)
+        await self._delete_batched(ProblemTestSet.__table__, ProblemTestSet.problem_id == problem_id)
+        await self._delete_batched(Example.__table__, Example.problem_id == problem_id)
+        await self._delete_batched(Problem.__table__, Problem.id == problem_id)
+
+        purge_status["purged_problems"] += 1
+
+    async def purge_user(self, user_id: uuid.UUID) -> None:
+        """
+        Удаляет пользователя, его задачи, попытки и группы.
+
+        Статистика чужих задач, которые решал пользователь, не уменьшается —
+        при необходимости её пересчитывает scripts/rebuild_problem_stats.py
+        (а лидерборд — scripts/rebuild_user_scores.py).
+        """
+        await self.conn.execute(
+            update(Problem)
+            .where(Problem.user_id == user_id, Problem.deleted_at.is_(None))
+            .values(deleted_at=datetime.utcnow())
+        )
+        await self.conn.commit()
+
+        authored = await self.conn.execute(select(Problem.id).where(Problem.user_id == user_id))
+        for problem_id in authored.scalars().all():
+            await self.purge_problem(problem_id)
+
+        purge_status["current"] = {"type": "user", "id": str(user_id)}
+
+        await self._delete_batched(Submission.__table__, Submission.user_id == user_id)
+        await self._delete_batched(UserSolvedProblem.__table__, UserSolvedProblem.user_id == user_id)
+        await self._delete_batched(RatingHistory.__table__, RatingHistory.user_id == user_id)
+        await self._delete_batched(UserDailyActivity.__table__, UserDailyActivity.user_id == user_id)
+        await self._delete_batched(SubmissionEvent.__table__, SubmissionEvent.user_id == user_id)
+        await self._delete_batched(
+            ContestReplaySnapshot.__table__,
+            ContestReplaySnapshot.contest_id.in_(
+                select(ContestParticipant.contest_id).where(ContestParticipant.user_id == user_id)
+            ),
+        )
+        await self._delete_batched(ContestParticipant.__table__, ContestParticipant.user_id == user_id)
+        await self._delete_batched(RefreshToken.__table__, RefreshToken.user_id == user_id)
+        await self._delete_batched(RevokedToken.__table__, RevokedToken.user_id == user_id)
+
+        teacher_groups = select(Group.id).where(Group.teacher_id == user_id)
+        teacher_group_sources = select(
+            literal(ACCESS_SOURCE_GROUP_PREFIX) + cast(Group.id, String)
+        ).where(Group.teacher_id == user_id)
+        await self._delete_batched(ProblemAccess.__table__, ProblemAccess.source.in_(teacher_group_sources))
+        await self._delete_batched(ProblemAccess.__table__, ProblemAccess.user_id == user_id)
+        await self._delete_batched(GroupAssignment.__table__, GroupAssignment.group_id.in_(teacher_groups))
+        await self._delete_batched(group_members, group_members.c.group_id.in_(teacher_groups))
+        await self._delete_batched(Group.__table__, Group.teacher_id == user_id)
+        await self._delete_batched(group_members, group_members.c.user_id == user_id)
+
+        await self._delete_batched(User.__table__, User.id == user_id)
+
+        purge_status["purged_users"] += 1
+
+    async def run_once(self) -> bool:
+        """
+        Один проход очистки по всем мягко удалённым записям.
+
+        Returns:
+            False, если advisory-lock держит другой процесс
+        """
+        locked = await self.conn.scalar(select(func.pg_try_advisory_lock(PURGE_LOCK_KEY)))
+        await self.conn.commit()
+        if not locked:
+            return False
+
+        purge_status.update(running=True, last_started_at=datetime.utcnow(), last_error=None)
+        try:
+            users = await self.conn.execute(select(User.id).where(User.deleted_at.isnot(None)))
+            for user_id in users.scalars().all():
+                await self.purge_user(user_id)
+
+            problems = await self.conn.execute(select(Problem.id).where(Problem.deleted_at.isnot(None)))
+            for problem_id in problems.scalars().all():
+                await self.purge_problem(problem_id)
+
+            # Истёкшие refresh токены (вместе с заменёнными — они нужны
+            # для обнаружения повторного использования только до истечения)
+            await self._delete_batched(RefreshToken.__table__, RefreshToken.expires_at < datetime.utcnow())
+            # Истёкшие access токены отклоняются по exp, запись об отзыве не нужна
+            await self._delete_batched(RevokedToken.__table__, RevokedToken.expires_at < datetime.utcnow())
+            # Окна входа старше двух длин окна уже не участвуют в оценке
+            stale_window = timedelta(seconds=2 * max(
+                settings.LOGIN_THROTTLE_IP_WINDOW_SECONDS, settings.LOGIN_THROTTLE_ACCOUNT_WINDOW_SECONDS
+            ))
+            await self._delete_batched(
+                LoginThrottleBucket.__table__, LoginThrottleBucket.window_start < datetime.utcnow() - stale_window
+            )
+        finally:
+            purge_status.update(running=False, current=None, last_finished_at=datetime.utcnow())
+            await self.conn.rollback()
+            await self.conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": PURGE_LOCK_KEY})
+            await self.conn.commit()
+
+        return True
+
+
+async def get_pending_counts(conn: AsyncConnection) -> Dict[str, int]:
+    """Сколько мягко удалённых записей ждут очистки."""
+    problems = await conn.scalar(select(func.count()).where(Problem.deleted_at.isnot(None)))
+    users = await conn.scalar(select(func.count()).where(User.deleted_at.isnot(None)))
+    return {"problems": problems or 0, "users": users or 0}
+
+
+async def run_purge_loop() -> None:
+    """Бесконечный цикл очистки; запускается при старте приложения."""
+    while True:
+        try:
+            async with engine.connect() as conn:
+                await PurgeService(conn).run_once()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            purge_status["last_error"] = str(e)
+            logger.exception("Ошибка фоновой очистки")
+
+        await asyncio.sleep(settings.PURGE_INTERVAL_SECONDS)
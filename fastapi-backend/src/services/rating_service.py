@@ -0,0 +1,125 @@
+# fastapi-backend/src/services/rating_service.py
+"""
+Рейтинговые пересчёты.
+
+Места считаются по результатам события, новые рейтинги — одним
+векторным проходом (core.rating), а запись в БД — тремя запросами
+на всех участников сразу (RatingRepository.apply_changes).
+"""
+
+from datetime import datetime
+from typing import Sequence
+from uuid import UUID
+
+import numpy as np
+from fastapi import HTTPException, status
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from ..core.rating import compute_rating_changes
+from ..models.rating_models import RATING_SOURCE_ASSIGNMENT
+from ..repository.group_repository import GroupRepository
+from ..repository.rating_repository import RatingRepository
+from .dashboard_service import top_students_cache
+
+
+def assignment_scores(first_ac_at: Sequence, attempts: Sequence) -> np.ndarray:
+    """
+    Результаты участников назначения (больше — лучше).
+
+    Порядок: решившие до дедлайна выше нерешивших, среди решивших —
+    раньше сдавший, затем меньше неудачных попыток. Равные по всем
+    ключам получают равный результат; все нерешившие делят последнее место.
+    """
+    unsolved = np.array([ts is None for ts in first_ac_at])
+    solved_at = np.array([ts.timestamp() if ts is not None else 0.0 for ts in first_ac_at])
+    attempts = np.where(unsolved, 0, np.array([a or 0 for a in attempts]))
+
+    order = np.lexsort((attempts, solved_at, unsolved))
+    changed = np.ones(len(order), dtype=bool)
+    changed[1:] = (
+        (np.diff(unsolved[order]) != 0)
+        | (np.diff(solved_at[order]) != 0)
+        | (np.diff(attempts[order]) != 0)
+    )
+    scores = np.empty(len(order), dtype=np.int64)
+    scores[order] = -np.cumsum(changed)
+    return scores
+
+
+class RatingService:
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.rating_repo = RatingRepository(db)
+        self.group_repo = GroupRepository(db)
+
+    async def rate_assignment(self, assignment_id: UUID, teacher_id: UUID) -> dict:
+        """Пересчитать рейтинг участников назначения после дедлайна."""
+        assignment = await self.group_repo.get_assignment_by_id(assignment_id)
+        if not assignment:
+            raise HTTPException(status_code=404, detail="Назначение не найдено")
+
+        if assignment.group.teacher_id != teacher_id:
+            raise HTTPException(status_code=403, detail="Нет прав пересчитывать рейтинг по этому назначению")
+
+        if assignment.deadline > datetime.utcnow():
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Рейтинг пересчитывается только после дедлайна"
+            )
+
+        participants = await self.rating_repo.get_assignment_participants(assignment)
+        if len(participants) < 2:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Для пересчёта рейтинга нужно хотя бы два участника"
+            )
+
+        user_ids, ratings, first_ac_at, attempts = zip(*participants)
+        scores = assignment_scores(first_ac_at, attempts)
+        return await self.apply(RATING_SOURCE_ASSIGNMENT, assignment_id, user_ids, ratings, scores)
+
+    async def apply(
+            self,
+            source_type: str,
+            source_id: UUID,
+            user_ids: Sequence[UUID],
+            ratings: Sequence[int],
+            scores,
+    ) -> dict:
+        """
+        Пересчитывает и сохраняет рейтинги участников события.
+        Каждое событие учитывается один раз.
+        """
+        if await self.rating_repo.is_rated(source_type, source_id):
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Рейтинг по этому событию уже пересчитан"
+            )
+
+        # Расчёт на десятках тысяч участников — десятки миллисекунд CPU, не в event loop
+        changes = await run_in_threadpool(compute_rating_changes, ratings, scores)
+
+        try:
+            updated = await self.rating_repo.apply_changes(
+                source_type, source_id, user_ids, ratings, changes.new_ratings, changes.ranks
+            )
+            await self.db.commit()
+        except IntegrityError:
+            # Параллельный пересчёт того же события успел раньше
+            await self.db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Рейтинг по этому событию уже пересчитан"
+            )
+
+        top_students_cache.invalidate()
+        return {
+            "source_type": source_type,
+            "source_id": str(source_id),
+            "participants": updated,
+            "max_gain": int(changes.deltas.max()),
+            "max_loss": int(changes.deltas.min()),
+        }
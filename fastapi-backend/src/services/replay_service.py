@@ -0,0 +1,91 @@
+# fastapi-backend/src/services/replay_service.py
+"""
+Восстановление таблицы результатов соревнования из журнала попыток.
+
+Свёртка журнала (submission_events) — последний известный вердикт каждой
+попытки. Таблица «на минуте X» строится по попыткам, отправленным до
+start_time + X, с вердиктами на момент as_of: по умолчанию текущими
+(учитывают перепроверки), либо такими, какими они были в прошлом.
+
+Чтобы не читать журнал с начала, свёртка периодически сохраняется
+в contest_replay_snapshots (раз в CONTEST_REPLAY_SNAPSHOT_EVENTS событий):
+восстановление начинается с ближайшего снимка не позже as_of.
+"""
+
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.config import settings
+from ..core.scoreboard import contest_minute, results_from_attempts
+from ..models.contest_models import Contest
+from ..repository.contest_repository import ContestRepository
+from ..repository.submission_event_repository import SubmissionEventRepository
+from .scoreboard_service import build_scoreboard, encode_scoreboard
+
+
+class ReplayService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.event_repo = SubmissionEventRepository(db)
+        self.contest_repo = ContestRepository(db)
+
+    async def fold_events(self, contest: Contest, as_of: datetime) -> Dict[str, List]:
+        """
+        Свёртка журнала соревнования на момент as_of:
+        {submission_id: [user_id, problem_id, submitted_at (ISO), status]}.
+        По пути сохраняет новые снимки.
+        """
+        snapshot = await self.event_repo.get_nearest_snapshot(contest.id, as_of)
+        state = dict(snapshot.state) if snapshot else {}
+        folded = snapshot.events if snapshot else 0
+        events = await self.event_repo.get_contest_events(contest.id, snapshot.as_of if snapshot else None, as_of)
+
+        # Событие пишется до коммита попытки (проверка идёт внутри транзакции),
+        # поэтому снимок берём только по событиям, которые точно закоммичены
+        settled = datetime.utcnow() - timedelta(seconds=settings.CONTEST_REPLAY_SETTLE_SECONDS)
+        since_snapshot = 0
+        saved = False
+        for index, event in enumerate(events):
+            state[str(event.submission_id)] = [
+                str(event.user_id), str(event.problem_id), event.submitted_at.isoformat(), event.status.value,
+            ]
+            folded += 1
+            since_snapshot += 1
+
+            # Снимок ставится только между разными created_at: события того же
+            # момента иначе оказались бы и не в снимке, и не после него
+            boundary = index + 1 == len(events) or events[index + 1].created_at > event.created_at
+            if since_snapshot >= settings.CONTEST_REPLAY_SNAPSHOT_EVENTS and boundary and event.created_at <= settled:
+                await self.event_repo.save_snapshot(contest.id, event.created_at, dict(state), folded)
+                since_snapshot = 0
+                saved = True
+
+        if saved:
+            await self.db.commit()
+        return state
+
+    async def replay(self, contest: Contest, cutoff: datetime, as_of: datetime) -> bytes:
+        """
+        JSON таблицы (без заморозки) по попыткам, отправленным до cutoff,
+        с вердиктами на момент as_of.
+        """
+        state = await self.fold_events(contest, as_of)
+        attempts = []
+        for user_id, problem_id, submitted_at, status in state.values():
+            submitted_at = datetime.fromisoformat(submitted_at)
+            if submitted_at <= cutoff:
+                attempts.append((user_id, problem_id, submitted_at, status))
+        results = results_from_attempts(attempts, contest.start_time)
+
+        participants = await self.contest_repo.get_participant_names(contest.id)
+        rows = {
+            user_id: (username, results.get(str(user_id), {}))
+            for user_id, username in participants
+        }
+
+        payload = build_scoreboard(contest, rows, frozen_view=False)
+        payload["minute"] = contest_minute(contest.start_time, cutoff)
+        payload["as_of"] = as_of.isoformat() + "Z"
+        return encode_scoreboard(payload)
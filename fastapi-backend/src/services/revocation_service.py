@@ -0,0 +1,138 @@
+# fastapi-backend/src/services/revocation_service.py
+"""
+Отзыв access токенов до истечения срока.
+
+Отозванные jti хранятся в revoked_tokens, а каждый воркер держит их
+в фильтре Блума. Обычный случай — токен не отозван — фильтр отвечает
+«точно нет» без обращения к БД. Лишь при «возможно есть» (отозванный
+токен или редкое ложное срабатывание) делается точная проверка по БД,
+её результат кэшируется.
+
+Отзыв в своём воркере виден сразу; другие воркеры подтягивают новые
+строки раз в TOKEN_REVOCATION_SYNC_SECONDS. Удалять из фильтра нельзя,
+поэтому раз в TOKEN_REVOCATION_REBUILD_SECONDS (или при переполнении)
+он строится заново по неистёкшим записям. Истёкшие строки удаляет
+фоновая очистка (purge_service).
+"""
+
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.bloom import BloomFilter
+from ..core.cache import SingleFlightCache
+from ..core.config import settings
+from ..core.metrics import increment, register_cache, register_gauge
+from ..database import AsyncSessionLocal
+from ..repository.revoked_token_repository import RevokedTokenRepository
+
+logger = logging.getLogger(__name__)
+
+# Запас при инкрементальной синхронизации: строка, записанная другим
+# воркером до начала прошлого прохода, могла закоммититься после него
+SYNC_OVERLAP = timedelta(seconds=60)
+
+# Фильтр отозванных jti; заменяется целиком при перестроении
+revocation_filter = BloomFilter(
+    settings.TOKEN_REVOCATION_FILTER_CAPACITY, settings.TOKEN_REVOCATION_FILTER_ERROR_RATE
+)
+# Точные ответы БД для jti, на которые фильтр ответил «возможно есть».
+# TTL не больше интервала синхронизации: отзыв в другом воркере
+# не должен маскироваться закэшированным «не отозван»
+revocation_checks: SingleFlightCache[bool] = register_cache("token_revocation_checks", SingleFlightCache(
+    maxsize=settings.TOKEN_REVOCATION_CHECK_CACHE_SIZE,
+    ttl=settings.TOKEN_REVOCATION_SYNC_SECONDS,
+))
+register_gauge("token_revocation.filter", lambda: revocation_filter.stats())
+
+_synced_at: Optional[datetime] = None
+_rebuilt_at: Optional[datetime] = None
+
+
+async def _load_revoked(jti: str) -> bool:
+    async with AsyncSessionLocal() as session:
+        return await RevokedTokenRepository(session).is_revoked(jti)
+
+
+async def is_token_revoked(jti: Optional[str]) -> bool:
+    """Отозван ли токен; без I/O, если фильтр отвечает «точно нет»."""
+    if not jti:
+        return False
+    if jti not in revocation_filter:
+        increment("token_revocation.filter_negative")
+        return False
+    increment("token_revocation.db_checks")
+    return await revocation_checks.get_or_build(jti, lambda: _load_revoked(jti))
+
+
+async def revoke_token(db: AsyncSession, payload: dict) -> None:
+    """Отзывает access токен по его payload (jti, exp, sub). Коммитит."""
+    jti = payload.get("jti")
+    if not jti:
+        return
+    user_id = payload.get("sub") or payload.get("user_id")
+    expires_at = datetime.fromtimestamp(payload["exp"], tz=timezone.utc).replace(tzinfo=None)
+
+    await RevokedTokenRepository(db).add(jti, uuid.UUID(user_id) if user_id else None, expires_at)
+    await db.commit()
+
+    revocation_filter.add(jti)
+    revocation_checks.invalidate(lambda key: key == jti)
+    increment("token_revocation.revoked")
+
+
+async def sync_revocations() -> None:
+    """Подтягивает в фильтр jti, отозванные другими воркерами; при необходимости перестраивает его."""
+    global revocation_filter, _synced_at, _rebuilt_at
+
+    now = datetime.utcnow()
+    rebuild = (
+        _rebuilt_at is None
+        or now - _rebuilt_at >= timedelta(seconds=settings.TOKEN_REVOCATION_REBUILD_SECONDS)
+        or revocation_filter.count > revocation_filter.capacity
+    )
+
+    async with AsyncSessionLocal() as session:
+        repo = RevokedTokenRepository(session)
+        if rebuild:
+            jtis = await repo.get_active_jtis()
+        else:
+            jtis = await repo.get_active_jtis(_synced_at - SYNC_OVERLAP)
+
+    if rebuild:
+        # Ёмкость с запасом под рост до следующего перестроения
+        fresh = BloomFilter(
+            max(settings.TOKEN_REVOCATION_FILTER_CAPACITY, 2 * len(jtis)),
+            settings.TOKEN_REVOCATION_FILTER_ERROR_RATE,
+        )
+        for jti in jtis:
+            fresh.add(jti)
+        revocation_filter = fresh
+        _rebuilt_at = now
+        logger.info(f"Фильтр отозванных токенов перестроен: {len(jtis)} записей")
+    else:
+        for jti in jtis:
+            if jti not in revocation_filter:
+                revocation_filter.add(jti)
+
+    if jtis:
+        revoked = set(jtis)
+        revocation_checks.invalidate(lambda key: key in revoked)
+    _synced_at = now
+
+
+async def run_revocation_sync_loop() -> None:
+    """Бесконечный цикл синхронизации фильтра; запускается при старте приложения."""
+    while True:
+        try:
+            await sync_revocations()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Ошибка синхронизации отозванных токенов")
+
+        await asyncio.sleep(settings.TOKEN_REVOCATION_SYNC_SECONDS)
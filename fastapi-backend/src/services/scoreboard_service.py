@@ -0,0 +1,329 @@
+# fastapi-backend/src/services/scoreboard_service.py
+"""
+Живая таблица результатов соревнования.
+
+Каждый воркер держит в памяти строки участников (ScoreboardState) и
+подтягивает из contest_participants только строки, изменившиеся с
+прошлой синхронизации. Строки пересчитываются в транзакции вердикта
+(ContestRepository.record_verdict), поэтому из submissions таблица
+никогда не собирается. Отсортированная таблица сериализуется один раз
+на изменение и раздаётся всем зрителям как готовые байты с ETag.
+
+Для живых зрителей есть поток (SSE): на соревнование работает один
+ScoreboardBroadcaster, который после каждого изменения один раз строит
+событие с изменившимися строками и раскладывает одни и те же байты по
+очередям подписчиков. Новый подписчик сначала получает полный снимок.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Dict, NamedTuple, Optional, Set, Tuple
+from uuid import UUID
+
+from ..core.cache import LRUCache
+from ..core.config import settings
+from ..core.events import on_verdict
+from ..core.metrics import register_cache
+from ..core.scoreboard import view_cell, summarize, assign_ranks
+from ..database import AsyncSessionLocal
+from ..repository.contest_repository import ContestRepository
+
+logger = logging.getLogger(__name__)
+
+# Запас при выборке изменившихся строк: updated_at ставится до коммита,
+# и транзакция с меньшим updated_at может закоммититься позже синхронизации
+SYNC_OVERLAP = timedelta(seconds=5)
+
+VIEW_FULL = "full"
+VIEW_FROZEN = "frozen"
+
+
+class Snapshot(NamedTuple):
+    etag: str
+    body: bytes
+    rows: Dict[str, dict]  # user_id -> строка таблицы (для дельт потока)
+
+
+class ScoreboardState:
+    """Строки таблицы одного соревнования в памяти воркера."""
+
+    def __init__(self, contest_id: UUID):
+        self.contest_id = contest_id
+        self.contest = None
+        self.rows: Dict[UUID, Tuple[str, dict]] = {}
+        self.watermark: Optional[datetime] = None
+        self.synced_at = 0.0
+        self.dirty = True
+        self.snapshots: Dict[str, Snapshot] = {}
+        self.lock = asyncio.Lock()
+
+    def is_fresh(self) -> bool:
+        return not self.dirty and time.monotonic() - self.synced_at < settings.CONTEST_SCOREBOARD_SYNC_SECONDS
+
+    async def sync(self) -> None:
+        """Подтягивает параметры соревнования и изменившиеся строки."""
+        # Отметка до запроса: вердикт, пришедший во время синхронизации, вызовет ещё одну
+        self.dirty = False
+        async with AsyncSessionLocal() as session:
+            repo = ContestRepository(session)
+            contest = await repo.get_by_id(self.contest_id)
+            since = self.watermark - SYNC_OVERLAP if self.watermark else None
+            rows = await repo.get_rows_updated_since(self.contest_id, since)
+
+        changed = contest is not None and (
+            self.contest is None
+            or (contest.unfrozen, contest.freeze_at, contest.end_time)
+            != (self.contest.unfrozen, self.contest.freeze_at, self.contest.end_time)
+        )
+        self.contest = contest
+        for row in rows:
+            entry = (row.username, row.results or {})
+            if self.rows.get(row.user_id) != entry:
+                self.rows[row.user_id] = entry
+                changed = True
+            if self.watermark is None or row.updated_at > self.watermark:
+                self.watermark = row.updated_at
+
+        if changed:
+            self.snapshots.clear()
+        self.synced_at = time.monotonic()
+
+    def view_for(self, full: bool) -> str:
+        contest = self.contest
+        if full or contest.unfrozen or contest.freeze_at is None or datetime.utcnow() < contest.freeze_at:
+            return VIEW_FULL
+        return VIEW_FROZEN
+
+    def snapshot(self, view: str) -> Snapshot:
+        cached = self.snapshots.get(view)
+        if cached is None:
+            cached = self.snapshots[view] = self._build(view)
+        return cached
+
+    def _build(self, view: str) -> Snapshot:
+        payload = build_scoreboard(self.contest, self.rows, frozen_view=view == VIEW_FROZEN)
+        body = encode_scoreboard(payload)
+        etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+        return Snapshot(etag, body, {row["user_id"]: row for row in payload["rows"]})
+
+
+def build_scoreboard(contest, rows: Dict[UUID, Tuple[str, dict]], frozen_view: bool) -> dict:
+    """Отсортированная таблица по строкам {user_id: (username, клетки)}."""
+    problem_keys = [str(problem.problem_id) for problem in contest.problems]
+
+    board_rows = []
+    for user_id, (username, results) in rows.items():
+        cells = [view_cell(results.get(key), frozen_view) for key in problem_keys]
+        solved, penalty, last_minute = summarize(cells, contest.penalty_minutes)
+        board_rows.append({
+            "user_id": str(user_id),
+            "username": username,
+            "solved": solved,
+            "penalty": penalty,
+            "last_minute": last_minute,
+            "cells": cells,
+        })
+    assign_ranks(board_rows)
+
+    return {
+        "contest_id": str(contest.id),
+        "title": contest.title,
+        "frozen": frozen_view,
+        "generated_at": datetime.utcnow().isoformat() + "Z",
+        "problems": [
+            {"label": problem.label, "problem_id": str(problem.problem_id)}
+            for problem in contest.problems
+        ],
+        "rows": board_rows,
+    }
+
+
+def encode_scoreboard(payload: dict) -> bytes:
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+# Состояния таблиц активных соревнований: contest_id -> ScoreboardState
+scoreboards: LRUCache[ScoreboardState] = register_cache(
+    "scoreboards", LRUCache(maxsize=settings.CONTEST_SCOREBOARD_CACHE_SIZE)
+)
+
+
+@on_verdict
+def mark_scoreboard_dirty(submission) -> None:
+    """Вердикт в соревновании: следующий запрос таблицы подтянет изменения."""
+    if submission.contest_id is None:
+        return
+    state = scoreboards.get(submission.contest_id)
+    if state is not None:
+        state.dirty = True
+    broadcaster = broadcasters.get(submission.contest_id)
+    if broadcaster is not None:
+        broadcaster.wakeup.set()
+
+
+def forget_scoreboard(contest_id: UUID) -> None:
+    """Сбросить состояние (изменились параметры соревнования)."""
+    scoreboards.delete(contest_id)
+
+
+async def _get_state(contest_id: UUID) -> Optional[ScoreboardState]:
+    """Синхронизированное состояние таблицы; None — соревнование не найдено."""
+    state = scoreboards.get(contest_id)
+    if state is None:
+        state = ScoreboardState(contest_id)
+        scoreboards.set(contest_id, state)
+
+    if not state.is_fresh():
+        async with state.lock:
+            # Пока ждали блокировку, синхронизацию мог выполнить другой запрос
+            if not state.is_fresh():
+                await state.sync()
+
+    if state.contest is None:
+        scoreboards.delete(contest_id)
+        return None
+    return state
+
+
+async def get_scoreboard_snapshot(contest_id: UUID, full: bool = False) -> Optional[Tuple[str, bytes]]:
+    """
+    (ETag, JSON) таблицы результатов. full — без учёта заморозки
+    (для автора соревнования). None — соревнование не найдено.
+    """
+    state = await _get_state(contest_id)
+    if state is None:
+        return None
+    snapshot = state.snapshot(state.view_for(full))
+    return snapshot.etag, snapshot.body
+
+
+def format_event(event: str, etag: str, data: bytes) -> bytes:
+    """Событие SSE; id — ETag снимка, к которому приводит событие."""
+    return b"id: " + etag.encode() + b"\nevent: " + event.encode() + b"\ndata: " + data + b"\n\n"
+
+
+class ScoreboardBroadcaster:
+    """
+    Общий поток таблицы одного соревнования (публичный вид, с заморозкой).
+
+    Пока есть подписчики, фоновая задача просыпается по вердикту этого
+    воркера или раз в CONTEST_SCOREBOARD_SYNC_SECONDS (вердикты других
+    воркеров), синхронизирует ScoreboardState и рассылает дельту. Событие
+    сериализуется один раз и одними байтами кладётся во все очереди.
+    """
+
+    def __init__(self, contest_id: UUID):
+        self.contest_id = contest_id
+        self.subscribers: Set[asyncio.Queue] = set()
+        self.wakeup = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+        self.view: Optional[str] = None
+        self.etag: Optional[str] = None
+        self.rows: Dict[str, dict] = {}
+        self.snapshot_event: Optional[bytes] = None
+
+    async def subscribe(self) -> Optional[asyncio.Queue]:
+        """Очередь событий с полным снимком в начале; None — соревнование не найдено."""
+        if self.snapshot_event is None and not await self._refresh():
+            broadcasters.pop(self.contest_id, None)
+            return None
+
+        queue: asyncio.Queue = asyncio.Queue(maxsize=settings.CONTEST_STREAM_QUEUE_SIZE)
+        queue.put_nowait(self.snapshot_event)
+        self.subscribers.add(queue)
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._run())
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self.subscribers.discard(queue)
+        if not self.subscribers:
+            if self.task is not None:
+                self.task.cancel()
+            broadcasters.pop(self.contest_id, None)
+
+    async def _run(self) -> None:
+        while self.subscribers:
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), timeout=settings.CONTEST_SCOREBOARD_SYNC_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            self.wakeup.clear()
+            try:
+                await self._refresh()
+            except Exception:
+                logger.exception("Ошибка обновления потока таблицы %s", self.contest_id)
+
+    async def _refresh(self) -> bool:
+        """Синхронизирует таблицу и рассылает изменения. False — соревнования нет."""
+        state = await _get_state(self.contest_id)
+        if state is None:
+            return False
+
+        view = state.view_for(full=False)
+        snapshot = state.snapshot(view)
+        if snapshot.etag == self.etag:
+            return True
+
+        self.snapshot_event = format_event("snapshot", snapshot.etag, snapshot.body)
+        if view != self.view:
+            # Заморозка или разморозка меняет всю таблицу — шлём снимок целиком
+            event = self.snapshot_event
+        else:
+            changed = [row for user_id, row in snapshot.rows.items() if self.rows.get(user_id) != row]
+            removed = [user_id for user_id in self.rows if user_id not in snapshot.rows]
+            event = None
+            if changed or removed:
+                event = format_event("delta", snapshot.etag, json.dumps(
+                    {"rows": changed, "removed": removed},
+                    ensure_ascii=False, separators=(",", ":")
+                ).encode("utf-8"))
+
+        self.view, self.etag, self.rows = view, snapshot.etag, snapshot.rows
+        if event is not None:
+            self._broadcast(event)
+        return True
+
+    def _broadcast(self, event: bytes) -> None:
+        for queue in list(self.subscribers):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # Медленный клиент пропустил дельты: заменяем очередь полным снимком
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(self.snapshot_event)
+
+
+# Потоки таблиц, на которые сейчас кто-то подписан: contest_id -> ScoreboardBroadcaster
+broadcasters: Dict[UUID, ScoreboardBroadcaster] = {}
+
+
+def get_broadcaster(contest_id: UUID) -> ScoreboardBroadcaster:
+    broadcaster = broadcasters.get(contest_id)
+    if broadcaster is None:
+        broadcaster = broadcasters[contest_id] = ScoreboardBroadcaster(contest_id)
+    return broadcaster
+
+
+async def scoreboard_events(contest_id: UUID) -> AsyncIterator[bytes]:
+    """
+    События SSE для одного зрителя: снимок, затем дельты; при простое —
+    комментарий keep-alive. Подписка снимается, когда клиент отключился.
+    """
+    broadcaster = get_broadcaster(contest_id)
+    queue = await broadcaster.subscribe()
+    if queue is None:
+        return
+    try:
+        while True:
+            try:
+                yield await asyncio.wait_for(queue.get(), timeout=settings.CONTEST_STREAM_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield b": ping\n\n"
+    finally:
+        broadcaster.unsubscribe(queue)
@@ -1,6 +1,7 @@
 import httpx
 import os
 import uuid
+from datetime import datetime
 from fastapi import HTTPException
 from starlette import status
 from typing import Optional, List
@@ -9,13 +10,23 @@ from ..schemas.schemas import (
     SubmissionCreate,
     ExecutionResponseGo,
     SubmissionResponse,
-    ExecutionTestInput,
 
 )
+from ..core.events import publish_verdict
 from ..models.problem_models import Problem
+from ..models.submission_models import (
+    Submission, SUBMISSION_EVENT_SUBMITTED, SUBMISSION_EVENT_VERDICT, SUBMISSION_EVENT_REJUDGED
+)
 from ..models.base import SubmissionStatus
 from ..repository.problem_repository import ProblemRepository
 from ..repository.submission_repository import SubmissionRepository
+from ..repository.problem_stats_repository import ProblemStatsRepository
+from ..repository.user_score_repository import UserScoreRepository
+from ..repository.solved_problem_repository import SolvedProblemRepository
+from ..repository.activity_repository import ActivityRepository
+from ..repository.contest_repository import ContestRepository
+from ..repository.submission_event_repository import SubmissionEventRepository
+from .problem_service import JudgeBundle, get_judge_bundle
 
 CODE_EXECUTION_URL = os.getenv("CODE_EXECUTION_URL", "http://code-executor:8001/execute")
 
@@ -34,43 +45,91 @@ class SubmissionService:
     ) -> SubmissionResponse:
         """Отправить решение на проверку."""
 
-        # Получаем задачу с тестами
-        problem_with_tests: Optional[Problem] = (
-            await self.problem_repository.get_problem_by_id_with_tests(
-                submission_data.problem_id
-            )
+        # Сама задача — без тестов: они берутся из кэша по версии набора
+        problem: Optional[Problem] = await self.problem_repository.get_problem_by_id(
+            submission_data.problem_id
         )
 
-        if not problem_with_tests or not problem_with_tests.is_public:
+        if submission_data.contest_id is not None:
+            # Задачи соревнования могут быть непубличными: доступ даёт регистрация
+            if not problem:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Задача не найдена",
+                )
+            await self._check_contest_submission(submission_data, user_id)
+        elif not problem or not problem.is_public:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Задача не найдена или не опубликована",
             )
 
+        # Лимиты и тесты одной неизменяемой версии; параллельные отправки
+        # одной задачи (старт соревнования) загружают её один раз
+        judge = await get_judge_bundle(problem)
+        self._check_judge_bundle(judge)
+
         db_submission = await self.submission_repository.create_submission(
             user_id=user_id,
             problem_id=submission_data.problem_id,
             language=submission_data.language,
             code=submission_data.code,
+            test_set_id=problem.current_test_set_id,
+            contest_id=submission_data.contest_id,
         )
 
-        test_case_inputs = [
-            ExecutionTestInput(
-                id=str(test.id),
-                input_data=test.input_data,
-                expected_output=test.output_data,
-            ).model_dump()
-            for test in problem_with_tests.test_cases
-        ]
+        await SubmissionEventRepository(self.submission_repository.db).record(
+            db_submission, SUBMISSION_EVENT_SUBMITTED
+        )
+
+        await self._run_judge(db_submission, judge)
+        await self._record_verdict(db_submission)
+        db_submission = await self.submission_repository.update_submission(db_submission)
+        await publish_verdict(db_submission)
+
+        return SubmissionResponse(
+            submission_id=db_submission.id,
+            user_id=db_submission.user_id,
+            problem_id=db_submission.problem_id,
+            status=db_submission.status.value,
+            message=db_submission.error_message or f"Вердикт: {db_submission.status.value}",
+            final_status=db_submission.status.value,
+            created_at=db_submission.created_at,
+            language=db_submission.language,
+            execution_time=db_submission.execution_time,
+            memory_used=db_submission.memory_used,
+            test_results=db_submission.test_results or [],
+        )
+
+    @staticmethod
+    def _check_judge_bundle(judge: Optional[JudgeBundle]) -> None:
+        """Без тестов проверяющий сервис вернул бы ACCEPTED на любое решение."""
+        if judge is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Задача не найдена",
+            )
+        if not judge.test_cases:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="У задачи нет тестов, проверка невозможна",
+            )
+
+    async def _run_judge(self, db_submission: Submission, judge: JudgeBundle) -> None:
+        """Отправляет попытку проверяющему сервису и записывает вердикт в объект (без коммита)."""
+        if not judge.test_cases:
+            db_submission.status = SubmissionStatus.INTERNAL_ERROR
+            db_submission.error_message = "У задачи нет тестов, проверка невозможна"
+            return
 
         go_payload = {
             "submission_id": str(db_submission.id),
-            "language": submission_data.language,
-            "code": submission_data.code,
-            "time_limit": problem_with_tests.time_limit or 2000,
-            "memory_limit": problem_with_tests.memory_limit or 256,
-            "checker_type": problem_with_tests.checker_type.value,
-            "test_cases": test_case_inputs,
+            "language": db_submission.language,
+            "code": db_submission.code,
+            "time_limit": judge.time_limit or 2000,
+            "memory_limit": judge.memory_limit or 256,
+            "checker_type": judge.checker_type,
+            "test_cases": judge.test_cases,
         }
 
         message = ""
@@ -104,21 +163,75 @@ class SubmissionService:
 
         db_submission.status = final_status
         db_submission.error_message = message
+
+    async def rejudge_submission(self, db_submission: Submission) -> Submission:
+        """
+        Перепроверяет попытку на текущей версии тестов задачи.
+
+        В журнал пишется событие rejudged, строка участника соревнования
+        пересчитывается целиком. Агрегаты (решённые задачи, статистика,
+        активность) не меняются — их пересчитывают scripts/rebuild_*.
+        """
+        problem = await self.problem_repository.get_problem_by_id(db_submission.problem_id)
+        judge = await get_judge_bundle(problem) if problem else None
+        self._check_judge_bundle(judge)
+
+        db = self.submission_repository.db
+        db_submission.test_set_id = problem.current_test_set_id
+        await self._run_judge(db_submission, judge)
+        await SubmissionEventRepository(db).record(db_submission, SUBMISSION_EVENT_REJUDGED)
+        if db_submission.contest_id is not None:
+            await db.flush()
+            await ContestRepository(db).rebuild_participant(db_submission.contest_id, db_submission.user_id)
+
         db_submission = await self.submission_repository.update_submission(db_submission)
+        await publish_verdict(db_submission)
+        return db_submission
+
+    async def _check_contest_submission(self, submission_data: SubmissionCreate, user_id: uuid.UUID) -> None:
+        """Попытка в соревновании: идёт ли оно, зарегистрирован ли участник, есть ли задача."""
+        contest_repo = ContestRepository(self.submission_repository.db)
+        contest = await contest_repo.get_by_id(submission_data.contest_id)
+        if not contest:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Соревнование не найдено",
+            )
 
-        return SubmissionResponse(
-            submission_id=db_submission.id,
-            user_id=db_submission.user_id,
-            problem_id=db_submission.problem_id,
-            status=db_submission.status.value,
-            message=db_submission.error_message or f"Вердикт: {db_submission.status.value}",
-            final_status=db_submission.status.value,
-            created_at=db_submission.created_at,
-            language=db_submission.language,
-            execution_time=db_submission.execution_time,
-            memory_used=db_submission.memory_used,
-            test_results=db_submission.test_results or [],
+        now = datetime.utcnow()
+        if not (contest.start_time <= now < contest.end_time):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Соревнование не идёт",
+            )
+        if not await contest_repo.is_registered(contest.id, user_id):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Вы не зарегистрированы на соревнование",
+            )
+        if not any(item.problem_id == submission_data.problem_id for item in contest.problems):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Задача не входит в соревнование",
+            )
+
+    async def _record_verdict(self, db_submission) -> None:
+        """
+        Обновляет агрегаты, зависящие от вердикта.
+        Вызывается до update_submission, чтобы всё попало в одну транзакцию.
+        """
+        db = self.submission_repository.db
+        first_solve = (
+            db_submission.status == SubmissionStatus.ACCEPTED
+            and await SolvedProblemRepository(db).record_accepted(db_submission)
         )
+        await ProblemStatsRepository(db).record_verdict(db_submission, first_solve)
+        await ActivityRepository(db).record_verdict(db_submission)
+        if first_solve:
+            await UserScoreRepository(db).record_solved(db_submission.user_id, db_submission.created_at)
+        if db_submission.contest_id is not None:
+            await ContestRepository(db).record_verdict(db_submission)
+        await SubmissionEventRepository(db).record(db_submission, SUBMISSION_EVENT_VERDICT)
 
     async def delete_submission(self, submission_id: str, user_id: uuid.UUID) -> dict:
         """Удалить submission (только PENDING)."""
@@ -5,7 +5,8 @@ from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 
-from ..models.user_models import User
+from ..core.events import publish_problems_changed
+from .auth_service import Principal
 from ..schemas.schemas import ProblemCreate, ProblemUpdate, ProblemResponse
 # from ..schemas.schemas_teacher import ProblemResponse
 from ..repository.problem_repository import ProblemRepository
@@ -15,7 +16,7 @@ from ..repository.submission_repository import SubmissionRepository
 class TeacherService:
     """Сервис для работы преподавателя с задачами и попытками студентов."""
 
-    def __init__(self, db: AsyncSession, current_user: User):
+    def __init__(self, db: AsyncSession, current_user: Principal):
         self.db = db
         self.current_user = current_user
         self.problem_repo = ProblemRepository(db)
@@ -55,6 +56,7 @@ class TeacherService:
                 examples_data,
                 test_cases_data
             )
+            await publish_problems_changed()
 
             return {
                 "message": "Задача создана успешно",
@@ -115,6 +117,7 @@ class TeacherService:
         # Обновление
         update_data = problem_data.dict(exclude_unset=True)
         updated_problem = await self.problem_repo.update_problem(problem_uuid, update_data)
+        await publish_problems_changed()
 
         return {
             "message": "Задача обновлена успешно",
@@ -151,8 +154,9 @@ class TeacherService:
         deleted_id = await self.problem_repo.delete_problem(problem_uuid)
 
         if deleted_id:
+            await publish_problems_changed()
             return {
-                "message": "Задача удалена успешно",
+                "message": "Задача удалена, связанные данные будут очищены в фоне",
                 "problem_id": str(deleted_id)
             }
 
@@ -0,0 +1,258 @@
+# fastapi-backend/src/services/test_data_service.py
+"""
+Загрузка и выгрузка данных отдельных тестов.
+
+Большие входные/выходные файлы передаются сырым телом запроса, по кускам,
+с возможностью докачки (Content-Range) и проверкой SHA-256 всего файла.
+Выгрузка отдаётся потоком и поддерживает заголовок Range.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import AsyncIterator, Iterator, Optional, Tuple
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from ..core.config import settings
+from ..models.problem_models import TestCase
+from .auth_service import Principal
+from ..repository.problem_repository import ProblemRepository
+
+TEST_DATA_KINDS = ("input", "output")
+
+_CONTENT_RANGE_RE = re.compile(r"^bytes (\d+)-(\d+)/(\d+|\*)$")
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+@dataclass
+class UploadProgress:
+    received: int
+    total: Optional[int]
+    complete: bool
+    test: Optional[TestCase] = None
+
+
+@dataclass
+class DownloadSlice:
+    """Описание отдаваемого диапазона файла теста."""
+    body: Iterator[bytes]
+    start: int
+    end: int
+    size: int
+    partial: bool
+
+
+def parse_content_range(header: Optional[str]) -> Tuple[int, Optional[int], Optional[int]]:
+    """
+    Разбирает "Content-Range: bytes start-end/total".
+
+    Без заголовка тело считается целым файлом: (0, None, None).
+    """
+    if not header:
+        return 0, None, None
+    match = _CONTENT_RANGE_RE.match(header.strip())
+    if not match:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Некорректный заголовок Content-Range"
+        )
+    start, end, total = match.groups()
+    start, end = int(start), int(end)
+    total = None if total == "*" else int(total)
+    if end < start or (total is not None and end >= total):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Некорректный диапазон в Content-Range"
+        )
+    return start, end, total
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """Разбирает одиночный "Range: bytes=a-b" (включая суффиксную форму bytes=-N)."""
+    if not header:
+        return None
+    match = _RANGE_RE.match(header.strip())
+    if not match or match.groups() == ("", ""):
+        return None
+    first, last = match.groups()
+    if first == "":
+        length = int(last)
+        start, end = max(size - length, 0), size - 1
+    else:
+        start = int(first)
+        end = int(last) if last else size - 1
+        end = min(end, size - 1)
+    if size == 0 or start > end or start >= size:
+        raise HTTPException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            detail="Диапазон вне файла",
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+    return start, end
+
+
+def _too_large() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Файл теста больше {settings.TEST_UPLOAD_MAX_BYTES} байт"
+    )
+
+
+class TestDataService:
+    """Сервис для потоковой работы с файлами тестов (только владелец задачи или админ)."""
+
+    def __init__(self, db: AsyncSession, current_user: Principal):
+        self.db = db
+        self.current_user = current_user
+        self.problem_repo = ProblemRepository(db)
+
+    @property
+    def storage(self):
+        return self.problem_repo.storage
+
+    async def _check_problem_access(self, problem_id: UUID) -> None:
+        db_problem = await self.problem_repo.get_problem_by_id(problem_id)
+        if not db_problem:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Задача не найдена"
+            )
+        if db_problem.user_id != self.current_user.id and self.current_user.role != "admin":
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Вы не можете изменять тесты чужих задач"
+            )
+
+    async def _get_test(self, problem_id: UUID, test_id: UUID) -> TestCase:
+        await self._check_problem_access(problem_id)
+        test = await self.problem_repo.get_test_case(problem_id, test_id)
+        if not test:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Тест не найден"
+            )
+        return test
+
+    @staticmethod
+    def _upload_key(test_id: UUID, kind: str) -> str:
+        if kind not in TEST_DATA_KINDS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Допустимые типы данных теста: input, output"
+            )
+        return f"{test_id}.{kind}"
+
+    async def create_test(self, problem_id: UUID, is_sample: bool = False) -> TestCase:
+        """Создаёт пустой тест, данные которого затем загружаются по кускам."""
+        await self._check_problem_access(problem_id)
+        return await self.problem_repo.add_test_case(problem_id, is_sample)
+
+    async def get_upload_status(self, problem_id: UUID, test_id: UUID, kind: str) -> int:
+        """Возвращает количество уже принятых байт (для докачки)."""
+        await self._get_test(problem_id, test_id)
+        return self.storage.upload_offset(self._upload_key(test_id, kind))
+
+    async def abort_upload(self, problem_id: UUID, test_id: UUID, kind: str) -> None:
+        await self._get_test(problem_id, test_id)
+        self.storage.abort_upload(self._upload_key(test_id, kind))
+
+    async def upload_chunk(
+            self,
+            problem_id: UUID,
+            test_id: UUID,
+            kind: str,
+            body: AsyncIterator[bytes],
+            content_range: Optional[str],
+            checksum: Optional[str],
+    ) -> UploadProgress:
+        """
+        Принимает очередной кусок файла теста.
+
+        Тело пишется на диск по мере чтения, без буферизации в памяти.
+        После последнего куска проверяется SHA-256 (заголовок X-Content-SHA256)
+        и файл атомарно публикуется в хранилище. Запись и хэширование идут
+        в пуле потоков, чтобы не блокировать цикл событий.
+
+        Raises:
+            HTTPException 413: файл больше TEST_UPLOAD_MAX_BYTES
+        """
+        test = await self._get_test(problem_id, test_id)
+        upload_key = self._upload_key(test_id, kind)
+        start, end, total = parse_content_range(content_range)
+        max_bytes = settings.TEST_UPLOAD_MAX_BYTES
+        if (total is not None and total > max_bytes) or (end is not None and end >= max_bytes):
+            raise _too_large()
+
+        if start == 0 and content_range is None:
+            # Загрузка целиком одним запросом начинается с чистого листа
+            self.storage.abort_upload(upload_key)
+
+        offset = self.storage.upload_offset(upload_key)
+        if start != offset:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail={"message": "Несовпадение offset, продолжите с received", "received": offset},
+            )
+
+        try:
+            async for chunk in body:
+                if not chunk:
+                    continue
+                if offset + len(chunk) > max_bytes:
+                    self.storage.abort_upload(upload_key)
+                    raise _too_large()
+                offset = await run_in_threadpool(self.storage.append_upload, upload_key, offset, chunk)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+        if end is not None and offset > end + 1:
+            self.storage.abort_upload(upload_key)
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Тело куска длиннее диапазона из Content-Range, загрузка сброшена"
+            )
+
+        if end is not None and offset != end + 1:
+            # Кусок пришёл не полностью: клиент может продолжить с received
+            return UploadProgress(received=offset, total=total, complete=False)
+
+        is_last = content_range is None or (total is not None and offset == total)
+        if not is_last:
+            return UploadProgress(received=offset, total=total, complete=False)
+
+        try:
+            blob = await run_in_threadpool(self.storage.finish_upload, upload_key, checksum)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+
+        test = await self.problem_repo.set_test_blob(test, kind, blob.sha256, blob.size)
+        return UploadProgress(received=blob.size, total=blob.size, complete=True, test=test)
+
+    async def open_download(
+            self, problem_id: UUID, test_id: UUID, kind: str, range_header: Optional[str]
+    ) -> DownloadSlice:
+        """Готовит потоковую выгрузку файла теста (целиком или по Range)."""
+        test = await self._get_test(problem_id, test_id)
+        self._upload_key(test_id, kind)
+
+        if not test.is_file_backed:
+            data = (getattr(test, f"{kind}_data") or "").encode("utf-8")
+            size = len(data)
+            requested = parse_range(range_header, size)
+            start, end = requested if requested else (0, size - 1)
+            return DownloadSlice(
+                body=iter([data[start:end + 1]]),
+                start=start, end=end, size=size, partial=requested is not None,
+            )
+
+        sha256 = getattr(test, f"{kind}_sha256")
+        size = self.storage.size_of(sha256)
+        requested = parse_range(range_header, size)
+        start, end = requested if requested else (0, size - 1)
+        return DownloadSlice(
+            body=self.storage.iter_range(sha256, start, end),
+            start=start, end=end, size=size, partial=requested is not None,
+        )
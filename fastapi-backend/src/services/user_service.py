@@ -1,17 +1,20 @@
 #user_service.py
 import re
 import uuid
+from datetime import datetime, timedelta
 from typing import List, Optional
 
 from fastapi import HTTPException
-from passlib.context import CryptContext
 
+from ..core.events import publish_user_changed
+from ..core.security import PasswordService
 from ..models.user_models import User
 from ..repository.user_repository import UserRepository
+from ..repository.solved_problem_repository import SolvedProblemRepository
+from ..repository.rating_repository import RatingRepository
+from ..repository.activity_repository import ActivityRepository
 from  ..schemas.user_schemas import  UpdateUserRequest
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 
 class UserService:
 
@@ -34,10 +37,38 @@ class UserService:
 
     async  def update_user(self, user_id: uuid.UUID, data: UpdateUserRequest) ->  Optional[User]:
         updated_user = data.dict(exclude_unset=True)
-        return  await self.user_repository.update_user(user_id, updated_user)
+        user = await self.user_repository.update_user(user_id, updated_user)
+        await publish_user_changed(user_id)
+        return user
 
     async def delete_user(self, user_id: uuid.UUID) -> bool:
-        return await self.user_repository.delete_user(user_id)
+        deleted = await self.user_repository.delete_user(user_id)
+        await publish_user_changed(user_id)
+        return deleted
+
+    async def get_solved_stats(self, user_id: uuid.UUID) -> dict:
+        """Статистика решённых задач для профиля."""
+        return await SolvedProblemRepository(self.user_repository.db).get_user_stats(user_id)
+
+    async def get_rating_history(self, user_id: uuid.UUID, limit: int = 50) -> list:
+        """Изменения рейтинга пользователя, новые первыми."""
+        return await RatingRepository(self.user_repository.db).get_user_history(user_id, limit)
+
+    async def get_activity(self, user_id: uuid.UUID, days: int = 365) -> dict:
+        """Попытки по дням (UTC) для тепловой карты профиля; дни без попыток не возвращаются."""
+        today = datetime.utcnow().date()
+        since = today - timedelta(days=days - 1)
+        rows = await ActivityRepository(self.user_repository.db).get_user_activity(user_id, since)
+        return {
+            "from": since,
+            "to": today,
+            "total_submissions": sum(row.submissions for row in rows),
+            "total_accepted": sum(row.accepted for row in rows),
+            "days": [
+                {"day": row.day, "submissions": row.submissions, "accepted": row.accepted}
+                for row in rows
+            ],
+        }
 
 
     @staticmethod
@@ -55,12 +86,12 @@ class UserService:
         return len(password) >= 8
 
     @staticmethod
-    def hash_password(password: str) -> str:
-        return pwd_context.hash(password)
+    async def hash_password(password: str) -> str:
+        return await PasswordService.hash_password(password)
 
     @staticmethod
-    def verify_password(password: str, hashed_password: str) -> bool:
-        return  pwd_context.verify(password, hashed_password)
+    async def verify_password(password: str, hashed_password: str) -> bool:
+        return await PasswordService.verify_password(password, hashed_password)
     # это еще я буду переделать под группы пока это затычка
     async def list_users(self, skip: int = 0, limit: int = 100, role: Optional[str] = None) -> List[User]:
         users = await self.user_repository.list_users(skip, limit)
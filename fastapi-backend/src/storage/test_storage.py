@@ -0,0 +1,256 @@
+# fastapi-backend/src/storage/test_storage.py
+"""
+Файловое хранилище данных тестов.
+
+Входные и выходные данные тестов хранятся на локальном диске как
+неизменяемые файлы, адресуемые SHA-256 своего содержимого:
+
+    <root>/objects/ab/cd/abcdef0123...
+
+В таблице test_cases остаются только метаданные (хэш и размер), поэтому
+большие тесты не раздувают Postgres и не тянутся через ORM. Чтение для
+отправки в Go-Executor идёт через mmap, без промежуточных буферов.
+"""
+
+import hashlib
+import logging
+import mmap
+import os
+import tempfile
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import BinaryIO, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+HASH_CHUNK_SIZE = 1024 * 1024
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+@dataclass(frozen=True)
+class StoredBlob:
+    """Результат сохранения файла в хранилище."""
+    sha256: str
+    size: int
+
+
+class TestDataStorage:
+    """Контентно-адресуемое хранилище тестовых данных на локальном диске."""
+
+    def __init__(self, root: str):
+        self.root = os.path.abspath(root)
+        self.objects_dir = os.path.join(self.root, "objects")
+        self.tmp_dir = os.path.join(self.root, "tmp")
+        self.uploads_dir = os.path.join(self.root, "uploads")
+        os.makedirs(self.objects_dir, exist_ok=True)
+        os.makedirs(self.tmp_dir, exist_ok=True)
+        os.makedirs(self.uploads_dir, exist_ok=True)
+
+    # === Пути ===
+
+    def path_for(self, sha256: str) -> str:
+        """Путь к файлу по его хэшу (с двумя уровнями шардирования)."""
+        if len(sha256) != 64 or not all(c in "0123456789abcdef" for c in sha256):
+            raise ValueError(f"Некорректный sha256: {sha256!r}")
+        return os.path.join(self.objects_dir, sha256[:2], sha256[2:4], sha256)
+
+    def exists(self, sha256: str) -> bool:
+        return os.path.exists(self.path_for(sha256))
+
+    # === Запись ===
+
+    def put_bytes(self, data: bytes) -> StoredBlob:
+        """Сохраняет байты и возвращает их хэш. Повторная запись — no-op."""
+        digest = hashlib.sha256(data).hexdigest()
+        target = self.path_for(digest)
+        if os.path.exists(target):
+            return StoredBlob(digest, len(data))
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.tmp_dir)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            self._publish(tmp_path, target)
+        finally:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
+        return StoredBlob(digest, len(data))
+
+    def put_text(self, text: str) -> StoredBlob:
+        return self.put_bytes(text.encode("utf-8"))
+
+    def put_file(self, path: str, expected_sha256: Optional[str] = None) -> StoredBlob:
+        """
+        Переносит уже записанный на диск файл в хранилище.
+
+        Файл должен лежать на той же файловой системе (например, в tmp_dir),
+        чтобы перенос был атомарным os.replace без копирования.
+
+        Raises:
+            ValueError: хэш содержимого не совпал с expected_sha256
+        """
+        digest = self.file_sha256(path)
+        if expected_sha256 and digest != expected_sha256.lower():
+            raise ValueError(
+                f"Контрольная сумма не совпадает: ожидалось {expected_sha256}, получено {digest}"
+            )
+
+        size = os.path.getsize(path)
+        target = self.path_for(digest)
+        if os.path.exists(target):
+            os.unlink(path)
+        else:
+            self._publish(path, target)
+        return StoredBlob(digest, size)
+
+    def put_stream(self, stream: BinaryIO, expected_sha256: Optional[str] = None) -> StoredBlob:
+        """Копирует поток в хранилище кусками, не читая его в память целиком."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.tmp_dir)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in iter(lambda: stream.read(HASH_CHUNK_SIZE), b""):
+                    f.write(chunk)
+                f.flush()
+                os.fsync(f.fileno())
+            return self.put_file(tmp_path, expected_sha256)
+        finally:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
+    def _publish(self, tmp_path: str, target: str) -> None:
+        """Атомарно публикует файл и делает его доступным только для чтения."""
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        os.chmod(tmp_path, 0o444)
+        os.replace(tmp_path, target)
+
+    # === Чтение ===
+
+    @contextmanager
+    def open_mmap(self, sha256: str) -> Iterator[memoryview]:
+        """
+        Отображает файл в память и отдаёт memoryview на его содержимое.
+
+        Пустые файлы нельзя отобразить через mmap, для них отдаётся пустой view.
+        """
+        path = self.path_for(sha256)
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                yield memoryview(b"")
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                view = memoryview(mm)
+                try:
+                    yield view
+                finally:
+                    view.release()
+
+    def read_text(self, sha256: str) -> str:
+        """Декодирует файл прямо из отображения в память (одна копия — в str)."""
+        with self.open_mmap(sha256) as view:
+            return str(view, "utf-8")
+
+    def size_of(self, sha256: str) -> int:
+        return os.path.getsize(self.path_for(sha256))
+
+    def iter_range(
+            self, sha256: str, start: int = 0, end: Optional[int] = None,
+            chunk_size: int = STREAM_CHUNK_SIZE
+    ) -> Iterator[bytes]:
+        """Читает диапазон [start, end] (включительно) кусками фиксированного размера."""
+        path = self.path_for(sha256)
+        if end is None:
+            end = os.path.getsize(path) - 1
+        remaining = end - start + 1
+        with open(path, "rb") as f:
+            f.seek(start)
+            while remaining > 0:
+                chunk = f.read(min(chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+
+    # === Докачиваемые загрузки ===
+
+    def upload_path(self, upload_key: str) -> str:
+        """Путь к частично загруженному файлу (upload_key — без разделителей пути)."""
+        if not upload_key or os.sep in upload_key or upload_key.startswith("."):
+            raise ValueError(f"Некорректный ключ загрузки: {upload_key!r}")
+        return os.path.join(self.uploads_dir, f"{upload_key}.part")
+
+    def upload_offset(self, upload_key: str) -> int:
+        """Сколько байт уже принято для загрузки (0, если загрузки нет)."""
+        try:
+            return os.path.getsize(self.upload_path(upload_key))
+        except FileNotFoundError:
+            return 0
+
+    def append_upload(self, upload_key: str, offset: int, chunk: bytes) -> int:
+        """
+        Дописывает кусок в частичный файл.
+
+        Raises:
+            ValueError: offset не совпадает с уже принятым размером
+        """
+        path = self.upload_path(upload_key)
+        current = self.upload_offset(upload_key)
+        if offset != current:
+            raise ValueError(f"Ожидался offset {current}, получен {offset}")
+        with open(path, "ab") as f:
+            f.write(chunk)
+        return current + len(chunk)
+
+    def finish_upload(self, upload_key: str, expected_sha256: Optional[str] = None) -> StoredBlob:
+        """Проверяет контрольную сумму и переносит загруженный файл в хранилище."""
+        path = self.upload_path(upload_key)
+        if not os.path.exists(path):
+            open(path, "wb").close()
+        try:
+            return self.put_file(path, expected_sha256)
+        except ValueError:
+            self.abort_upload(upload_key)
+            raise
+
+    def abort_upload(self, upload_key: str) -> None:
+        try:
+            os.unlink(self.upload_path(upload_key))
+        except FileNotFoundError:
+            pass
+
+    # === Сборка мусора ===
+
+    def iter_objects(self) -> Iterator[Tuple[str, float]]:
+        """Перечисляет (sha256, mtime) всех файлов хранилища."""
+        for dirpath, _, filenames in os.walk(self.objects_dir):
+            for name in filenames:
+                yield name, os.path.getmtime(os.path.join(dirpath, name))
+
+    def delete(self, sha256: str) -> None:
+        try:
+            os.unlink(self.path_for(sha256))
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def file_sha256(path: str) -> str:
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                h.update(chunk)
+        return h.hexdigest()
+
+
+_storage: Optional[TestDataStorage] = None
+
+
+def get_test_storage() -> TestDataStorage:
+    """Возвращает общий для процесса экземпляр хранилища."""
+    global _storage
+    if _storage is None:
+        from ..core.config import settings
+        _storage = TestDataStorage(settings.TEST_STORAGE_DIR)
+        logger.info(f"Хранилище тестов: {_storage.root}")
+    return _storage